@@ -0,0 +1,317 @@
+"""
+audio_features.py
+One streaming decode per audio file: RMS energy, onset strength, beats and
+100 ms window energy.
+
+Features are persisted as a small .npz keyed by the audio content hash, so
+BeatSync, the uploader and the notebooks read precomputed arrays instead
+of decoding the same WAV again.
+"""
+
+from dataclasses import dataclass
+import logging
+import os
+
+import numpy as np
+import soundfile as sf
+
+from video_core.segment_cache import file_hash
+
+logger = logging.getLogger("AudioFeatures")
+
+FEATURE_DIR = "data/audio_features"
+# Bump when extraction changes; old feature files are ignored
+FEATURE_VERSION = 2
+# Window of the sample-exact energy track (the uploader's beat windows)
+ENERGY_SECONDS = 0.1
+
+
+@dataclass
+class AudioFeatures:
+    sample_rate: int
+    hop: int
+    duration: float
+    rms: np.ndarray      # per frame, frame i centred at i * hop
+    onset: np.ndarray    # spectral flux per frame
+    beats: np.ndarray    # beat times, seconds
+    tempo: float         # BPM
+    energy: np.ndarray   # sum of |sample| per energy_window samples, first channel
+    energy_window: int   # samples per energy value
+
+    @property
+    def frame_rate(self) -> float:
+        return self.sample_rate / self.hop
+
+    @property
+    def times(self) -> np.ndarray:
+        return np.arange(len(self.rms)) / self.frame_rate
+
+    @property
+    def mean_rms(self) -> float:
+        return float(self.rms.mean()) if len(self.rms) else 0.0
+
+    def window_energy(self, seconds: float) -> np.ndarray:
+        """
+        Sum of absolute sample values per int(rate * seconds) samples, the
+        last window partial. `seconds` must be a whole multiple of the
+        extracted window so the windows stay sample-exact.
+        """
+        window = int(self.sample_rate * seconds)
+        per, rest = divmod(window, self.energy_window)
+        if per < 1 or rest:
+            raise ValueError(
+                f"{seconds}s windows are not a multiple of the {self.energy_window}-sample energy track"
+            )
+        count = -(-len(self.energy) // per)
+        padded = np.zeros(count * per)
+        padded[:len(self.energy)] = self.energy
+        return padded.reshape(count, per).sum(axis=1)
+
+    def loud_windows(self, seconds: float = 0.1, factor: float = 1.5) -> list:
+        energy = self.window_energy(seconds)
+        if not len(energy):
+            return []
+        return np.flatnonzero(energy > energy.mean() * factor).tolist()
+
+
+# ----------------------------
+# EXTRACTION
+# ----------------------------
+
+class _FrameStream:
+    """
+    Frames a block stream with hop `hop`, carrying the partial frame over
+    block boundaries. Frames are centred (frame // 2 of silence at both
+    ends), matching librosa's default alignment.
+    """
+
+    def __init__(self, frame: int, hop: int):
+        self.frame = frame
+        self.hop = hop
+        self.carry = np.zeros(frame // 2, dtype=np.float32)
+
+    def push(self, samples: np.ndarray) -> np.ndarray:
+        buffer = np.concatenate([self.carry, samples])
+        count = (len(buffer) - self.frame) // self.hop + 1
+        if count <= 0:
+            self.carry = buffer
+            return np.zeros((0, self.frame), dtype=np.float32)
+
+        frames = np.lib.stride_tricks.sliding_window_view(buffer, self.frame)[::self.hop][:count]
+        self.carry = buffer[count * self.hop:]
+        return frames
+
+    def finish(self) -> np.ndarray:
+        tail = np.concatenate([self.carry, np.zeros(self.frame // 2, dtype=np.float32)])
+        self.carry = np.zeros(0, dtype=np.float32)
+        if len(tail) < self.frame:
+            return np.zeros((0, self.frame), dtype=np.float32)
+        count = (len(tail) - self.frame) // self.hop + 1
+        return np.lib.stride_tricks.sliding_window_view(tail, self.frame)[::self.hop][:count]
+
+
+def estimate_tempo(onset: np.ndarray, frame_rate: float, start_bpm: float = 120.0) -> float:
+    """
+    Autocorrelation of the onset envelope, weighted by a log-normal prior
+    around `start_bpm`.
+    """
+    if len(onset) < 4 or not onset.any():
+        return 0.0
+
+    centred = onset - onset.mean()
+    size = 1 << int(np.ceil(np.log2(2 * len(centred))))
+    spectrum = np.fft.rfft(centred, size)
+    acf = np.fft.irfft(spectrum * np.conj(spectrum), size)[:len(centred)]
+
+    lags = np.arange(1, len(acf))
+    bpm = 60.0 * frame_rate / lags
+    valid = (bpm >= 40) & (bpm <= 240)
+    if not valid.any():
+        return 0.0
+
+    prior = np.exp(-0.5 * (np.log2(bpm[valid] / start_bpm)) ** 2)
+    best = np.argmax(acf[1:][valid] * prior)
+    return float(bpm[valid][best])
+
+
+def track_beats(onset: np.ndarray, frame_rate: float, tempo: float, tightness: float = 100.0) -> np.ndarray:
+    """
+    Dynamic-programming beat tracker (Ellis 2007): beats land on strong
+    onsets while keeping spacing close to the tempo period.
+    """
+    if tempo <= 0 or not onset.any():
+        return np.zeros(0)
+
+    period = 60.0 * frame_rate / tempo
+    local = onset / (onset.std() or 1.0)
+    kernel = np.exp(-0.5 * (np.arange(-period, period + 1) * 32.0 / period) ** 2)
+    local = np.convolve(local, kernel, mode="same")
+
+    offsets = np.arange(-int(round(2 * period)), -int(round(period / 2)) + 1)
+    penalty = -tightness * np.log(-offsets / period) ** 2
+
+    score = local.copy()
+    backlink = np.full(len(local), -1)
+
+    for i in range(-offsets[-1], len(local)):
+        candidates = i + offsets
+        keep = candidates >= 0
+        weighted = score[candidates[keep]] + penalty[keep]
+        best = int(np.argmax(weighted))
+        score[i] = local[i] + weighted[best]
+        backlink[i] = candidates[keep][best]
+
+    # Last beat: the strongest-scoring local maximum near the end
+    maxima = np.flatnonzero((score[1:-1] > score[:-2]) & (score[1:-1] >= score[2:])) + 1
+    if not len(maxima):
+        return np.zeros(0)
+    tail = maxima[score[maxima] >= 0.5 * np.median(score[maxima])]
+    beat = int(tail[-1]) if len(tail) else int(maxima[-1])
+
+    beats = []
+    while beat >= 0:
+        beats.append(beat)
+        beat = backlink[beat]
+    beats = np.array(beats[::-1])
+
+    # Backtracking runs into the lead-in / tail silence: drop weak edge beats
+    strength = local[beats]
+    strong = np.flatnonzero(strength >= 0.5 * np.sqrt(np.mean(strength ** 2)))
+    if len(strong):
+        beats = beats[strong[0]:strong[-1] + 1]
+
+    return beats / frame_rate
+
+
+def extract(path: str, frame: int = 2048, hop: int = 512, block_seconds: float = 10.0) -> AudioFeatures:
+    """
+    Single streaming pass; only the per-frame features stay in memory.
+    """
+    info = sf.info(path)
+    stream = _FrameStream(frame, hop)
+    window = np.hanning(frame).astype(np.float32)
+    blocksize = max(frame, int(block_seconds * info.samplerate))
+    energy_window = max(1, int(info.samplerate * ENERGY_SECONDS))
+
+    rms_parts, onset_parts, energy_parts = [], [], []
+    previous = None
+    pending = np.zeros(0, dtype=np.float32)
+
+    def consume_energy(samples):
+        nonlocal pending
+        buffer = np.concatenate([pending, np.abs(samples)])
+        count = len(buffer) // energy_window
+        if count:
+            windows = buffer[:count * energy_window].reshape(count, energy_window)
+            energy_parts.append(windows.sum(axis=1, dtype=np.float64))
+        pending = buffer[count * energy_window:]
+
+    def consume(frames):
+        nonlocal previous
+        if not len(frames):
+            return
+        rms_parts.append(np.sqrt(np.mean(frames ** 2, axis=1)))
+
+        spectrum = np.log1p(100.0 * np.abs(np.fft.rfft(frames * window, axis=1)))
+        reference = np.vstack([spectrum[:1] if previous is None else previous, spectrum[:-1]])
+        onset_parts.append(np.maximum(spectrum - reference, 0.0).mean(axis=1))
+        previous = spectrum[-1:]
+
+    for block in sf.blocks(path, blocksize=blocksize, dtype="float32", always_2d=True):
+        consume(stream.push(block.mean(axis=1)))
+        # Channel 0, not the mix: same windows the original detector summed
+        consume_energy(block[:, 0])
+    consume(stream.finish())
+    if len(pending):
+        energy_parts.append(np.array([pending.sum(dtype=np.float64)]))
+
+    rms = np.concatenate(rms_parts).astype(np.float32) if rms_parts else np.zeros(0, np.float32)
+    onset = np.concatenate(onset_parts).astype(np.float32) if onset_parts else np.zeros(0, np.float32)
+    energy = np.concatenate(energy_parts) if energy_parts else np.zeros(0)
+
+    frame_rate = info.samplerate / hop
+    tempo = estimate_tempo(onset, frame_rate)
+
+    return AudioFeatures(
+        sample_rate=info.samplerate,
+        hop=hop,
+        duration=info.frames / info.samplerate,
+        rms=rms,
+        onset=onset,
+        beats=track_beats(onset, frame_rate, tempo),
+        tempo=tempo,
+        energy=energy,
+        energy_window=energy_window,
+    )
+
+
+# ----------------------------
+# SERVICE
+# ----------------------------
+
+class AudioFeatureService:
+
+    def __init__(self, cache_dir: str = FEATURE_DIR, frame: int = 2048, hop: int = 512):
+        self.cache_dir = cache_dir
+        self.frame = frame
+        self.hop = hop
+        self._memo = {}
+
+    def _path(self, content_hash: str) -> str:
+        return os.path.join(
+            self.cache_dir, f"{content_hash[:32]}_v{FEATURE_VERSION}_{self.frame}_{self.hop}.npz"
+        )
+
+    def _load(self, path: str):
+        try:
+            with np.load(path) as data:
+                return AudioFeatures(
+                    sample_rate=int(data["sample_rate"]),
+                    hop=int(data["hop"]),
+                    duration=float(data["duration"]),
+                    rms=data["rms"],
+                    onset=data["onset"],
+                    beats=data["beats"],
+                    tempo=float(data["tempo"]),
+                    energy=data["energy"],
+                    energy_window=int(data["energy_window"]),
+                )
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _save(self, path: str, features: AudioFeatures):
+        # Atomic: concurrent consumers never read a half-written file
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(
+            tmp_path,
+            sample_rate=features.sample_rate,
+            hop=features.hop,
+            duration=features.duration,
+            rms=features.rms,
+            onset=features.onset,
+            beats=features.beats,
+            tempo=features.tempo,
+            energy=features.energy,
+            energy_window=features.energy_window,
+        )
+        os.replace(tmp_path, path)
+
+    def features(self, audio_path) -> AudioFeatures:
+        content_hash = file_hash(str(audio_path))
+        if content_hash in self._memo:
+            return self._memo[content_hash]
+
+        path = self._path(content_hash)
+        features = self._load(path) if os.path.exists(path) else None
+
+        if features is None:
+            features = extract(str(audio_path), self.frame, self.hop)
+            self._save(path, features)
+            logger.info(f"Extracted audio features: {audio_path} ({features.tempo:.0f} BPM)")
+
+        self._memo[content_hash] = features
+        return features
+
+
+AUDIO_FEATURES = AudioFeatureService()
@@ -0,0 +1,315 @@
+"""
+audio_graph.py
+Blockwise streaming audio graph: compose nodes, evaluate block by block.
+
+    AudioGraph("narration.wav") \\
+        .then(GainCurve(curve, rate=100)) \\
+        .then(SilenceWindow(41.0, 0.8)) \\
+        .then(SFXInsert(events)) \\
+        .then(Fade(0.5, 2.0)) \\
+        .then(Resample(48000)) \\
+        .render("narration_fx.wav")
+
+The source is read with soundfile block reads and the result written as
+it is produced, so memory stays at a few blocks whatever the track length.
+Range nodes (silence, SFX, fades) pass untouched blocks straight through.
+"""
+
+from dataclasses import dataclass, replace
+from math import gcd
+import os
+from typing import Callable, Iterator, Tuple, Union
+
+import numpy as np
+import soundfile as sf
+
+try:
+    from scipy.signal import resample_poly
+except Exception:
+    resample_poly = None
+
+Block = Tuple[int, np.ndarray]
+
+
+@dataclass(frozen=True)
+class StreamInfo:
+    sample_rate: int
+    channels: int
+    frames: int
+
+    @property
+    def duration(self) -> float:
+        return self.frames / self.sample_rate
+
+
+# ----------------------------
+# NODES
+# ----------------------------
+
+class Node:
+    """
+    Transforms a stream of (first_sample, block) pairs; block is
+    (samples, channels) float32.
+    """
+
+    def bind(self, info: StreamInfo) -> StreamInfo:
+        self.info = info
+        return info
+
+    def process(self, blocks: Iterator[Block]) -> Iterator[Block]:
+        raise NotImplementedError
+
+
+class BlockNode(Node):
+    """
+    Stateless per-block node limited to the sample range [lo, hi).
+    """
+
+    def span(self):
+        return 0, self.info.frames
+
+    def process(self, blocks):
+        lo, hi = self.span()
+        for start, block in blocks:
+            stop = start + len(block)
+            if stop > lo and start < hi:
+                block = self.apply(start, block)
+            yield start, block
+
+    def apply(self, start: int, block: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+
+class GainCurve(BlockNode):
+    """
+    Multiplies by an envelope given at `rate` Hz (defaults to the stream
+    rate), or by a function of time in seconds. Samples past the end of an
+    array curve are muted.
+    """
+
+    def __init__(self, curve: Union[np.ndarray, Callable], rate: float = None):
+        self.curve = curve if callable(curve) else np.asarray(curve, dtype=np.float32)
+        self.rate = rate
+
+    def apply(self, start, block):
+        sr = self.info.sample_rate
+        times = (start + np.arange(len(block))) / sr
+
+        if callable(self.curve):
+            gain = self.curve(times)
+        elif (self.rate or sr) == sr:
+            gain = np.zeros(len(block), dtype=np.float32)
+            piece = self.curve[start:start + len(block)]
+            gain[:len(piece)] = piece
+        else:
+            points = np.arange(len(self.curve)) / self.rate
+            gain = np.interp(times, points, self.curve, right=0.0)
+
+        return block * np.asarray(gain, dtype=np.float32)[:, None]
+
+
+class SilenceWindow(BlockNode):
+
+    def __init__(self, start: float, duration: float):
+        self.start = start
+        self.duration = duration
+
+    def span(self):
+        sr = self.info.sample_rate
+        return int(self.start * sr), int((self.start + self.duration) * sr)
+
+    def apply(self, start, block):
+        lo, hi = self.span()
+        block = block.copy()
+        block[max(lo - start, 0):max(hi - start, 0)] = 0
+        return block
+
+
+class SFXInsert(BlockNode):
+    """
+    Adds SFX events ({"file", "time", optional "gain_db"}); each distinct
+    file is decoded once at bind time.
+    """
+
+    def __init__(self, events: list):
+        self.events = list(events)
+
+    def bind(self, info):
+        from audio_engine.numpy_mixer import SidechainMixer, db_to_gain
+
+        mixer = SidechainMixer(sample_rate=info.sample_rate, channels=info.channels)
+        # Events share the decoded clip; gain is applied per overlapping slice
+        self.hits = sorted(
+            (
+                (
+                    int(round(event["time"] * info.sample_rate)),
+                    mixer.sfx(event["file"]),
+                    db_to_gain(event.get("gain_db", 0.0)),
+                )
+                for event in self.events
+            ),
+            key=lambda hit: hit[0],
+        )
+        return super().bind(info)
+
+    def span(self):
+        if not self.hits:
+            return 0, 0
+        return self.hits[0][0], max(pos + len(clip) for pos, clip, _ in self.hits)
+
+    def apply(self, start, block):
+        stop = start + len(block)
+        block = block.copy()
+
+        for pos, clip, gain in self.hits:
+            if pos >= stop:
+                break
+            lo, hi = max(pos, start), min(pos + len(clip), stop)
+            if lo < hi:
+                block[lo - start:hi - start] += clip[lo - pos:hi - pos] * gain
+
+        return block
+
+
+class Fade(BlockNode):
+
+    def __init__(self, fade_in: float = 0.0, fade_out: float = 0.0):
+        self.fade_in = fade_in
+        self.fade_out = fade_out
+
+    def process(self, blocks):
+        sr, frames = self.info.sample_rate, self.info.frames
+        n_in = int(self.fade_in * sr)
+        n_out = int(self.fade_out * sr)
+
+        for start, block in blocks:
+            stop = start + len(block)
+            if start < n_in or stop > frames - n_out:
+                idx = start + np.arange(len(block))
+                gain = np.ones(len(block), dtype=np.float32)
+                if n_in:
+                    gain = np.minimum(gain, idx / n_in)
+                if n_out:
+                    gain = np.minimum(gain, (frames - idx) / n_out)
+                block = block * np.clip(gain, 0.0, 1.0)[:, None].astype(np.float32)
+            yield start, block
+
+
+class Downmix(BlockNode):
+
+    def bind(self, info):
+        super().bind(info)
+        return replace(info, channels=1)
+
+    def apply(self, start, block):
+        return block.mean(axis=1, keepdims=True)
+
+
+class Resample(Node):
+    """
+    Streaming polyphase resampling: input is cut into chunks that are
+    multiples of the decimation factor and filtered with `pad` samples of
+    real context on each side, so the output matches a whole-file
+    resample_poly to within the filter's edge effects.
+    """
+
+    def __init__(self, sample_rate: int, pad: int = 64):
+        self.sample_rate = sample_rate
+        self.pad = pad
+
+    def bind(self, info):
+        super().bind(info)
+        g = gcd(info.sample_rate, self.sample_rate)
+        self.up, self.down = self.sample_rate // g, info.sample_rate // g
+        # Context must cover the filter half-length and keep chunk edges on the output grid
+        self.context = self.down * -(-self.pad // self.down)
+        frames = -(-info.frames * self.up // self.down)
+        return replace(info, sample_rate=self.sample_rate, frames=frames)
+
+    def _chunk(self, data, offset, length):
+        # Output samples for input [offset, offset + length) of `data`
+        out = resample_poly(data, self.up, self.down, axis=0)
+        first = offset * self.up // self.down
+        count = -(-length * self.up // self.down)
+        return out[first:first + count].astype(np.float32)
+
+    def process(self, blocks):
+        if self.up == self.down:
+            yield from blocks
+            return
+        if resample_poly is None:
+            raise RuntimeError("scipy is required to resample audio")
+
+        ctx = self.context
+        step = self.down * max(1, -(-4096 // self.down))
+        channels = self.info.channels
+        buffer = np.zeros((ctx, channels), dtype=np.float32)  # silent history before t=0
+        written = 0
+
+        for _, block in blocks:
+            buffer = np.concatenate([buffer, block])
+            usable = (len(buffer) - 2 * ctx) // step * step
+            if usable <= 0:
+                continue
+            out = self._chunk(buffer[:usable + 2 * ctx], ctx, usable)
+            yield written, out
+            written += len(out)
+            buffer = buffer[usable:]
+
+        tail = len(buffer) - ctx
+        if tail > 0:
+            padded = np.concatenate([buffer, np.zeros((ctx, channels), dtype=np.float32)])
+            out = self._chunk(padded, ctx, tail)
+            yield written, out
+
+
+# ----------------------------
+# GRAPH
+# ----------------------------
+
+class AudioGraph:
+
+    def __init__(self, source_path: str, block_seconds: float = 1.0):
+        self.source_path = source_path
+        self.block_seconds = block_seconds
+        self.nodes = []
+
+    def then(self, node: Node) -> "AudioGraph":
+        self.nodes.append(node)
+        return self
+
+    def source_info(self) -> StreamInfo:
+        meta = sf.info(self.source_path)
+        return StreamInfo(meta.samplerate, meta.channels, meta.frames)
+
+    def _source(self, info: StreamInfo) -> Iterator[Block]:
+        blocksize = max(1, int(self.block_seconds * info.sample_rate))
+        start = 0
+        for block in sf.blocks(self.source_path, blocksize=blocksize, dtype="float32", always_2d=True):
+            yield start, block
+            start += len(block)
+
+    def stream(self) -> Tuple[StreamInfo, Iterator[Block]]:
+        info = self.source_info()
+        blocks = self._source(info)
+
+        for node in self.nodes:
+            info = node.bind(info)
+            blocks = node.process(blocks)
+
+        return info, blocks
+
+    def render(self, output_path: str, subtype: str = "PCM_16") -> str:
+        info, blocks = self.stream()
+
+        # The source is still being read while we write: never write over it
+        tmp_path = f"{output_path}.{os.getpid()}.tmp.wav"
+
+        with sf.SoundFile(
+            tmp_path, "w", samplerate=info.sample_rate, channels=info.channels, subtype=subtype
+        ) as out:
+            for _, block in blocks:
+                out.write(np.clip(block, -1.0, 1.0))
+
+        os.replace(tmp_path, output_path)
+        return output_path
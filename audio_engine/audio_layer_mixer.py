@@ -3,12 +3,31 @@ audio_layer_mixer.py
 Professional multi-layer mixer with ducking.
 """
 
-from pydub import AudioSegment
+try:
+    from pydub import AudioSegment
+except Exception:
+    AudioSegment = None
+
+from audio_engine.numpy_mixer import SidechainMixer
+
+AUDIO_BACKENDS = ("numpy", "pydub")
 
 
 class AudioLayerMixer:
 
-    def mix(self, narration_path: str, music_path: str, output_path: str):
+    def __init__(self, backend: str = "numpy", **mixer_options):
+        if backend not in AUDIO_BACKENDS:
+            raise ValueError(f"Unknown audio backend: {backend}")
+        if backend == "pydub" and AudioSegment is None:
+            raise RuntimeError("pydub is required for the pydub audio backend")
+
+        self.backend = backend
+        self.mixer = SidechainMixer(**mixer_options) if backend == "numpy" else None
+
+    def mix(self, narration_path: str, music_path: str, output_path: str, sfx_events: list = None):
+
+        if self.backend == "numpy":
+            return self.mixer.mix(narration_path, music_path, output_path, sfx_events)
 
         narration = AudioSegment.from_file(narration_path)
         music = AudioSegment.from_file(music_path)
@@ -19,4 +38,9 @@ class AudioLayerMixer:
         combined = music.overlay(narration)
 
         combined.export(output_path, format="wav")
+
+        if sfx_events:
+            from audio_engine.sfx_trigger_engine import SFXTriggerEngine
+            SFXTriggerEngine(backend="pydub").overlay_sfx(output_path, sfx_events, output_path)
+
         return output_path
@@ -3,15 +3,17 @@ beat_sync.py
 Detects beats for SFX sync.
 """
 
-import librosa
+from audio_engine.audio_features import AUDIO_FEATURES
 
 
 class BeatSync:
 
-    def detect_beats(self, audio_path: str):
-        y, sr = librosa.load(audio_path)
-        tempo, beats = librosa.beat.beat_track(y=y, sr=sr)
+    def __init__(self, features=AUDIO_FEATURES):
+        self.features = features
 
-        beat_times = librosa.frames_to_time(beats, sr=sr)
+    def detect_beats(self, audio_path: str):
+        # Precomputed per content hash; decodes only the first time
+        return self.features.features(audio_path).beats.tolist()
 
-        return beat_times.tolist()
+    def tempo(self, audio_path: str) -> float:
+        return self.features.features(audio_path).tempo
@@ -3,35 +3,199 @@ cinematic_curve_builder.py
 Builds full-video intensity envelope (0.0 → 1.0 scale).
 """
 
-from typing import List
+from collections import OrderedDict
+from dataclasses import dataclass
+import threading
+from typing import List, Sequence, Tuple
 import numpy as np
 
+from audio_engine.music_intensity_mapper import MusicIntensityMapper
 
-class CinematicCurveBuilder:
 
-    def build_curve(self, total_duration: float) -> np.ndarray:
-        """
-        Creates 3-act cinematic envelope.
-        """
+@dataclass(frozen=True)
+class CurveSegment:
+    """
+    One act of a shape, over video progress p in [previous until, until):
+    base + slope * (p - act start) + amp * sin(freq * p)
+    """
+    until: float
+    base: float
+    slope: float = 0.0
+    amp: float = 0.0
+    freq: float = 0.0
+
+
+CurveShape = Tuple[CurveSegment, ...]
+
+# At 48 kHz one 16-minute float32 curve is ~184 MB: bound the memo by bytes
+CURVE_CACHE_BYTES = 256 * 1024 * 1024
+
+SHAPES = {
+    # Act 1: rising, Act 2: tension sustain, Act 3: climax
+    "three_act": (
+        CurveSegment(until=0.2, base=0.3, slope=0.4),
+        CurveSegment(until=0.8, base=0.6, amp=0.1, freq=10.0),
+        CurveSegment(until=1.0, base=0.7, slope=1.5),
+    ),
+    "flat": (
+        CurveSegment(until=1.0, base=0.6),
+    ),
+}
+
+
+def shape_from_data(data: Sequence[dict]) -> CurveShape:
+    """
+    Shapes from config/JSON: [{"until": 0.2, "base": 0.3, "slope": 0.4}, ...]
+    """
+    return tuple(CurveSegment(**segment) for segment in data)
+
+
+def resolve_shape(shape) -> CurveShape:
+    if isinstance(shape, str):
+        return SHAPES[shape]
+    if shape and isinstance(shape[0], dict):
+        return shape_from_data(shape)
+    return tuple(shape)
+
+
+def _evaluate(shape: CurveShape, progress: np.ndarray) -> np.ndarray:
+    """
+    `progress` is ascending, so each act is one contiguous slice and every
+    sample is evaluated exactly once.
+    """
+    out = np.empty(len(progress), dtype=np.float64)
+    bounds = np.searchsorted(progress, [segment.until for segment in shape[:-1]])
+    edges = [0, *bounds, len(progress)]
+    start = 0.0
+
+    for segment, lo, hi in zip(shape, edges[:-1], edges[1:]):
+        p = progress[lo:hi]
+        piece = out[lo:hi]
+        np.multiply(p - start, segment.slope, out=piece)
+        piece += segment.base
+        if segment.amp:
+            piece += segment.amp * np.sin(segment.freq * p)
+        start = segment.until
+
+    return out
+
+
+class _CurveCache:
+    """
+    LRU of read-only curves, evicted by total size rather than count. A
+    curve larger than the whole budget is returned but not kept.
+    """
+
+    def __init__(self, max_bytes: int = CURVE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._curves = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, build) -> np.ndarray:
+        with self._lock:
+            curve = self._curves.get(key)
+            if curve is not None:
+                self._curves.move_to_end(key)
+                return curve
+
+        curve = build()
+
+        with self._lock:
+            if key not in self._curves:
+                self._curves[key] = curve
+                self._bytes += curve.nbytes
+            while self._bytes > self.max_bytes and self._curves:
+                _, evicted = self._curves.popitem(last=False)
+                self._bytes -= evicted.nbytes
 
-        fps = 100  # resolution
-        total_frames = int(total_duration * fps)
+        return curve
 
-        curve = np.zeros(total_frames)
+    def clear(self):
+        with self._lock:
+            self._curves.clear()
+            self._bytes = 0
 
-        for i in range(total_frames):
-            progress = i / total_frames
 
-            # Act 1: rising
-            if progress < 0.2:
-                curve[i] = 0.3 + 0.4 * progress
+CURVE_CACHE = _CurveCache()
 
-            # Act 2: tension sustain
-            elif progress < 0.8:
-                curve[i] = 0.6 + 0.1 * np.sin(progress * 10)
 
-            # Act 3: climax
-            else:
-                curve[i] = 0.7 + 0.3 * (progress - 0.8) * 5
+def _cached_curve(total_duration: float, rate: float, shape: CurveShape) -> np.ndarray:
+    return CURVE_CACHE.get(
+        ("curve", total_duration, rate, shape),
+        lambda: _build_curve(total_duration, rate, shape),
+    )
 
-        return np.clip(curve, 0, 1)
+
+def _build_curve(total_duration: float, rate: float, shape: CurveShape) -> np.ndarray:
+    total_frames = int(total_duration * rate)
+    progress = np.arange(total_frames, dtype=np.float64) / max(total_frames, 1)
+
+    curve = np.clip(_evaluate(shape, progress), 0, 1).astype(np.float32)
+    # Shared between callers: never mutate in place
+    curve.flags.writeable = False
+    return curve
+
+
+def _cached_envelope(
+    scene_gains: Tuple[Tuple[float, float], ...], rate: float, shape: CurveShape, ramp: float
+) -> np.ndarray:
+    return CURVE_CACHE.get(
+        ("envelope", scene_gains, rate, shape, ramp),
+        lambda: _build_envelope(scene_gains, rate, shape, ramp),
+    )
+
+
+def _build_envelope(
+    scene_gains: Tuple[Tuple[float, float], ...], rate: float, shape: CurveShape, ramp: float
+) -> np.ndarray:
+    total_duration = sum(duration for duration, _ in scene_gains)
+    curve = _cached_curve(total_duration, rate, shape)
+    if not scene_gains:
+        return curve
+
+    # Per-scene gain as breakpoints, ramping `ramp` seconds across each cut
+    points, values = [], []
+    start = 0.0
+    for duration, gain in scene_gains:
+        edge = min(ramp / 2, duration / 2)
+        points += [start + edge, start + duration - edge]
+        values += [gain, gain]
+        start += duration
+
+    times = np.arange(len(curve), dtype=np.float64) / rate
+    envelope = (curve * np.interp(times, points, values)).astype(np.float32)
+    envelope.flags.writeable = False
+    return envelope
+
+
+class CinematicCurveBuilder:
+
+    def __init__(self, mapper: MusicIntensityMapper = None):
+        self.mapper = mapper or MusicIntensityMapper()
+
+    def build_curve(self, total_duration: float, rate: float = 100, shape="three_act") -> np.ndarray:
+        """
+        Creates 3-act cinematic envelope at `rate` values per second (pass
+        the audio sample rate to get one gain per sample). Memoized and
+        read-only.
+        """
+        return _cached_curve(float(total_duration), float(rate), resolve_shape(shape))
+
+    def build_scene_envelope(
+        self, scenes: List, rate: float = 100, shape="three_act", ramp: float = 0.5
+    ) -> np.ndarray:
+        """
+        Shape curve times the per-scene bg_curve gains (as set by
+        ArcDesigner), in one pass over the timeline.
+        """
+        return _cached_envelope(
+            self.mapper.scene_gains(scenes), float(rate), resolve_shape(shape), float(ramp)
+        )
+
+    def node(self, scenes: List, rate: float = 100, shape="three_act"):
+        """
+        The scene envelope as an audio graph gain stage.
+        """
+        from audio_engine.audio_graph import GainCurve
+        return GainCurve(self.build_scene_envelope(scenes, rate, shape), rate=rate)
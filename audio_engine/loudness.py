@@ -0,0 +1,413 @@
+"""
+loudness.py
+Streaming ITU-R BS.1770 / EBU R128 loudness measurement and normalisation.
+
+K-weighting and the 400 ms / 75 % overlap gating run block by block over
+soundfile reads, true peak is estimated on a 4x oversampled signal, and
+measurements are cached in SQLite by audio content hash. Files small
+enough to hold in memory are measured and normalised in one read plus one
+write; larger ones stream (with a cached measurement, also one read plus
+one write).
+"""
+
+from math import tan, pi
+import os
+import sqlite3
+import time
+
+import numpy as np
+import soundfile as sf
+
+try:
+    from scipy.signal import sosfilt, resample_poly
+except Exception:
+    sosfilt = resample_poly = None
+
+from audio_engine.audio_graph import AudioGraph, BlockNode
+
+LOUDNESS_DB = "data/loudness_cache.db"
+
+ABSOLUTE_GATE = -70.0
+RELATIVE_GATE = -10.0
+BLOCK_SECONDS = 0.4
+STEP_SECONDS = 0.1
+
+
+def k_weighting(rate: float) -> np.ndarray:
+    """
+    BS.1770 pre-filter (high shelf) + RLB high-pass as second-order
+    sections, derived for any sample rate.
+    """
+    # Stage 1: high shelf
+    f0, gain_db, q = 1681.974450955533, 3.999843853973347, 0.7071752369554196
+    k = tan(pi * f0 / rate)
+    vh = 10 ** (gain_db / 20)
+    vb = vh ** 0.4996667741545416
+    a0 = 1 + k / q + k * k
+    shelf = [
+        (vh + vb * k / q + k * k) / a0,
+        2 * (k * k - vh) / a0,
+        (vh - vb * k / q + k * k) / a0,
+        1.0,
+        2 * (k * k - 1) / a0,
+        (1 - k / q + k * k) / a0,
+    ]
+
+    # Stage 2: high pass
+    f0, q = 38.13547087602444, 0.5003270373238773
+    k = tan(pi * f0 / rate)
+    a0 = 1 + k / q + k * k
+    highpass = [1.0, -2.0, 1.0, 1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0]
+
+    return np.array([shelf, highpass])
+
+
+def channel_weights(channels: int) -> np.ndarray:
+    # L, R, C at 1.0, LFE ignored, surrounds at 1.41 (5.1 order)
+    if channels < 4:
+        return np.ones(channels)
+    weights = np.ones(channels)
+    weights[3] = 0.0
+    weights[4:6] = 1.41
+    return weights
+
+
+def db(value: float) -> float:
+    return 20 * np.log10(value) if value > 0 else float("-inf")
+
+
+# ----------------------------
+# METER
+# ----------------------------
+
+class LoudnessMeter:
+    """
+    Feed blocks in order with update(); memory is one float per 100 ms.
+    """
+
+    OVERSAMPLE = 4
+    PEAK_CONTEXT = 32
+
+    def __init__(self, sample_rate: int, channels: int):
+        if sosfilt is None:
+            raise RuntimeError("scipy is required for loudness measurement")
+
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sos = k_weighting(sample_rate)
+        self.weights = channel_weights(channels)
+        self.zi = np.zeros((len(self.sos), 2, channels))
+        self.step = int(round(STEP_SECONDS * sample_rate))
+        self.oversample = self.OVERSAMPLE if sample_rate < 96000 else 2
+
+        self.steps = []  # weighted energy per 100 ms step
+        self._remainder = np.zeros(0)
+        # Silence before t=0 is real; later block edges get PEAK_CONTEXT of history
+        self._tail = np.zeros((self.PEAK_CONTEXT, channels), dtype=np.float32)
+        self.sample_peak = 0.0
+        self.true_peak = 0.0
+        self.frames = 0
+
+    def update(self, block: np.ndarray):
+        block = np.asarray(block, dtype=np.float32).reshape(len(block), -1)
+        if not len(block):
+            return
+        self.frames += len(block)
+
+        filtered, self.zi = sosfilt(self.sos, block, axis=0, zi=self.zi)
+        power = np.concatenate([self._remainder, (filtered ** 2) @ self.weights])
+
+        full = len(power) // self.step * self.step
+        if full:
+            self.steps.extend(power[:full].reshape(-1, self.step).sum(axis=1))
+        self._remainder = power[full:]
+
+        self.sample_peak = max(self.sample_peak, float(np.abs(block).max()))
+
+        context = np.concatenate([self._tail, block])
+        if len(context) > 2 * self.PEAK_CONTEXT:
+            self._peak(context, len(context) - self.PEAK_CONTEXT)
+            self._tail = context[-2 * self.PEAK_CONTEXT:]
+        else:
+            self._tail = context
+
+    def _peak(self, context, stop):
+        """
+        Oversampled peak of context[PEAK_CONTEXT:stop]; the samples around
+        it are only there so the interpolation filter sees real neighbours.
+        """
+        if stop <= self.PEAK_CONTEXT:
+            return
+        upsampled = resample_poly(context, self.oversample, 1, axis=0)
+        valid = upsampled[self.PEAK_CONTEXT * self.oversample:stop * self.oversample]
+        self.true_peak = max(self.true_peak, float(np.abs(valid).max()))
+
+    def _final_peak(self):
+        # The samples still held back, against the silence after the end
+        padded = np.concatenate([self._tail, np.zeros((self.PEAK_CONTEXT, self.channels), dtype=np.float32)])
+        self._peak(padded, len(self._tail))
+
+    def _block_energies(self) -> np.ndarray:
+        per_block = int(round(BLOCK_SECONDS / STEP_SECONDS))
+        steps = np.asarray(self.steps)
+        if len(steps) < per_block:
+            return np.zeros(0)
+        sums = np.convolve(steps, np.ones(per_block), mode="valid")
+        return sums / (per_block * self.step)
+
+    def integrated(self) -> float:
+        """
+        Gated integrated loudness in LUFS (-inf for silence / < 400 ms).
+        """
+        energies = self._block_energies()
+        with np.errstate(divide="ignore"):
+            loudness = -0.691 + 10 * np.log10(energies)
+
+        gated = energies[loudness > ABSOLUTE_GATE]
+        if not len(gated):
+            return float("-inf")
+
+        threshold = -0.691 + 10 * np.log10(gated.mean()) + RELATIVE_GATE
+        gated = energies[(loudness > ABSOLUTE_GATE) & (loudness > threshold)]
+        return float(-0.691 + 10 * np.log10(gated.mean()))
+
+    def result(self) -> dict:
+        self._final_peak()
+        return {
+            "integrated_lufs": self.integrated(),
+            "true_peak_db": db(self.true_peak),
+            "sample_peak_db": db(self.sample_peak),
+            "duration": self.frames / self.sample_rate,
+        }
+
+
+def measure(path: str, block_seconds: float = 1.0) -> dict:
+    info = sf.info(path)
+    meter = LoudnessMeter(info.samplerate, info.channels)
+    blocksize = max(1, int(block_seconds * info.samplerate))
+
+    for block in sf.blocks(path, blocksize=blocksize, dtype="float32", always_2d=True):
+        meter.update(block)
+
+    return meter.result()
+
+
+# ----------------------------
+# GAIN STAGE
+# ----------------------------
+
+def soft_limit(block: np.ndarray, ceiling: float, knee: float = 0.8) -> np.ndarray:
+    """
+    Identity below knee * ceiling, tanh into the ceiling above it.
+    Stateless, so it works on any block boundary.
+    """
+    start = knee * ceiling
+    over = np.abs(block) > start
+    if not over.any():
+        return block
+
+    span = ceiling - start
+    block = block.copy()
+    magnitude = np.abs(block[over])
+    block[over] = np.sign(block[over]) * (start + span * np.tanh((magnitude - start) / span))
+    return block
+
+
+class LoudnessGain(BlockNode):
+    """
+    Audio graph stage: fixed gain, soft-limited when the measured true
+    peak would pass the ceiling.
+    """
+
+    def __init__(self, gain_db: float, ceiling_db: float = None):
+        self.gain = 10 ** (gain_db / 20)
+        self.ceiling = 10 ** (ceiling_db / 20) if ceiling_db is not None else None
+
+    def apply(self, start, block):
+        block = block * np.float32(self.gain)
+        if self.ceiling is not None:
+            block = soft_limit(block, self.ceiling)
+        return block
+
+
+# ----------------------------
+# NORMALISER
+# ----------------------------
+
+class LoudnessNormalizer:
+
+    # Sample-peak margin below the true-peak ceiling when limiting
+    LIMIT_MARGIN_DB = 0.5
+    LIMIT_PASSES = 4
+
+    def __init__(
+        self,
+        target_lufs: float = -14.0,
+        true_peak_db: float = -1.0,
+        db_path: str = LOUDNESS_DB,
+        max_memory_bytes: int = 512 * 1024 ** 2
+    ):
+        self.target_lufs = target_lufs
+        self.true_peak_db = true_peak_db
+        self.db_path = db_path
+        self.max_memory_bytes = max_memory_bytes
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_db(self):
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS loudness (
+                content_hash TEXT PRIMARY KEY,
+                integrated_lufs REAL,
+                true_peak_db REAL,
+                sample_peak_db REAL,
+                duration REAL,
+                measured_at REAL
+            )
+        """)
+        # Final gain per target, including any make-up after limiting
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS gains (
+                content_hash TEXT,
+                target_lufs REAL,
+                true_peak_db REAL,
+                gain_db REAL,
+                ceiling_db REAL,
+                PRIMARY KEY (content_hash, target_lufs, true_peak_db)
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+    def cached(self, content_hash: str):
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT integrated_lufs, true_peak_db, sample_peak_db, duration FROM loudness WHERE content_hash = ?",
+            (content_hash,)
+        ).fetchone()
+        conn.close()
+
+        if row is None:
+            return None
+        return dict(zip(("integrated_lufs", "true_peak_db", "sample_peak_db", "duration"), row))
+
+    def store(self, content_hash: str, result: dict):
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO loudness VALUES (?, ?, ?, ?, ?, ?)",
+            (content_hash, result["integrated_lufs"], result["true_peak_db"],
+             result["sample_peak_db"], result["duration"], time.time())
+        )
+        conn.commit()
+        conn.close()
+
+    def cached_plan(self, content_hash: str):
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT gain_db, ceiling_db FROM gains WHERE content_hash = ? AND target_lufs = ? AND true_peak_db = ?",
+            (content_hash, self.target_lufs, self.true_peak_db)
+        ).fetchone()
+        conn.close()
+        return None if row is None else {"gain_db": row[0], "ceiling_db": row[1]}
+
+    def store_plan(self, content_hash: str, plan: dict):
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO gains VALUES (?, ?, ?, ?, ?)",
+            (content_hash, self.target_lufs, self.true_peak_db, plan["gain_db"], plan["ceiling_db"])
+        )
+        conn.commit()
+        conn.close()
+
+    def plan(self, measurement: dict) -> dict:
+        """
+        Gain to the target; limiting only when that gain would push the
+        true peak past the ceiling.
+        """
+        integrated = measurement["integrated_lufs"]
+        if not np.isfinite(integrated):
+            return {"gain_db": 0.0, "ceiling_db": None}
+
+        gain_db = self.target_lufs - integrated
+        limited = measurement["true_peak_db"] + gain_db > self.true_peak_db
+        return {
+            "gain_db": gain_db,
+            "ceiling_db": self.true_peak_db - self.LIMIT_MARGIN_DB if limited else None,
+        }
+
+    def normalize_array(self, data: np.ndarray, sample_rate: int) -> tuple:
+        """
+        In-memory producers (the mixer): measure and apply before their
+        single write. Returns (normalised, report).
+        """
+        data = np.asarray(data, dtype=np.float32).reshape(len(data), -1)
+        measurement = self._measure_array(data, sample_rate)
+
+        plan = self.plan(measurement)
+        out = LoudnessGain(plan["gain_db"], plan["ceiling_db"]).apply(0, data)
+
+        # Limiting costs loudness; the data is in memory, so make it back up
+        for _ in range(self.LIMIT_PASSES if plan["ceiling_db"] is not None else 0):
+            shortfall = self.target_lufs - self._measure_array(out, sample_rate)["integrated_lufs"]
+            if abs(shortfall) < 0.1:
+                break
+            plan["gain_db"] += shortfall
+            out = LoudnessGain(plan["gain_db"], plan["ceiling_db"]).apply(0, data)
+
+        return out, {**measurement, **plan, "target_lufs": self.target_lufs}
+
+    def _measure_array(self, data, sample_rate):
+        meter = LoudnessMeter(sample_rate, data.shape[1])
+        meter.update(data)
+        return meter.result()
+
+    def _render_gain(self, input_path, output_path, plan, subtype):
+        AudioGraph(input_path) \
+            .then(LoudnessGain(plan["gain_db"], plan["ceiling_db"])) \
+            .render(str(output_path), subtype=subtype)
+
+    def normalize(self, input_path: str, output_path: str, subtype: str = "PCM_16") -> dict:
+        from video_core.segment_cache import file_hash
+
+        content_hash = file_hash(input_path)
+        measurement = self.cached(content_hash)
+        plan = self.cached_plan(content_hash)
+        info = sf.info(input_path)
+
+        if plan is None and info.frames * info.channels * 4 <= self.max_memory_bytes:
+            # One read, one write
+            data, rate = sf.read(input_path, dtype="float32", always_2d=True)
+            out, report = self.normalize_array(data, rate)
+            self.store(content_hash, report)
+            self.store_plan(content_hash, report)
+            sf.write(output_path, np.clip(out, -1.0, 1.0), rate, subtype=subtype)
+            return {**report, "output_path": str(output_path), "cached": False}
+
+        cached = plan is not None
+        if measurement is None:
+            measurement = measure(input_path)
+            self.store(content_hash, measurement)
+        if plan is None:
+            plan = self.plan(measurement)
+
+        self._render_gain(input_path, output_path, plan, subtype)
+
+        if not cached:
+            # Streamed make-up: re-measure the limited output, as
+            # normalize_array does in memory, and keep the final gain
+            for _ in range(self.LIMIT_PASSES if plan["ceiling_db"] is not None else 0):
+                shortfall = self.target_lufs - measure(str(output_path))["integrated_lufs"]
+                if abs(shortfall) < 0.1:
+                    break
+                plan["gain_db"] += shortfall
+                self._render_gain(input_path, output_path, plan, subtype)
+            self.store_plan(content_hash, plan)
+
+        return {
+            **measurement, **plan, "target_lufs": self.target_lufs,
+            "output_path": str(output_path), "cached": cached,
+        }
@@ -3,6 +3,9 @@ music_intensity_mapper.py
 Maps scene-level intensity to gain values.
 """
 
+from typing import List, Tuple
+
+
 class MusicIntensityMapper:
 
     INTENSITY_GAIN = {
@@ -12,5 +15,17 @@ class MusicIntensityMapper:
         "climax": 1.5
     }
 
+    def __init__(self, gains: dict = None):
+        self.gains = {**self.INTENSITY_GAIN, **(gains or {})}
+
     def map_gain(self, scene_type: str) -> float:
-        return self.INTENSITY_GAIN.get(scene_type, 1.0)
+        return self.gains.get(scene_type, 1.0)
+
+    def scene_gains(self, scenes: List) -> Tuple[Tuple[float, float], ...]:
+        """
+        (duration, gain) per scene, hashable so envelopes can be memoized.
+        """
+        return tuple(
+            (float(scene.duration), self.map_gain(scene.audio.bg_curve))
+            for scene in scenes
+        )
@@ -0,0 +1,285 @@
+"""
+narration_engine.py
+Concurrent chunked TTS: bounded pool, per-chunk cache, ordered PCM joins.
+
+SSML is split on prosody/break boundaries under the TTS request limit,
+chunks are synthesized over a bounded thread pool (the work is network
+bound) and cached by hash(SSML, voice, backend, language, speaking rate). Results are appended to
+a single WAV strictly in chunk order as raw PCM frames, so joins are
+sample-exact and no intermediate part files or ffmpeg concat are needed.
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import io
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+import wave
+import zlib
+
+try:
+    from google.cloud import texttospeech
+except Exception:
+    texttospeech = None
+
+logger = logging.getLogger("NarrationEngine")
+
+NARRATION_CACHE = "audio/narration_cache"
+MAX_SSML_BYTES = 4800  # safe margin under the 5000 byte API limit
+
+
+def split_ssml(ssml_text: str, max_bytes: int = MAX_SSML_BYTES) -> list:
+    """
+    Packs <prosody>...</prosody><break/> blocks into chunks whose wrapped
+    <speak> form stays under `max_bytes`.
+    """
+    ssml_text = ssml_text.replace("<speak>", "").replace("</speak>", "")
+
+    blocks = re.findall(r'<prosody.*?>.*?</prosody>\s*<break.*?/>', ssml_text, re.DOTALL)
+    if not blocks:
+        blocks = [ssml_text]
+
+    parts = []
+    current = ""
+
+    for block in blocks:
+        candidate = current + block
+
+        if len(f"<speak>{candidate}</speak>".encode("utf-8")) > max_bytes:
+            if current:
+                parts.append(current)
+
+            if len(block.encode("utf-8")) > max_bytes:
+                # Single block too large: hard truncate safely
+                parts.append(block.encode("utf-8")[:max_bytes - 50].decode("utf-8", errors="ignore"))
+                current = ""
+            else:
+                current = block
+        else:
+            current = candidate
+
+    if current:
+        parts.append(current)
+
+    return [f"<speak>{part}</speak>" for part in parts]
+
+
+def read_pcm(wav_bytes: bytes):
+    """
+    ((rate, channels, sample width), raw PCM frames) of a WAV payload.
+    """
+    with wave.open(io.BytesIO(wav_bytes), "rb") as w:
+        return (w.getframerate(), w.getnchannels(), w.getsampwidth()), w.readframes(w.getnframes())
+
+
+def pcm_to_wav(pcm: bytes, rate: int, channels: int = 1, width: int = 2) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(width)
+        w.setframerate(rate)
+        w.writeframes(pcm)
+    return buffer.getvalue()
+
+
+# ----------------------------
+# BACKENDS
+# ----------------------------
+
+class GoogleTTSBackend:
+
+    name = "google"
+
+    def __init__(self, language_code: str = "en-US", speaking_rate: float = 1.0):
+        if texttospeech is None:
+            raise RuntimeError("google-cloud-texttospeech is not installed")
+        self.language_code = language_code
+        self.speaking_rate = speaking_rate
+        # One gRPC client, shared by every worker thread
+        self.client = texttospeech.TextToSpeechClient()
+
+    def synthesize(self, ssml: str, voice: str) -> bytes:
+        response = self.client.synthesize_speech(
+            input=texttospeech.SynthesisInput(ssml=ssml),
+            voice=texttospeech.VoiceSelectionParams(
+                language_code=self.language_code,
+                name=voice
+            ),
+            audio_config=texttospeech.AudioConfig(
+                audio_encoding=texttospeech.AudioEncoding.LINEAR16,
+                speaking_rate=self.speaking_rate
+            )
+        )
+        return response.audio_content
+
+
+class FakeTTSBackend:
+    """
+    Offline stand-in: sleeps like a network round trip, then returns a
+    deterministic LINEAR16 WAV whose length follows the text length.
+    """
+
+    name = "fake"
+
+    def __init__(self, sample_rate: int = 24000, latency: float = 0.4, seconds_per_char: float = 0.05,
+                 language_code: str = "en-US", speaking_rate: float = 1.0):
+        self.sample_rate = sample_rate
+        self.latency = latency
+        self.seconds_per_char = seconds_per_char
+        self.language_code = language_code
+        self.speaking_rate = speaking_rate
+
+    def synthesize(self, ssml: str, voice: str) -> bytes:
+        import numpy as np
+
+        time.sleep(self.latency)
+
+        text = re.sub(r"<[^>]+>", "", ssml)
+        samples = max(1, int(len(text) * self.seconds_per_char * self.sample_rate / self.speaking_rate))
+        seed = zlib.crc32(f"{voice}|{ssml}".encode("utf-8"))
+        freq = 140 + seed % 120
+
+        # One second of tone repeated: cheap enough not to skew benchmarks
+        t = np.arange(self.sample_rate) / self.sample_rate
+        tone = 0.2 * np.sin(2 * math.pi * freq * t) * (0.6 + 0.4 * np.sin(2 * math.pi * 3 * t))
+        pcm = (tone * 32767).astype("<i2").tobytes()
+        repeats, rest = divmod(samples, self.sample_rate)
+        return pcm_to_wav(pcm * repeats + pcm[:rest * 2], self.sample_rate)
+
+
+# ----------------------------
+# ENGINE
+# ----------------------------
+
+class NarrationEngine:
+
+    def __init__(self, backend, voice: str, cache_dir: str = NARRATION_CACHE, workers: int = 4):
+        self.backend = backend
+        self.voice = voice
+        self.cache_dir = cache_dir
+        self.workers = max(1, workers)
+        self.last_stats = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def chunk_key(self, ssml: str) -> str:
+        # Anything that changes the rendered audio must change the key
+        payload = json.dumps({
+            "ssml": ssml,
+            "voice": self.voice,
+            "backend": self.backend.name,
+            "language_code": getattr(self.backend, "language_code", None),
+            "speaking_rate": getattr(self.backend, "speaking_rate", None),
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.wav")
+
+    def _chunk(self, ssml: str):
+        """
+        (wav bytes, cache hit); runs on a pool thread.
+        """
+        path = self._cache_path(self.chunk_key(ssml))
+
+        try:
+            with open(path, "rb") as f:
+                return f.read(), True
+        except FileNotFoundError:
+            pass
+
+        audio = self.backend.synthesize(ssml, self.voice)
+
+        # Atomic: a concurrent run never reads a half-written chunk
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(audio)
+        os.replace(tmp_path, path)
+
+        return audio, False
+
+    def synthesize(self, ssml_text: str, output_path) -> str:
+        chunks = split_ssml(ssml_text)
+        if not chunks:
+            raise ValueError("Empty narration script")
+
+        start = time.perf_counter()
+        hits = 0
+        frames = 0
+        params = None
+        out = None
+
+        # Written beside the target and moved into place on success, so a
+        # failed run leaves no partial narration behind
+        tmp_path = f"{output_path}.{os.getpid()}.tmp"
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+
+                # At most 2x workers chunks in flight or waiting to be written
+                pending = deque()
+                queue = iter(chunks)
+
+                def fill():
+                    while len(pending) < 2 * self.workers:
+                        ssml = next(queue, None)
+                        if ssml is None:
+                            return
+                        pending.append(pool.submit(self._chunk, ssml))
+
+                fill()
+                while pending:
+                    try:
+                        audio, hit = pending.popleft().result()
+                    except Exception:
+                        for future in pending:
+                            future.cancel()
+                        raise
+                    fill()
+
+                    chunk_params, pcm = read_pcm(audio)
+                    if params is None:
+                        # The writer only exists once the format is known
+                        params = chunk_params
+                        out = wave.open(tmp_path, "wb")
+                        out.setframerate(params[0])
+                        out.setnchannels(params[1])
+                        out.setsampwidth(params[2])
+                    elif chunk_params != params:
+                        raise ValueError(f"Narration chunk format {chunk_params} != {params}")
+
+                    out.writeframes(pcm)
+                    frames += len(pcm) // (params[1] * params[2])
+                    hits += hit
+
+            out.close()
+            os.replace(tmp_path, str(output_path))
+
+        except BaseException:
+            if out is not None:
+                try:
+                    out.close()
+                except Exception:
+                    pass
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        wall = time.perf_counter() - start
+        audio_seconds = frames / params[0] if params else 0.0
+        self.last_stats = {
+            "chunks": len(chunks),
+            "cache_hits": hits,
+            "workers": self.workers,
+            "wall_time": round(wall, 3),
+            "audio_seconds": round(audio_seconds, 3),
+            "realtime_factor": round(audio_seconds / wall, 2) if wall else 0.0,
+        }
+        logger.info(f"Narration: {self.last_stats}")
+
+        return str(output_path)
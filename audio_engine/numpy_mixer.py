@@ -0,0 +1,206 @@
+"""
+numpy_mixer.py
+Single-pass NumPy mixer: sidechain-ducked music, narration and SFX.
+"""
+
+from collections import defaultdict
+from math import gcd
+
+import numpy as np
+import soundfile as sf
+
+try:
+    from scipy.signal import resample_poly
+except Exception:
+    resample_poly = None
+
+
+def db_to_gain(db: float) -> float:
+    return float(10 ** (db / 20.0))
+
+
+class SidechainMixer:
+    """
+    Every input is decoded once, converted to `sample_rate` / `channels`
+    and summed into one float32 buffer that is written once.
+
+    Music is ducked by `duck_db` wherever the narration RMS (measured over
+    `window` seconds) rises above `threshold_db`. The gain moves toward the
+    ducked level with an `attack` time constant and recovers with `release`,
+    so the music breathes between sentences instead of pumping.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 48000,
+        channels: int = 2,
+        music_db: float = -10.0,
+        duck_db: float = -10.0,
+        threshold_db: float = -40.0,
+        attack: float = 0.015,
+        release: float = 0.35,
+        window: float = 0.02,
+        normalizer=None
+    ):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.music_db = music_db
+        self.duck_db = duck_db
+        self.threshold_db = threshold_db
+        self.attack = attack
+        self.release = release
+        self.window = window
+        self.normalizer = normalizer
+        self.loudness = None
+        self._sfx = {}
+
+    # ----------------------------
+    # DECODE
+    # ----------------------------
+
+    def decode(self, path: str) -> np.ndarray:
+        """
+        (samples, channels) float32 at the mixer rate.
+        """
+        data, sr = sf.read(path, dtype="float32", always_2d=True)
+
+        if sr != self.sample_rate:
+            if resample_poly is None:
+                raise RuntimeError("scipy is required to resample audio")
+            g = gcd(int(sr), int(self.sample_rate))
+            data = resample_poly(data, self.sample_rate // g, int(sr) // g, axis=0).astype(np.float32)
+
+        if data.shape[1] == self.channels:
+            return data
+        if data.shape[1] != 1:
+            data = data.mean(axis=1, keepdims=True)
+        return np.repeat(data, self.channels, axis=1)
+
+    def sfx(self, path: str) -> np.ndarray:
+        # Each distinct SFX file is decoded once per mixer
+        if path not in self._sfx:
+            self._sfx[path] = self.decode(path)
+        return self._sfx[path]
+
+    # ----------------------------
+    # SIDECHAIN
+    # ----------------------------
+
+    def ducking_gain(self, narration: np.ndarray) -> np.ndarray:
+        """
+        Per-sample music gain driven by the narration level.
+        """
+        hop = max(1, int(self.window * self.sample_rate))
+        mono = narration.mean(axis=1)
+        frames = -(-len(mono) // hop)
+        if not frames:
+            return np.ones(0, dtype=np.float32)
+
+        padded = np.zeros(frames * hop, dtype=np.float32)
+        padded[:len(mono)] = mono
+        rms = np.sqrt(np.mean(padded.reshape(frames, hop) ** 2, axis=1))
+        level_db = 20 * np.log10(np.maximum(rms, 1e-9))
+
+        loud = level_db > self.threshold_db
+        target = np.where(loud, db_to_gain(self.duck_db), 1.0)
+
+        # Asymmetric one-pole smoothing at control rate (one value per
+        # window), then interpolated to sample rate. The gain always lies
+        # between the two targets, so a ducked window moves with the attack
+        # constant and an open one with the release constant; within a run
+        # of equal targets the filter is LTI and has a closed form.
+        decay = np.where(
+            loud,
+            np.exp(-self.window / max(self.attack, 1e-6)),
+            np.exp(-self.window / max(self.release, 1e-6)),
+        )
+
+        starts = np.flatnonzero(np.diff(loud)) + 1
+        starts = np.concatenate([[0], starts])
+        lengths = np.diff(np.append(starts, frames))
+
+        # Gain entering each run: one scalar step per run, not per window
+        entering = np.empty(len(starts))
+        gain = 1.0
+        for run, (want, d, length) in enumerate(zip(target[starts], decay[starts], lengths)):
+            entering[run] = gain
+            gain = want + (gain - want) * d ** length
+
+        run_of = np.repeat(np.arange(len(starts)), lengths)
+        steps = np.arange(frames) - starts[run_of] + 1
+        want = target[starts][run_of]
+        env = (want + (entering[run_of] - want) * decay[starts][run_of] ** steps).astype(np.float32)
+
+        centers = (np.arange(frames) + 0.5) * hop
+        return np.interp(np.arange(len(mono)), centers, env).astype(np.float32)
+
+    # ----------------------------
+    # SFX
+    # ----------------------------
+
+    def place_sfx(self, mix: np.ndarray, sfx_events: list):
+        """
+        Adds every event into `mix` in place: one scatter-add per distinct
+        SFX file, covering all of its trigger times at once.
+        """
+        positions = defaultdict(list)
+        for event in sfx_events:
+            start = int(round(event["time"] * self.sample_rate))
+            positions[event["file"]].append((start, db_to_gain(event.get("gain_db", 0.0))))
+
+        length = len(mix)
+
+        for path, hits in positions.items():
+            clip = self.sfx(path)
+            starts = np.array([start for start, _ in hits], dtype=np.int64)
+            gains = np.array([gain for _, gain in hits], dtype=np.float32)
+
+            index = starts[:, None] + np.arange(len(clip))[None, :]
+            valid = (index >= 0) & (index < length)
+            if not valid.any():
+                continue
+
+            values = clip[None, :, :] * gains[:, None, None]
+            np.add.at(mix, index[valid], values[valid])
+
+    # ----------------------------
+    # MIX
+    # ----------------------------
+
+    def _fit(self, data: np.ndarray, length: int) -> np.ndarray:
+        """
+        Loops short beds and trims long ones to `length` samples.
+        """
+        if len(data) == 0:
+            return np.zeros((length, self.channels), dtype=np.float32)
+        if len(data) < length:
+            data = np.tile(data, (-(-length // len(data)), 1))
+        return data[:length]
+
+    def _write(self, mix: np.ndarray, output_path: str):
+        if self.normalizer is not None:
+            # Loudness target applied before the one write
+            mix, self.loudness = self.normalizer.normalize_array(mix, self.sample_rate)
+        np.clip(mix, -1.0, 1.0, out=mix)
+        sf.write(output_path, mix, self.sample_rate, subtype="PCM_16")
+        return output_path
+
+    def mix(self, narration_path: str, music_path: str, output_path: str, sfx_events: list = None):
+        """
+        The output follows the narration length; music loops under it.
+        """
+        narration = self.decode(narration_path)
+        music = self._fit(self.decode(music_path), len(narration))
+
+        mix = music * (self.ducking_gain(narration) * db_to_gain(self.music_db))[:, None]
+        mix += narration
+
+        if sfx_events:
+            self.place_sfx(mix, sfx_events)
+
+        return self._write(mix, output_path)
+
+    def overlay_sfx(self, base_audio_path: str, sfx_events: list, output_path: str):
+        mix = self.decode(base_audio_path)
+        self.place_sfx(mix, sfx_events)
+        return self._write(mix, output_path)
@@ -3,20 +3,40 @@ sfx_trigger_engine.py
 Injects SFX at strategic timestamps.
 """
 
-from pydub import AudioSegment
+try:
+    from pydub import AudioSegment
+except Exception:
+    AudioSegment = None
+
+from audio_engine.audio_layer_mixer import AUDIO_BACKENDS
+from audio_engine.numpy_mixer import SidechainMixer
 
 
 class SFXTriggerEngine:
 
+    def __init__(self, backend: str = "numpy", sample_rate: int = 48000):
+        if backend not in AUDIO_BACKENDS:
+            raise ValueError(f"Unknown audio backend: {backend}")
+        if backend == "pydub" and AudioSegment is None:
+            raise RuntimeError("pydub is required for the pydub audio backend")
+
+        self.backend = backend
+        self.mixer = SidechainMixer(sample_rate=sample_rate) if backend == "numpy" else None
+
     def overlay_sfx(self, base_audio_path: str, sfx_events: list, output_path: str):
 
+        if self.backend == "numpy":
+            return self.mixer.overlay_sfx(base_audio_path, sfx_events, output_path)
+
         base = AudioSegment.from_file(base_audio_path)
+        decoded = {}
 
         for event in sfx_events:
-            sfx = AudioSegment.from_file(event["file"])
+            if event["file"] not in decoded:
+                decoded[event["file"]] = AudioSegment.from_file(event["file"])
             position = int(event["time"] * 1000)
 
-            base = base.overlay(sfx, position=position)
+            base = base.overlay(decoded[event["file"]], position=position)
 
         base.export(output_path, format="wav")
         return output_path
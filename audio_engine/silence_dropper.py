@@ -3,20 +3,16 @@ silence_dropper.py
 Injects dramatic silence before reveal scenes.
 """
 
-import numpy as np
-import soundfile as sf
+from audio_engine.audio_graph import AudioGraph, SilenceWindow
 
 
 class SilenceDropper:
 
-    def apply(self, audio_path: str, drop_time: float, duration: float, output_path: str):
-
-        data, sr = sf.read(audio_path)
+    def node(self, drop_time: float, duration: float) -> SilenceWindow:
+        return SilenceWindow(drop_time, duration)
 
-        start_sample = int(drop_time * sr)
-        end_sample = int((drop_time + duration) * sr)
-
-        data[start_sample:end_sample] = 0
+    def apply(self, audio_path: str, drop_time: float, duration: float, output_path: str):
 
-        sf.write(output_path, data, sr)
-        return output_path
+        return AudioGraph(audio_path) \
+            .then(self.node(drop_time, duration)) \
+            .render(output_path)
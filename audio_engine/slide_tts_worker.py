@@ -0,0 +1,286 @@
+"""
+slide_tts_worker.py
+Batched Coqui VITS narration for the slide renderer.
+
+The model is loaded once per worker process (by the pool initializer)
+and slides fan out across CPU workers. Tempo (WSOLA) and resampling run
+in-process with NumPy/scipy instead of an ffmpeg atempo pass, and every
+sentence is cached on (text, speaker, speed), so re-running a lecture
+after editing one slide only synthesizes the changed sentences.
+
+    python -m audio_engine.slide_tts_worker --audio-map slide_audio_map.json --workers 4
+"""
+
+from multiprocessing import cpu_count
+import argparse
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import sys
+import time
+
+import numpy as np
+import soundfile as sf
+
+try:
+    from scipy.signal import resample_poly
+except Exception:
+    resample_poly = None
+
+logger = logging.getLogger("SlideTTS")
+
+MODEL_NAME = "tts_models/en/vctk/vits"
+MODEL = "audio_engine.slide_tts_worker:load_model"
+VOICE_POOL = ["p225", "p226", "p227", "p228", "p229", "p230"]
+SAMPLE_RATE = 22050
+SENTENCE_GAP = 0.12
+TTS_CACHE = "audio/slide_tts_cache"
+# Bump when synthesis or post-processing changes; old sentences are ignored
+CACHE_VERSION = 1
+
+
+# ----------------------------
+# MODEL (one per worker process)
+# ----------------------------
+
+def load_model():
+    os.environ.setdefault("PHONEMIZER_ESPEAK_PATH", "/usr/bin/espeak")
+    os.environ.setdefault("ESPEAK_PATH", "/usr/bin/espeak")
+
+    import torch
+    from TTS.api import TTS
+
+    # Split the cores between workers instead of every worker using all of them
+    torch.set_num_threads(int(os.environ.get("SLIDE_TTS_THREADS", cpu_count())))
+
+    return TTS(model_name=MODEL_NAME, progress_bar=False, gpu=False)
+
+
+# ----------------------------
+# TEXT / VOICE
+# ----------------------------
+
+def split_sentences(text: str) -> list:
+    return [s for s in re.split(r"(?<=[.!?])\s+", text.strip()) if s]
+
+
+def prepare_text(sentence: str) -> str:
+    # Longer pauses on punctuation, as the serial notebook cell did
+    return sentence.replace(".", "... ").replace(",", ", ")
+
+
+def voice_for(slide_id) -> tuple:
+    """
+    (speaker, speed) chosen per slide, but stable across runs so cache
+    keys survive a re-render.
+    """
+    rng = random.Random(f"voice:{slide_id}")
+    return rng.choice(VOICE_POOL), round(rng.uniform(0.95, 1.1), 3)
+
+
+def sentence_key(text: str, speaker: str, speed: float) -> str:
+    payload = json.dumps(
+        [CACHE_VERSION, MODEL_NAME, SAMPLE_RATE, text, speaker, round(speed, 3)]
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ----------------------------
+# DSP
+# ----------------------------
+
+def time_stretch(y: np.ndarray, speed: float, sample_rate: int,
+                 frame_ms: float = 40.0, tolerance_ms: float = 10.0) -> np.ndarray:
+    """
+    WSOLA tempo change without pitch shift (speed > 1 is faster, like
+    ffmpeg's atempo). Each output frame is taken from near its nominal
+    input position where it best continues the previous frame.
+    """
+    if abs(speed - 1.0) < 1e-3 or len(y) == 0:
+        return y
+
+    n = int(sample_rate * frame_ms / 1000) // 2 * 2
+    hop_out = n // 2
+    hop_in = hop_out * speed
+    tol = int(sample_rate * tolerance_ms / 1000)
+    window = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(n) / n)).astype(np.float32)
+
+    out_len = int(len(y) / speed)
+    frames = out_len // hop_out + 1
+    pad = tol + n
+    source = np.concatenate([np.zeros(pad, np.float32), y.astype(np.float32), np.zeros(pad + n * 2, np.float32)])
+
+    out = np.zeros(frames * hop_out + n, dtype=np.float32)
+    norm = np.zeros_like(out)
+    previous = None
+
+    for k in range(frames):
+        nominal = pad + int(round(k * hop_in))
+
+        if previous is None:
+            start = nominal
+        else:
+            # Natural continuation of the previous frame, matched against candidates
+            template = source[previous + hop_out:previous + hop_out + n:4]
+            region = source[nominal - tol:nominal + tol + n]
+            candidates = np.lib.stride_tricks.sliding_window_view(region, n)[:, ::4]
+            start = nominal - tol + int(np.argmax(candidates @ template))
+
+        out[k * hop_out:k * hop_out + n] += window * source[start:start + n]
+        norm[k * hop_out:k * hop_out + n] += window
+        previous = start
+
+    out /= np.maximum(norm, 1e-3)
+    return out[:out_len]
+
+
+def resample(y: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    if source_rate == target_rate:
+        return y
+    if resample_poly is None:
+        raise RuntimeError("scipy is required to resample audio")
+    g = np.gcd(int(source_rate), int(target_rate))
+    return resample_poly(y, target_rate // g, source_rate // g).astype(np.float32)
+
+
+# ----------------------------
+# WORKER TASK
+# ----------------------------
+
+def synthesize_batch(payload: dict) -> list:
+    """
+    Pool task: every uncached sentence of one slide, on this worker's
+    already-loaded model. Writes each sentence to the cache.
+    """
+    from render.worker_pool import worker_resource
+
+    model = worker_resource(MODEL)
+    source_rate = model.synthesizer.output_sample_rate
+    written = []
+
+    for key, text, speaker, speed in payload["items"]:
+        y = np.asarray(model.tts(text=prepare_text(text), speaker=speaker), dtype=np.float32)
+        y = resample(time_stretch(y, speed, source_rate), source_rate, SAMPLE_RATE)
+
+        path = os.path.join(payload["cache_dir"], f"{key}.wav")
+        tmp_path = f"{path}.{os.getpid()}.tmp.wav"
+        sf.write(tmp_path, np.clip(y, -1.0, 1.0), SAMPLE_RATE, subtype="PCM_16")
+        os.replace(tmp_path, path)
+        written.append(key)
+
+    return written
+
+
+# ----------------------------
+# RENDERER
+# ----------------------------
+
+class SlideVoiceRenderer:
+
+    def __init__(self, cache_dir: str = TTS_CACHE, workers: int = None):
+        self.cache_dir = cache_dir
+        self.workers = workers or max(1, min(4, cpu_count() // 2))
+        self.last_stats = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.wav")
+
+    def plan(self, audio_map: list) -> tuple:
+        """
+        ([(slide_id, [sentence keys]), ...], per-slide batches of the
+        sentences that are not cached yet).
+        """
+        slides, batches, queued = [], [], set()
+
+        for item in audio_map:
+            speaker, speed = voice_for(item["slide_id"])
+            keys, missing = [], []
+
+            for sentence in split_sentences(item["spoken_text"]):
+                key = sentence_key(sentence, speaker, speed)
+                keys.append(key)
+                if key not in queued and not os.path.exists(self._path(key)):
+                    queued.add(key)
+                    missing.append((key, sentence, speaker, speed))
+
+            slides.append((item["slide_id"], keys))
+            if missing:
+                batches.append({"cache_dir": self.cache_dir, "items": missing})
+
+        return slides, batches
+
+    def _synthesize(self, batches: list):
+        if not batches:
+            return
+        if self.workers == 1 or len(batches) == 1:
+            for batch in batches:
+                synthesize_batch(batch)
+            return
+
+        from render.worker_pool import RenderWorkerPool
+
+        os.environ["SLIDE_TTS_THREADS"] = str(max(1, cpu_count() // self.workers))
+        with RenderWorkerPool(self.workers, preload=(MODEL,)) as pool:
+            pool.run(synthesize_batch, batches)
+
+    def assemble(self, keys: list, output_path: str) -> str:
+        gap = np.zeros(int(SENTENCE_GAP * SAMPLE_RATE), dtype=np.float32)
+        parts = []
+
+        for key in keys:
+            y, _ = sf.read(self._path(key), dtype="float32")
+            parts += [y, gap]
+
+        audio = np.concatenate(parts[:-1]) if parts else gap
+        sf.write(output_path, audio, SAMPLE_RATE, subtype="PCM_16")
+        return output_path
+
+    def render(self, audio_map: list, out_dir: str = ".") -> list:
+        start = time.perf_counter()
+        slides, batches = self.plan(audio_map)
+
+        self._synthesize(batches)
+
+        outputs = [
+            self.assemble(keys, os.path.join(out_dir, f"voice_{slide_id}.wav"))
+            for slide_id, keys in slides
+        ]
+
+        total = sum(len(keys) for _, keys in slides)
+        synthesized = sum(len(batch["items"]) for batch in batches)
+        self.last_stats = {
+            "slides": len(slides),
+            "sentences": total,
+            "synthesized": synthesized,
+            "cached": total - synthesized,
+            "workers": self.workers,
+            "wall_time": round(time.perf_counter() - start, 2),
+        }
+        logger.info(f"Slide voices: {self.last_stats}")
+
+        return outputs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batched slide narration")
+    parser.add_argument("--audio-map", default="slide_audio_map.json")
+    parser.add_argument("--out-dir", default=".")
+    parser.add_argument("--cache-dir", default=TTS_CACHE)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    with open(args.audio_map) as f:
+        audio_map = json.load(f)
+
+    renderer = SlideVoiceRenderer(args.cache_dir, args.workers)
+    renderer.render(audio_map, args.out_dir)
+    print("Voice files ready:", renderer.last_stats)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
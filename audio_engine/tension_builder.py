@@ -4,26 +4,24 @@ Applies intensity envelope to background music.
 """
 
 import numpy as np
-import soundfile as sf
 
+from audio_engine.audio_graph import AudioGraph, Downmix, GainCurve
 
-class TensionBuilder:
-
-    def apply_curve(self, audio_path: str, curve: np.ndarray, output_path: str):
-
-        data, sr = sf.read(audio_path)
-
-        if len(data.shape) == 2:
-            mono = data.mean(axis=1)
-        else:
-            mono = data
 
-        scaled = np.zeros_like(mono)
-
-        min_len = min(len(curve), len(mono))
-
-        for i in range(min_len):
-            scaled[i] = mono[i] * curve[i]
+class TensionBuilder:
 
-        sf.write(output_path, scaled, sr)
-        return output_path
+    def node(self, curve: np.ndarray, rate: float = None) -> GainCurve:
+        """
+        Envelope as a graph node, for chaining with other stages.
+        """
+        return GainCurve(curve, rate=rate)
+
+    def apply_curve(self, audio_path: str, curve: np.ndarray, output_path: str, rate: float = None):
+        """
+        `curve` holds one gain per sample unless `rate` says otherwise;
+        output is mono, muted past the end of the curve.
+        """
+        return AudioGraph(audio_path) \
+            .then(Downmix()) \
+            .then(self.node(curve, rate)) \
+            .render(output_path)
@@ -0,0 +1,111 @@
+"""
+image_ingest.py
+Decode-once ingest stage for stock / AI / news images.
+
+Each source is decoded a single time (JPEG draft mode lets libjpeg
+downscale by 1/2..1/8 while decoding), resized to cover the render canvas
+at the motion template's maximum zoom and stored as a raw uint8 .npy that
+render workers memory-map instead of decoding full-size originals.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import cpu_count
+from pathlib import Path
+import hashlib
+import logging
+import os
+
+import numpy as np
+from PIL import Image
+
+from motion_engine.affine_warp import cover_size
+
+logger = logging.getLogger("ImageIngest")
+
+
+def decode_scaled(image_path, canvas_size, max_scale) -> np.ndarray:
+    img = Image.open(image_path)
+    target = cover_size(img.size, canvas_size, max_scale)
+
+    if img.format == "JPEG":
+        # Only downscales; never below the requested size
+        img.draft("RGB", target)
+
+    img = img.convert("RGBA" if img.mode in ("RGBA", "LA", "P") else "RGB")
+
+    if img.size != target:
+        img = img.resize(target, Image.LANCZOS)
+
+    return np.ascontiguousarray(np.asarray(img))
+
+
+def _ingest_task(task):
+    image_path, canvas_size, max_scale, output_path = task
+
+    pixels = decode_scaled(image_path, canvas_size, max_scale)
+
+    tmp_path = f"{output_path}.{os.getpid()}.tmp.npy"
+    np.save(tmp_path, pixels)
+    os.replace(tmp_path, output_path)
+
+    return output_path
+
+
+class ImageIngestor:
+
+    def __init__(self, cache_dir: str = "assets/ingest_cache", workers=None):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.workers = workers or max(1, cpu_count() - 1)
+
+    def _output_path(self, image_path, canvas_size, max_scale) -> Path:
+        stat = os.stat(image_path)
+        key = (
+            f"{os.path.abspath(image_path)}:{stat.st_mtime_ns}:{stat.st_size}:"
+            f"{canvas_size[0]}x{canvas_size[1]}:{round(max_scale, 4)}"
+        )
+        hashed = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{hashed}.npy"
+
+    def ingest(self, image_path, canvas_size, max_scale=1.0) -> Path:
+        output_path = self._output_path(image_path, canvas_size, max_scale)
+
+        if not output_path.exists():
+            _ingest_task((str(image_path), tuple(canvas_size), max_scale, str(output_path)))
+            logger.info(f"Ingested {image_path} -> {output_path}")
+
+        return output_path
+
+    def ingest_many(self, items):
+        """
+        items: [(image_path, canvas_size, max_scale)]
+        Decodes every missing item across the worker pool; returns the
+        ingested paths in input order.
+        """
+        outputs = []
+        pending = {}
+
+        for image_path, canvas_size, max_scale in items:
+            output_path = self._output_path(image_path, canvas_size, max_scale)
+            outputs.append(output_path)
+
+            if not output_path.exists() and str(output_path) not in pending:
+                pending[str(output_path)] = (
+                    str(image_path), tuple(canvas_size), max_scale, str(output_path)
+                )
+
+        if pending:
+            workers = min(self.workers, len(pending))
+            logger.info(f"Ingesting {len(pending)} images on {workers} workers")
+
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(_ingest_task, pending.values()))
+
+        return outputs
+
+
+def load_ingested(path) -> np.ndarray:
+    """
+    Read-only memory map of an ingested image; pages load on first touch.
+    """
+    return np.load(path, mmap_mode="r")
@@ -23,9 +23,23 @@ class VisualDecisionEngine:
 
     def __init__(self):
         self.prompt_enhancer = PromptEnhancer()
-        self.ai_generator = AIGenerator()
-        self.stock_fetcher = StockFetcher()
         self.cache = ImageCacheManager()
+        self._ai_generator = None
+        self._stock_fetcher = None
+
+    # API clients are created on the first cache miss, so cached and
+    # offline renders need no OPENAI / PEXELS credentials
+    @property
+    def ai_generator(self):
+        if self._ai_generator is None:
+            self._ai_generator = AIGenerator()
+        return self._ai_generator
+
+    @property
+    def stock_fetcher(self):
+        if self._stock_fetcher is None:
+            self._stock_fetcher = StockFetcher()
+        return self._stock_fetcher
 
     def resolve(self, scene: Scene):
 
@@ -0,0 +1,334 @@
+"""
+affine_warp.py
+Precomputed affine warp engine for motion templates.
+
+A template describes its motion as vectorized (scale, angle, dx, dy)
+curves. Those compile once into per-frame 2x3 inverse matrices over the
+scene duration, and every frame is a single warp (cv2.warpAffine when
+available, a vectorized NumPy bilinear kernel otherwise) that crops from a
+source pre-scaled once to the canvas times the template's maximum zoom.
+"""
+
+from collections import OrderedDict
+from functools import lru_cache
+import math
+import os
+
+import numpy as np
+from PIL import Image
+
+try:
+    import cv2
+except Exception:
+    cv2 = None
+
+
+# ----------------------------
+# MATRICES
+# ----------------------------
+
+def cover_size(src_size, out_size, max_scale=1.0):
+    """
+    Smallest size with the source aspect that covers out_size * max_scale.
+    """
+    src_w, src_h = src_size
+    out_w, out_h = out_size
+    k = max(out_w / src_w, out_h / src_h) * max_scale
+    return max(1, int(math.ceil(src_w * k))), max(1, int(math.ceil(src_h * k)))
+
+
+def inverse_matrices(scale, angle, dx, dy, out_size, src_size, max_scale):
+    """
+    Output-pixel -> source-pixel matrices, shape (n, 2, 3).
+
+    The source is already scaled so that zoom == max_scale maps it 1:1,
+    hence the per-frame factor max_scale / scale.
+    """
+    out_w, out_h = out_size
+    src_w, src_h = src_size
+
+    k = max_scale / np.asarray(scale, dtype=np.float64)
+    rad = np.deg2rad(np.asarray(angle, dtype=np.float64))
+    cos, sin = np.cos(rad) * k, np.sin(rad) * k
+
+    cx, cy = out_w / 2.0, out_h / 2.0
+    sx = src_w / 2.0 - np.asarray(dx, dtype=np.float64) * k
+    sy = src_h / 2.0 - np.asarray(dy, dtype=np.float64) * k
+
+    cos, sin, sx, sy = np.broadcast_arrays(cos, sin, sx, sy)
+
+    matrices = np.empty(cos.shape + (2, 3), dtype=np.float32)
+    matrices[..., 0, 0] = cos
+    matrices[..., 0, 1] = -sin
+    matrices[..., 0, 2] = sx - (cos * cx - sin * cy)
+    matrices[..., 1, 0] = sin
+    matrices[..., 1, 1] = cos
+    matrices[..., 1, 2] = sy - (sin * cx + cos * cy)
+
+    return matrices
+
+
+@lru_cache(maxsize=256)
+def compile_matrices(template, duration, fps, out_size, src_size):
+    """
+    Per-frame matrices for one (template, duration, fps, sizes) tuple.
+    Templates are stateless registry singletons, so they key the cache.
+    """
+    n_frames = max(1, int(math.ceil(duration * fps - 1e-6)))
+    t = np.arange(n_frames, dtype=np.float64) / fps
+
+    scale, angle, dx, dy = template.motion(t, duration)
+
+    matrices = inverse_matrices(
+        scale, angle, dx, dy, out_size, src_size, template.MAX_SCALE
+    )
+    matrices.setflags(write=False)
+    return matrices
+
+
+# ----------------------------
+# WARP KERNELS
+# ----------------------------
+
+@lru_cache(maxsize=8)
+def _pixel_grid(out_w, out_h):
+    xs = np.arange(out_w, dtype=np.float32)
+    ys = np.arange(out_h, dtype=np.float32)
+    return xs, ys
+
+
+def _warp_numpy(src, matrix, out_size):
+    out_w, out_h = out_size
+    src_h, src_w = src.shape[:2]
+    xs, ys = _pixel_grid(out_w, out_h)
+
+    (a, b, c), (d, e, f) = matrix
+
+    if b == 0 and d == 0:
+        # Scale/translate only: coordinates are separable per row/column
+        sx = (a * xs + c)[None, :]
+        sy = (e * ys + f)[:, None]
+    else:
+        sx = a * xs[None, :] + b * ys[:, None] + c
+        sy = d * xs[None, :] + e * ys[:, None] + f
+
+    x0 = np.floor(sx)
+    y0 = np.floor(sy)
+    fx = (sx - x0)[..., None]
+    fy = (sy - y0)[..., None]
+
+    valid = (sx >= 0) & (sx <= src_w - 1) & (sy >= 0) & (sy <= src_h - 1)
+
+    x0 = np.clip(x0.astype(np.int32), 0, src_w - 1)
+    y0 = np.clip(y0.astype(np.int32), 0, src_h - 1)
+    x1 = np.minimum(x0 + 1, src_w - 1)
+    y1 = np.minimum(y0 + 1, src_h - 1)
+
+    top = src[y0, x0] * (1 - fx) + src[y0, x1] * fx
+    bottom = src[y1, x0] * (1 - fx) + src[y1, x1] * fx
+    out = top * (1 - fy) + bottom * fy
+
+    out *= np.broadcast_to(valid, out.shape[:2])[..., None]
+    return out.astype(np.uint8)
+
+
+def warp(src, matrix, out_size):
+    if cv2 is not None:
+        return cv2.warpAffine(
+            src,
+            np.asarray(matrix, dtype=np.float64),
+            out_size,
+            flags=cv2.INTER_LINEAR | cv2.WARP_INVERSE_MAP,
+            borderMode=cv2.BORDER_CONSTANT,
+            borderValue=0,
+        )
+    return _warp_numpy(src, matrix, out_size)
+
+
+def center_zoom(frame, scale):
+    """
+    One-off zoom about the frame centre, same size out.
+    """
+    h, w = frame.shape[:2]
+    matrix = inverse_matrices(scale, 0.0, 0.0, 0.0, (w, h), (w, h), 1.0)
+    return warp(np.ascontiguousarray(frame), matrix, (w, h))
+
+
+# ----------------------------
+# PLANS
+# ----------------------------
+
+class WarpPlan:
+
+    def __init__(self, template, source, duration, fps, out_size):
+        self._last = (None, None)
+        self.template = template
+        self.source = source
+        self.duration = duration
+        self.fps = fps
+        self.out_size = out_size
+        self.src_size = (source.shape[1], source.shape[0])
+        self.matrices = compile_matrices(
+            template, duration, fps, out_size, self.src_size
+        )
+
+    def matrix(self, t):
+        n = t * self.fps
+        idx = int(round(n))
+        if abs(n - idx) < 1e-6 and idx < len(self.matrices):
+            return self.matrices[idx]
+
+        scale, angle, dx, dy = self.template.motion(np.asarray(t), self.duration)
+        return inverse_matrices(
+            scale, angle, dx, dy, self.out_size, self.src_size, self.template.MAX_SCALE
+        )
+
+    def frame(self, t):
+        # rgb() and alpha() of an RGBA plan share one warp per t
+        last_t, last_frame = self._last
+        if last_t == t:
+            return last_frame
+
+        frame = warp(self.source, self.matrix(t), self.out_size)
+        self._last = (t, frame)
+        return frame
+
+    def rgb(self, t):
+        return self.frame(t)[..., :3]
+
+    def alpha(self, t):
+        return self.frame(t)[..., 3] / 255.0
+
+
+def load_source(image, fit_size, max_scale):
+    """
+    Decodes and pre-scales once so frames never touch the full original.
+    """
+    if str(image).endswith(".npy"):
+        # Ingested source: already decoded at canvas * max zoom, map it as-is
+        pixels = np.load(image, mmap_mode="r")
+        h, w = pixels.shape[:2]
+        cover_w, cover_h = cover_size((w, h), fit_size, max_scale)
+        if abs(cover_w - w) <= 1 and abs(cover_h - h) <= 1:
+            return pixels
+        image = np.asarray(pixels)
+
+    if isinstance(image, np.ndarray):
+        img = Image.fromarray(image)
+    else:
+        img = Image.open(image)
+        img = img.convert("RGBA" if img.mode in ("RGBA", "LA", "P") else "RGB")
+
+    size = cover_size(img.size, fit_size, max_scale)
+    if img.size != size:
+        img = img.resize(size, Image.LANCZOS)
+
+    return np.ascontiguousarray(np.asarray(img))
+
+
+class AffineWarpEngine:
+    """
+    Process-wide plan cache: identical (image, size, template, duration)
+    tuples share one pre-scaled source and matrix stack.
+
+    Decoded sources live in a byte-bounded LRU; evicting or releasing a
+    source drops every plan built on it so the pixels are actually freed.
+    """
+
+    def __init__(self, max_plans=32, max_bytes=1024 ** 3):
+        self.max_plans = max_plans
+        self.max_bytes = max_bytes
+        self._plans = OrderedDict()
+        self._sources = OrderedDict()
+        self._source_bytes = 0
+
+    def _image_key(self, image):
+        if isinstance(image, np.ndarray):
+            return ("array", id(image), image.shape)
+        stat = os.stat(image)
+        return (os.path.abspath(image), stat.st_mtime_ns, stat.st_size)
+
+    def _source(self, source_key, image, fit_size, max_scale):
+        source = self._sources.get(source_key)
+        if source is not None:
+            self._sources.move_to_end(source_key)
+            return source
+
+        source = load_source(image, fit_size, max_scale)
+        self._sources[source_key] = source
+        self._source_bytes += source.nbytes
+
+        while self._source_bytes > self.max_bytes and len(self._sources) > 1:
+            self._drop_source(next(iter(self._sources)))
+
+        return source
+
+    def _drop_source(self, source_key):
+        source = self._sources.pop(source_key)
+        self._source_bytes -= source.nbytes
+
+        for key in [key for key in self._plans if key[0] == source_key]:
+            del self._plans[key]
+
+    def release(self, image):
+        """
+        Frees every source and plan decoded from `image` (a path).
+        """
+        path = os.path.abspath(image)
+
+        for source_key in [key for key in self._sources if key[0][0] == path]:
+            self._drop_source(source_key)
+
+    @property
+    def nbytes(self) -> int:
+        return self._source_bytes
+
+    def plan(self, image, template, duration, out_size, fps, fit_size=None, image_key=None):
+        """
+        fit_size: box the source covers at zoom 1.0 (defaults to out_size);
+        a larger out_size leaves room for zooms past the fitted box.
+        image_key: stable identity for in-memory sources.
+        """
+        fit_size = tuple(fit_size or out_size)
+        source_key = (image_key or self._image_key(image), fit_size, template.MAX_SCALE)
+        key = (
+            source_key,
+            type(template).__name__,
+            round(float(duration), 6),
+            tuple(out_size),
+            fps,
+        )
+
+        plan = self._plans.get(key)
+        if plan is not None:
+            self._plans.move_to_end(key)
+            self._sources.move_to_end(source_key)
+            return plan
+
+        source = self._source(source_key, image, fit_size, template.MAX_SCALE)
+        plan = WarpPlan(template, source, duration, fps, tuple(out_size))
+
+        self._plans[key] = plan
+        while len(self._plans) > self.max_plans:
+            self._plans.popitem(last=False)
+
+        return plan
+
+
+WARP_ENGINE = AffineWarpEngine()
+
+
+def warp_clip(plan, name=None):
+    """
+    moviepy view over a plan, for the write_videofile path.
+    """
+    from moviepy.editor import VideoClip
+
+    if plan.source.shape[2] == 4:
+        clip = VideoClip(plan.rgb, duration=plan.duration)
+        clip.mask = VideoClip(plan.alpha, duration=plan.duration, ismask=True)
+    else:
+        clip = VideoClip(plan.frame, duration=plan.duration)
+
+    clip.profile_name = name or type(plan.template).__name__
+    return clip
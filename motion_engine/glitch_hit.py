@@ -6,17 +6,29 @@ Micro glitch burst for pattern interrupt.
 from moviepy.editor import ImageClip
 import numpy as np
 
+from motion_engine.affine_warp import WARP_ENGINE
+
 
 class GlitchHitMotion:
 
-    def apply(self, image_path: str, duration: float):
+    MAX_SCALE = 1.0
+
+    def motion(self, t, duration):
+        return 1.0, 0.0, 0.0, 0.0
+
+    def apply(self, image_path: str, duration: float, size=(1920, 1080), fps=30):
 
-        clip = ImageClip(image_path).set_duration(duration)
+        # Static frame: fit once through the shared plan, no per-frame warp
+        plan = WARP_ENGINE.plan(image_path, self, duration, size, fps)
+        clip = ImageClip(plan.frame(0)).set_duration(duration)
 
         def glitch(get_frame, t):
             frame = get_frame(t)
             if int(t * 10) % 7 == 0:
+                frame = frame.copy()
                 frame[:, :, 0] = np.roll(frame[:, :, 0], 5, axis=1)
             return frame
 
-        return clip.fl(glitch)
+        clip = clip.fl(glitch)
+        clip.profile_name = type(self).__name__
+        return clip
@@ -3,18 +3,19 @@ kenburns.py
 Slow cinematic zoom & pan.
 """
 
-from moviepy.editor import ImageClip
-import numpy as np
+from motion_engine.affine_warp import WARP_ENGINE, warp_clip
 
 
 class KenBurnsMotion:
 
-    def apply(self, image_path: str, duration: float):
+    MAX_SCALE = 1.05
 
-        clip = ImageClip(image_path).set_duration(duration)
+    def motion(self, t, duration):
+        scale = 1 + 0.05 * (t / duration)
+        return scale, 0.0, 0.0, 0.0
 
-        def zoom(t):
-            scale = 1 + 0.05 * (t / duration)
-            return scale
+    def apply(self, image_path: str, duration: float, size=(1920, 1080), fps=30):
 
-        return clip.resize(lambda t: zoom(t))
+        plan = WARP_ENGINE.plan(image_path, self, duration, size, fps)
+
+        return warp_clip(plan)
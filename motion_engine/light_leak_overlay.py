@@ -3,14 +3,56 @@ light_leak_overlay.py
 Adds cinematic light overlay.
 """
 
-from moviepy.editor import VideoFileClip, CompositeVideoClip
+import logging
+import os
+
+from moviepy.editor import ImageClip
+
+from motion_engine.affine_warp import WARP_ENGINE
+from motion_engine.overlay_store import OVERLAY_STORE
+
+logger = logging.getLogger("LightLeakOverlay")
+
+# tools/generate_elite_assets.py writes the variants; light_leak.mp4 wins if present
+OVERLAY_PATHS = [
+    "assets/overlays/light_leak.mp4",
+    "assets/overlays/light_leak_variant_0.mp4",
+]
 
 
 class LightLeakOverlay:
 
-    def apply(self, base_clip, overlay_path="assets/overlays/light_leak.mp4"):
+    MAX_SCALE = 1.0
+
+    def __init__(self, overlay_paths=None):
+        self.overlay_paths = overlay_paths or OVERLAY_PATHS
+
+    def motion(self, t, duration):
+        return 1.0, 0.0, 0.0, 0.0
+
+    def overlay_path(self):
+        return next((path for path in self.overlay_paths if os.path.exists(path)), None)
+
+    def overlay(self, base_clip, overlay_path=None, fps=30):
+        """
+        Blends the shared leak loop over any clip.
+        """
+        overlay_path = overlay_path or self.overlay_path()
+        if overlay_path is None:
+            logger.warning("No light leak overlay asset found; scene left unlit")
+            return base_clip
+
+        # Smooth gradients: a half-resolution loop is indistinguishable
+        return OVERLAY_STORE.apply(
+            base_clip, overlay_path, mode="normal", opacity=0.3, fps=fps, downscale=2
+        )
+
+    def apply(self, image_path: str, duration: float, size=(1920, 1080), fps=30):
 
-        overlay = VideoFileClip(overlay_path).set_opacity(0.3)
-        overlay = overlay.set_duration(base_clip.duration)
+        # Static frame fitted once through the shared plan, leak on top
+        plan = WARP_ENGINE.plan(image_path, self, duration, size, fps)
+        clip = ImageClip(plan.frame(0)).set_duration(duration)
 
-        return CompositeVideoClip([base_clip, overlay])
+        clip = self.overlay(clip, fps=fps)
+        clip.profile_name = type(self).__name__
+        return clip
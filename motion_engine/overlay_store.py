@@ -0,0 +1,208 @@
+"""
+overlay_store.py
+Process-wide store of decoded overlay loops (light leaks and other textures).
+
+Each loop is decoded by ffmpeg once into a raw uint8 file next to the
+other caches and memory-mapped, so every scene and every render worker
+shares the same pages instead of spawning its own VideoFileClip reader.
+Frames are served by t mod loop length and blended in place.
+"""
+
+from pathlib import Path
+import hashlib
+import logging
+import os
+import subprocess
+
+import numpy as np
+
+try:
+    import cv2
+except Exception:
+    cv2 = None
+
+try:
+    from imageio_ffmpeg import get_ffmpeg_exe
+except Exception:
+    get_ffmpeg_exe = None
+
+logger = logging.getLogger("OverlayStore")
+
+
+# ----------------------------
+# BLEND MODES
+# ----------------------------
+
+def _normal(base, overlay, out):
+    out[...] = overlay
+
+
+def _screen(base, overlay, out):
+    # base + overlay - base * overlay / 255
+    np.multiply(base, overlay, out=out, dtype=np.float32)
+    out *= -1.0 / 255.0
+    out += base
+    out += overlay
+
+
+def _add(base, overlay, out):
+    np.add(base, overlay, out=out, dtype=np.float32)
+    np.minimum(out, 255, out=out)
+
+
+def _overlay(base, overlay, out):
+    np.multiply(base, overlay, out=out, dtype=np.float32)
+    out *= 2.0 / 255.0
+    bright = base >= 128
+    if bright.any():
+        inv = (255.0 - base[bright]) * (255.0 - np.broadcast_to(overlay, base.shape)[bright])
+        out[bright] = 255.0 - inv * (2.0 / 255.0)
+
+
+BLEND_MODES = {
+    "normal": _normal,
+    "screen": _screen,
+    "add": _add,
+    "overlay": _overlay,
+}
+
+
+def blend(frame, overlay, mode="normal", opacity=1.0, scratch=None):
+    """
+    frame <- frame + opacity * (mode(frame, overlay) - frame), in place.
+    `overlay` may be single-channel (H, W, 1) for luminance loops.
+    """
+    if opacity <= 0.0:
+        return frame
+
+    if scratch is None:
+        scratch = np.empty(frame.shape, dtype=np.float32)
+
+    BLEND_MODES[mode](frame, overlay, scratch)
+
+    if opacity < 1.0:
+        scratch -= frame
+        scratch *= opacity
+        scratch += frame
+
+    frame[...] = scratch
+    return frame
+
+
+def fit_frame(frame, size):
+    """
+    Upsamples a compact stored frame to the canvas size.
+    """
+    width, height = size
+    if frame.shape[1] == width and frame.shape[0] == height:
+        return frame
+
+    if cv2 is not None:
+        resized = cv2.resize(np.asarray(frame), (width, height), interpolation=cv2.INTER_LINEAR)
+        return resized.reshape(height, width, frame.shape[2])
+
+    rows = (np.arange(height) * frame.shape[0]) // height
+    cols = (np.arange(width) * frame.shape[1]) // width
+    return frame[rows[:, None], cols[None, :]]
+
+
+# ----------------------------
+# LOOPS
+# ----------------------------
+
+class OverlayLoop:
+
+    def __init__(self, frames, fps):
+        self.frames = frames
+        self.fps = fps
+
+    @property
+    def loop_length(self) -> float:
+        return len(self.frames) / self.fps
+
+    def frame(self, t):
+        idx = int(round((t % self.loop_length) * self.fps)) % len(self.frames)
+        return self.frames[idx]
+
+
+class OverlayStore:
+
+    def __init__(self, cache_dir: str = "assets/overlay_cache"):
+        self.cache_dir = Path(cache_dir)
+        self._loops = {}
+
+    def _cache_path(self, path, size, fps, gray) -> Path:
+        stat = os.stat(path)
+        key = (
+            f"{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}:"
+            f"{size[0]}x{size[1]}:{fps}:{'gray' if gray else 'rgb'}"
+        )
+        hashed = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{hashed}.u8"
+
+    def _decode(self, path, size, fps, gray, output_path):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = f"{output_path}.{os.getpid()}.tmp"
+
+        command = [
+            get_ffmpeg_exe() if get_ffmpeg_exe else "ffmpeg",
+            "-loglevel", "error",
+            "-i", str(path),
+            "-vf", f"scale={size[0]}:{size[1]}",
+            "-r", str(fps),
+            "-f", "rawvideo",
+            "-pix_fmt", "gray" if gray else "rgb24",
+            "-",
+        ]
+
+        with open(tmp_path, "wb") as f:
+            subprocess.run(command, stdout=f, check=True)
+
+        os.replace(tmp_path, output_path)
+        logger.info(f"Decoded overlay loop {path} -> {output_path}")
+
+    def get(self, path, size, fps=30, downscale=1, gray=False) -> OverlayLoop:
+        """
+        size: canvas size; the loop is stored at size / downscale (light
+        leaks are smooth enough to keep at a fraction of the canvas).
+        gray: store a single luminance channel (monochrome textures).
+        """
+        stored = (max(1, size[0] // downscale), max(1, size[1] // downscale))
+        key = (os.path.abspath(path), stored, fps, gray)
+
+        loop = self._loops.get(key)
+        if loop is not None:
+            return loop
+
+        cache_path = self._cache_path(path, stored, fps, gray)
+        if not cache_path.exists():
+            self._decode(path, stored, fps, gray, cache_path)
+
+        channels = 1 if gray else 3
+        frame_bytes = stored[0] * stored[1] * channels
+        count = os.path.getsize(cache_path) // frame_bytes
+
+        frames = np.memmap(
+            cache_path, dtype=np.uint8, mode="r",
+            shape=(count, stored[1], stored[0], channels),
+        )
+
+        loop = OverlayLoop(frames, fps)
+        self._loops[key] = loop
+        return loop
+
+    def apply(self, clip, path, mode="normal", opacity=1.0, fps=30, downscale=1, gray=False):
+        """
+        moviepy path: blends the loop over `clip` in a single fl pass.
+        """
+        loop = self.get(path, clip.size, fps=fps, downscale=downscale, gray=gray)
+
+        def overlay(get_frame, t):
+            frame = np.array(get_frame(t)[..., :3], dtype=np.uint8)
+            layer = fit_frame(loop.frame(t), clip.size)
+            return blend(frame, layer, mode, opacity)
+
+        return clip.fl(overlay, keep_duration=True)
+
+
+OVERLAY_STORE = OverlayStore()
@@ -3,21 +3,20 @@ parallax.py
 Simulated depth drift effect.
 """
 
-from moviepy.editor import ImageClip
-import numpy as np
+from motion_engine.affine_warp import WARP_ENGINE, warp_clip
 
 
 class ParallaxMotion:
 
-    def apply(self, image_path: str, duration: float):
+    # Slight overscan so the 20px drift never exposes an edge
+    MAX_SCALE = 1.03
 
-        clip = ImageClip(image_path).set_duration(duration)
+    def motion(self, t, duration):
+        shift = 20 * (t / duration)
+        return self.MAX_SCALE, 0.0, shift, 0.0
 
-        w, h = clip.size
+    def apply(self, image_path: str, duration: float, size=(1920, 1080), fps=30):
 
-        def drift(get_frame, t):
-            frame = get_frame(t)
-            shift = int(20 * (t / duration))
-            return np.roll(frame, shift, axis=1)
+        plan = WARP_ENGINE.plan(image_path, self, duration, size, fps)
 
-        return clip.fl(drift)
+        return warp_clip(plan)
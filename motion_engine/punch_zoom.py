@@ -3,18 +3,21 @@ punch_zoom.py
 Fast impact zoom for hooks & climax.
 """
 
-from moviepy.editor import ImageClip
+import numpy as np
+
+from motion_engine.affine_warp import WARP_ENGINE, warp_clip
 
 
 class PunchZoomMotion:
 
-    def apply(self, image_path: str, duration: float):
+    MAX_SCALE = 1.24
+
+    def motion(self, t, duration):
+        scale = np.where(t < 0.3, 1 + (0.3 - t) * 0.8, 1.0)
+        return scale, 0.0, 0.0, 0.0
 
-        clip = ImageClip(image_path).set_duration(duration)
+    def apply(self, image_path: str, duration: float, size=(1920, 1080), fps=30):
 
-        def scale(t):
-            if t < 0.3:
-                return 1 + (0.3 - t) * 0.8
-            return 1.0
+        plan = WARP_ENGINE.plan(image_path, self, duration, size, fps)
 
-        return clip.resize(lambda t: scale(t))
+        return warp_clip(plan)
@@ -3,16 +3,20 @@ rotation_drift.py
 Subtle psychological instability effect.
 """
 
-from moviepy.editor import ImageClip
+from motion_engine.affine_warp import WARP_ENGINE, warp_clip
 
 
 class RotationDriftMotion:
 
-    def apply(self, image_path: str, duration: float):
+    # Rotated corners fall outside the source and stay black, as before
+    MAX_SCALE = 1.0
 
-        clip = ImageClip(image_path).set_duration(duration)
+    def motion(self, t, duration):
+        angle = 2 * (t / duration)
+        return 1.0, angle, 0.0, 0.0
 
-        def angle(t):
-            return 2 * (t / duration)
+    def apply(self, image_path: str, duration: float, size=(1920, 1080), fps=30):
 
-        return clip.rotate(lambda t: angle(t))
+        plan = WARP_ENGINE.plan(image_path, self, duration, size, fps)
+
+        return warp_clip(plan)
@@ -14,6 +14,9 @@ from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
 from google.oauth2.credentials import Credentials
 
+from scripts.stage_tracer import TRACER
+from scripts.groq_rate_limiter import GROQ_LIMITER, estimate_tokens
+
 
 # =========================
 # ENV
@@ -124,25 +127,24 @@ def safe_api_json(r):
 
 def groq_chat(prompt, model=GROQ_MODEL):
 
-    r = requests.post(
-        "https://api.groq.com/openai/v1/chat/completions",
-        headers={
-            "Authorization": f"Bearer {GROQ_API_KEY}",
-            "Content-Type": "application/json"
-        },
-        json={
-            "model": model,
-            "messages":[{"role":"user","content":prompt}]
-        },
-        timeout=120
-    )
-
-    data = safe_api_json(r)
+    def send():
+        return requests.post(
+            "https://api.groq.com/openai/v1/chat/completions",
+            headers={
+                "Authorization": f"Bearer {GROQ_API_KEY}",
+                "Content-Type": "application/json"
+            },
+            json={
+                "model": model,
+                "messages":[{"role":"user","content":prompt}]
+            },
+            timeout=120
+        )
 
-    # throttle to avoid Groq TPM limits
-    time.sleep(12)
+    # Shared RPM/TPM budget; 429s wait for the server's retry-after
+    r = GROQ_LIMITER.run(send, estimate_tokens(prompt))
 
-    return data
+    return safe_api_json(r)
 
 
 # =========================
@@ -1519,7 +1521,8 @@ def upload_video(video_file, title, description, hashtags, thumbnail_path):
 
 def run_pipeline():
 
-    topics = discover_trending_topics()
+    with TRACER.span("discover_topics", "llm"):
+        topics = discover_trending_topics()
 
     if not topics:
         topics = FALLBACK_TOPICS
@@ -1531,56 +1534,68 @@ def run_pipeline():
 
             print("Processing:", topic)
 
-            package = retry_request(
-                lambda: generate_full_video_package(topic),
-                attempts=2,
-                context="full-video-package",
-                fallback={}
-            ) or {}
+            with TRACER.span(f"topic_{i}"):
+                process_topic(topic)
+        except Exception as e:
+            print(f"Topic processing failed but continuing pipeline: {e}")
 
-            outline = package.get("outline", f"Outline unavailable for topic: {topic}")
-            script = package.get("script", f"Script unavailable for topic: {topic}")
 
-            title = package.get("title", topic[:90])
-            description = package.get("description", f"Automated video package for: {topic}")
-            hashtags = package.get("hashtags", ["AI", "Documentary", "Education"])
+def process_topic(topic):
 
-            thumbnail_prompt = generate_thumbnail_prompt(title)
-            thumbnail_path = generate_thumbnail(thumbnail_prompt)
+    with TRACER.span("video_package", "llm"):
+        package = retry_request(
+            lambda: generate_full_video_package(topic),
+            attempts=2,
+            context="full-video-package",
+            fallback={}
+        ) or {}
 
-            send_to_kaggle(script)
+    outline = package.get("outline", f"Outline unavailable for topic: {topic}")
+    script = package.get("script", f"Script unavailable for topic: {topic}")
 
-            videos = glob.glob("artifacts/**/*.mp4", recursive=True)
+    title = package.get("title", topic[:90])
+    description = package.get("description", f"Automated video package for: {topic}")
+    hashtags = package.get("hashtags", ["AI", "Documentary", "Education"])
 
-            if not videos:
-                print("No video found in Kaggle artifacts; skipping YouTube upload for this topic.")
-                continue
+    with TRACER.span("thumbnail", "media"):
+        thumbnail_prompt = generate_thumbnail_prompt(title)
+        thumbnail_path = generate_thumbnail(thumbnail_prompt)
 
-            video_path = videos[0]
+    with TRACER.span("kaggle_render", "render"):
+        send_to_kaggle(script)
 
-            print("Video found:", video_path)
+    videos = glob.glob("artifacts/**/*.mp4", recursive=True)
 
-            upload_video(
-                video_path,
-                title,
-                description,
-                hashtags,
-                thumbnail_path
-            )
-        except Exception as e:
-            print(f"Topic processing failed but continuing pipeline: {e}")
+    if not videos:
+        print("No video found in Kaggle artifacts; skipping YouTube upload for this topic.")
+        return
+
+    video_path = videos[0]
+
+    print("Video found:", video_path)
+
+    with TRACER.span("youtube_upload", "upload"):
+        upload_video(
+            video_path,
+            title,
+            description,
+            hashtags,
+            thumbnail_path
+        )
 
 
 def main():
-    try:
-        run_pipeline()
-    except Exception as e:
-        print(f"Top-level pipeline failure converted to soft failure: {e}")
-    finally:
+    with TRACER.run("pipeline"):
         try:
-            ensure_kaggle_dataset_publish()
+            run_pipeline()
         except Exception as e:
-            print(f"Final Kaggle dataset publish failed softly: {e}")
+            print(f"Top-level pipeline failure converted to soft failure: {e}")
+        finally:
+            try:
+                with TRACER.span("kaggle_dataset_publish", "upload"):
+                    ensure_kaggle_dataset_publish()
+            except Exception as e:
+                print(f"Final Kaggle dataset publish failed softly: {e}")
 
     return 0
 
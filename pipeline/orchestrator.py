@@ -19,6 +19,7 @@ from scripts.style_evolution_manager import StyleEvolutionManager
 from scripts.session_depth_optimizer import SessionDepthOptimizer
 from scripts.packaging_guard import enforce_cooling_period
 from config.channel_growth_plan import load_growth_plan
+from scripts.stage_tracer import TRACER
 
 
 # ============================================================
@@ -26,16 +27,22 @@ from config.channel_growth_plan import load_growth_plan
 # ============================================================
 
 def fail_fast(stage_name):
+    """
+    Halts the pipeline on failure; every stage is also a trace span
+    (wall/CPU/RSS/IO/API calls) nested under the active run.
+    """
     def decorator(func):
         def wrapper(*args, **kwargs):
             try:
                 logging.info(f"[START] {stage_name}")
-                start = time.time()
 
-                result = func(*args, **kwargs)
+                with TRACER.span(stage_name) as span:
+                    result = func(*args, **kwargs)
 
-                duration = time.time() - start
-                logging.info(f"[END] {stage_name} | {duration:.2f}s")
+                logging.info(
+                    f"[END] {stage_name} | {span.wall:.2f}s "
+                    f"cpu={span.cpu:.2f}s api_calls={span.api_calls}"
+                )
                 return result
 
             except Exception as e:
@@ -205,12 +212,17 @@ class PipelineOrchestrator:
             self.saturated_emotion = None
 
     def run(self):
+        with TRACER.run(f"pipeline_orchestrator:{self.video_id}"):
+            self._run()
+
+    def _run(self):
         overall_start = time.time()
 
         try:
             logging.info("========== PIPELINE STARTED ==========")
 
-            enforce_cooling_period(self.created_timestamp)
+            with TRACER.span("cooling_period"):
+                enforce_cooling_period(self.created_timestamp)
 
             run_manual_override_check()
             run_runway_guard()
@@ -227,7 +239,8 @@ class PipelineOrchestrator:
 
             self.cluster_recommendation = run_session_depth_optimization()
 
-            self.enforce_emotional_governance()
+            with TRACER.span("emotional_governance"):
+                self.enforce_emotional_governance()
 
             run_expected_projection()
 
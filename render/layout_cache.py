@@ -0,0 +1,187 @@
+# render/layout_cache.py
+
+from typing import Dict, Optional
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import time
+
+# Bump when the layout dict produced by SceneComposer changes shape
+SCHEMA_VERSION = 2
+
+
+def layout_key(**inputs) -> str:
+    """
+    Content address over every input that affects a composed layout.
+    """
+    payload = json.dumps(
+        {"schema": SCHEMA_VERSION, **inputs}, sort_keys=True, default=repr
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LayoutCache:
+
+    def __init__(self, root: str = "render/frame_cache", budget_bytes: int = 256 * 1024 ** 2):
+        self.root = root
+        self.budget_bytes = budget_bytes
+        self.db_path = os.path.join(root, "index.db")
+        os.makedirs(root, exist_ok=True)
+        self._init_db()
+
+    # ----------------------------
+    # INDEX
+    # ----------------------------
+
+    def _connect(self):
+        # Several render workers share one index
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_db(self):
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS meta (
+                name TEXT PRIMARY KEY,
+                value INTEGER
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                bytes INTEGER,
+                created REAL,
+                last_used REAL
+            )
+        """)
+
+        row = conn.execute("SELECT value FROM meta WHERE name = 'schema'").fetchone()
+        if row is None or row[0] != SCHEMA_VERSION:
+            self._clear(conn)
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema', ?)", (SCHEMA_VERSION,))
+
+        for counter in ("hits", "misses", "bytes_saved", "evictions"):
+            conn.execute("INSERT OR IGNORE INTO meta VALUES (?, 0)", (counter,))
+
+        conn.commit()
+        conn.close()
+
+    def _clear(self, conn):
+        for (key,) in conn.execute("SELECT key FROM entries").fetchall():
+            self._remove_file(key)
+        conn.execute("DELETE FROM entries")
+        conn.execute("UPDATE meta SET value = 0 WHERE name != 'schema'")
+
+    def _count(self, conn, name, amount=1):
+        conn.execute("UPDATE meta SET value = value + ? WHERE name = ?", (amount, name))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.pkl")
+
+    def _remove_file(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    # ----------------------------
+    # GET / PUT
+    # ----------------------------
+
+    def get(self, key: str) -> Optional[Dict]:
+        conn = self._connect()
+        row = conn.execute("SELECT bytes FROM entries WHERE key = ?", (key,)).fetchone()
+
+        layout = None
+        if row is not None:
+            try:
+                with open(self._path(key), "rb") as f:
+                    layout = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+        if layout is None:
+            self._count(conn, "misses")
+        else:
+            conn.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._count(conn, "hits")
+            self._count(conn, "bytes_saved", row[0])
+
+        conn.commit()
+        conn.close()
+        return layout
+
+    def put(self, key: str, layout: Dict):
+        data = pickle.dumps(layout, protocol=pickle.HIGHEST_PROTOCOL)
+
+        # Atomic: readers never see a half-written pickle
+        tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(key))
+
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+            (key, len(data), now, now),
+        )
+        self._evict(conn, keep=key)
+        conn.commit()
+        conn.close()
+
+    def _evict(self, conn, keep=None):
+        total = conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM entries").fetchone()[0]
+        if total <= self.budget_bytes:
+            return
+
+        rows = conn.execute(
+            "SELECT key, bytes FROM entries ORDER BY last_used ASC"
+        ).fetchall()
+
+        for key, size in rows:
+            if total <= self.budget_bytes:
+                break
+            if key == keep:
+                continue
+            self._remove_file(key)
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._count(conn, "evictions")
+            total -= size
+
+    # ----------------------------
+    # COUNTERS
+    # ----------------------------
+
+    def stats(self) -> Dict:
+        """
+        Cumulative across every process sharing the index.
+        """
+        conn = self._connect()
+        meta = dict(conn.execute("SELECT name, value FROM meta").fetchall())
+        entries, size = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM entries"
+        ).fetchone()
+        conn.close()
+
+        lookups = meta["hits"] + meta["misses"]
+        return {
+            "schema": meta["schema"],
+            "entries": entries,
+            "bytes": size,
+            "budget_bytes": self.budget_bytes,
+            "hits": meta["hits"],
+            "misses": meta["misses"],
+            "hit_rate": round(meta["hits"] / lookups, 3) if lookups else 0.0,
+            "bytes_saved": meta["bytes_saved"],
+            "evictions": meta["evictions"],
+        }
+
+    def reset_counters(self):
+        conn = self._connect()
+        conn.execute(
+            "UPDATE meta SET value = 0 WHERE name IN ('hits', 'misses', 'bytes_saved', 'evictions')"
+        )
+        conn.commit()
+        conn.close()
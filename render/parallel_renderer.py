@@ -1,21 +1,25 @@
 # render/parallel_renderer.py
 
-from multiprocessing import Pool, cpu_count
 from typing import List, Dict
-from render.scene_composer import SceneComposer
+from render.worker_pool import shared_pool, worker_resource
 
+COMPOSER = "render.scene_composer:SceneComposer"
 
-def _compose_single(scene_data: Dict):
-    composer = SceneComposer()
-    return composer.compose_scene(scene_data)
+
+def _compose_single(task):
+    # One SceneComposer per worker process, built by the pool initializer
+    scene_index, scene_data = task
+    return worker_resource(COMPOSER).compose_scene(scene_data, scene_index)
 
 
 class ParallelRenderer:
 
     def __init__(self, workers: int = None):
-        self.workers = workers or max(1, cpu_count() - 1)
+        self.pool = shared_pool(workers, preload=(COMPOSER,))
+        self.workers = self.pool.workers
 
     def render_scenes(self, scenes: List[Dict]) -> List[Dict]:
-        with Pool(self.workers) as pool:
-            results = pool.map(_compose_single, scenes)
-        return results
+        return self.pool.run(_compose_single, list(enumerate(scenes)))
+
+    def stats(self) -> Dict:
+        return self.pool.stats()
@@ -1,34 +1,28 @@
 # render/parallel_scene_executor.py
 
-from multiprocessing import Pool, cpu_count
-from typing import List, Dict, Callable
-
-
-def _build_single(args):
-    build_fn, scene_data = args
-    return build_fn(scene_data)
+from typing import List, Dict, Callable, Iterable, Union
+from render.worker_pool import shared_pool
 
 
 def build_scenes_parallel(
     scenes: List[Dict],
-    build_function: Callable,
-    max_workers: int = None
+    build_function: Union[Callable, str],
+    max_workers: int = None,
+    preload: Iterable[str] = ()
 ) -> List[Dict]:
     """
     Parallel scene builder.
     Does NOT modify existing composer.
     Pure additive scaling layer.
+
+    build_function: a module-level function or a "module:function"
+    target; it runs on the shared persistent pool, results in order.
+    preload: "module:Factory" targets built once per worker.
     """
 
     if not scenes:
         return []
 
-    workers = max_workers or max(1, cpu_count() - 1)
-
-    with Pool(processes=workers) as pool:
-        results = pool.map(
-            _build_single,
-            [(build_function, scene) for scene in scenes]
-        )
+    pool = shared_pool(max_workers, preload=preload)
 
-    return results
+    return pool.run(build_function, scenes)
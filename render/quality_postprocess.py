@@ -1,16 +1,41 @@
 # render/quality_postprocess.py
 
+from typing import Dict
+from pathlib import Path
+
+from audio_engine.loudness import LoudnessNormalizer
+
+
 class QualityPostProcess:
 
+    def __init__(self, target_lufs: float = -14, true_peak: float = -1):
+        self.normalizer = LoudnessNormalizer(target_lufs=target_lufs, true_peak_db=true_peak)
+
     def apply(self, render_output: Dict) -> Dict:
         render_output["postprocess"] = {
             "resolution": "1920x1080",
             "film_grain": 0.08,
             "vignette_strength": 0.12,
             "audio_normalization": {
-                "target_lufs": -14,
-                "true_peak": -1
+                "target_lufs": self.normalizer.target_lufs,
+                "true_peak": self.normalizer.true_peak_db
             },
             "noise_cleanup": True
         }
+
+        audio_path = render_output.get("audio_path")
+        if audio_path:
+            # Measured and applied, not just requested
+            source = Path(audio_path)
+            mastered = source.with_name(f"{source.stem}_mastered.wav")
+            report = self.normalizer.normalize(str(source), str(mastered))
+
+            render_output["audio_path"] = str(mastered)
+            render_output["postprocess"]["audio_normalization"].update({
+                "measured_lufs": report["integrated_lufs"],
+                "measured_true_peak": report["true_peak_db"],
+                "gain_db": report["gain_db"],
+                "limited": report["ceiling_db"] is not None,
+            })
+
         return render_output
@@ -1,10 +1,8 @@
 # render/scene_composer.py
 
-from typing import Dict, List
-import hashlib
-import json
-import os
-import pickle
+from typing import Dict, List, Optional
+
+from render.layout_cache import LayoutCache, layout_key
 
 # 🔥 Visual psychology integration (additive only)
 try:
@@ -18,14 +16,14 @@ class SceneComposer:
 
     CACHE_DIR = "render/frame_cache"
 
-    def __init__(self):
-        os.makedirs(self.CACHE_DIR, exist_ok=True)
+    def __init__(self, cache: LayoutCache = None):
+        self.cache = cache or LayoutCache(self.CACHE_DIR)
 
         # 🔥 NEW – visual psychology engine (additive only)
         self._visual_engine = VisualPsychologyEngine() if VisualPsychologyEngine else None
         self._scene_index_counter = 0
 
-    def compose_scene(self, scene_data: Dict) -> Dict:
+    def compose_scene(self, scene_data: Dict, scene_index: Optional[int] = None) -> Dict:
         """
         scene_data:
         {
@@ -35,10 +33,15 @@ class SceneComposer:
             "accent_element": "circle_glow",
             "duration": 8
         }
+        scene_index: position in the video; defaults to call order.
         """
 
-        cache_key = self._generate_cache_key(scene_data)
-        cached = self._load_from_cache(cache_key)
+        if scene_index is None:
+            scene_index = self._scene_index_counter
+        self._scene_index_counter = scene_index + 1
+
+        cache_key = self._generate_cache_key(scene_data, scene_index)
+        cached = self.cache.get(cache_key)
         if cached:
             return cached
 
@@ -54,14 +57,12 @@ class SceneComposer:
         if self._visual_engine:
             layout = self._visual_engine.process_scene(
                 layout,
-                self._scene_index_counter
+                scene_index
             )
 
-        self._scene_index_counter += 1
-
         self._validate_scene(layout)
 
-        self._store_in_cache(cache_key, layout)
+        self.cache.put(cache_key, layout)
 
         return layout
 
@@ -90,23 +91,20 @@ class SceneComposer:
             raise ValueError("Scene rejected: Not enough active visual elements.")
 
     # ----------------------------
-    # 🔥 FRAME CACHE ENGINE (UNCHANGED)
+    # 🔥 FRAME CACHE ENGINE
     # ----------------------------
 
-    def _generate_cache_key(self, scene_data: Dict) -> str:
-        serialized = json.dumps(scene_data, sort_keys=True)
-        return hashlib.md5(serialized.encode()).hexdigest()
-
-    def _cache_path(self, key: str) -> str:
-        return os.path.join(self.CACHE_DIR, f"{key}.pkl")
-
-    def _store_in_cache(self, key: str, layout: Dict):
-        with open(self._cache_path(key), "wb") as f:
-            pickle.dump(layout, f)
-
-    def _load_from_cache(self, key: str):
-        path = self._cache_path(key)
-        if os.path.exists(path):
-            with open(path, "rb") as f:
-                return pickle.load(f)
-        return None
+    def _generate_cache_key(self, scene_data: Dict, scene_index: int) -> str:
+        engine = None
+        if self._visual_engine:
+            engine = {
+                "type": type(self._visual_engine).__name__,
+                "config": {
+                    k: v for k, v in vars(self._visual_engine).items()
+                    if not k.startswith("_")
+                },
+                # The visual engine's output depends on where the scene sits
+                "scene_index": scene_index,
+            }
+
+        return layout_key(scene=scene_data, visual_engine=engine)
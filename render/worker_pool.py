@@ -0,0 +1,167 @@
+# render/worker_pool.py
+
+import atexit
+import importlib
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing import cpu_count
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+
+# ----------------------------
+# TASK SPECS
+# ----------------------------
+# A task is a plain ("module:function", payload) pair: the target is
+# imported inside the worker, so nothing but strings and data crosses the
+# process boundary.
+
+def task_target(fn: Callable) -> str:
+    qualname = getattr(fn, "__qualname__", "")
+    if "<" in qualname or "." in qualname or not getattr(fn, "__module__", None):
+        raise ValueError(
+            f"{fn!r} is not a module-level function; "
+            "pass a 'module:function' target instead."
+        )
+    return f"{fn.__module__}:{qualname}"
+
+
+@lru_cache(maxsize=None)
+def resolve_target(target: str) -> Callable:
+    module_name, _, attr = target.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+# ----------------------------
+# PER-WORKER STATE
+# ----------------------------
+
+_RESOURCES: Dict[str, Any] = {}
+
+
+def worker_resource(factory_target: str):
+    """
+    One instance per worker process of a heavy object (composer, font or
+    style registry), built on first use or by the pool initializer.
+    """
+    if factory_target not in _RESOURCES:
+        _RESOURCES[factory_target] = resolve_target(factory_target)()
+    return _RESOURCES[factory_target]
+
+
+def _init_worker(preload: Tuple[str, ...]):
+    for factory_target in preload:
+        worker_resource(factory_target)
+
+
+def _run_task(task):
+    target, payload = task
+    started = time.perf_counter()
+    result = resolve_target(target)(payload)
+    return result, os.getpid(), time.perf_counter() - started
+
+
+# ----------------------------
+# POOL
+# ----------------------------
+
+class RenderWorkerPool:
+
+    def __init__(self, workers: int = None, preload: Iterable[str] = (), max_inflight: int = None):
+        self.workers = workers or max(1, cpu_count() - 1)
+        self.preload = tuple(preload)
+        self.max_inflight = max_inflight or self.workers * 2
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.preload,),
+        )
+        self._started = time.perf_counter()
+        self._busy: Dict[int, float] = {}
+        self._tasks: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def map(self, target, payloads: Iterable[Any]):
+        """
+        Yields results in input order. At most `max_inflight` tasks are
+        queued at once, so a long (or lazy) payload stream never piles up
+        pickled work in memory.
+        """
+        if self._closed:
+            raise RuntimeError("RenderWorkerPool is closed.")
+
+        if callable(target):
+            target = task_target(target)
+
+        pending = deque()
+
+        for payload in payloads:
+            if len(pending) >= self.max_inflight:
+                yield self._collect(pending.popleft())
+            pending.append(self._executor.submit(_run_task, (target, payload)))
+
+        while pending:
+            yield self._collect(pending.popleft())
+
+    def run(self, target, payloads: Iterable[Any]) -> List[Any]:
+        return list(self.map(target, payloads))
+
+    def _collect(self, future):
+        result, pid, busy = future.result()
+        with self._lock:
+            self._busy[pid] = self._busy.get(pid, 0.0) + busy
+            self._tasks[pid] = self._tasks.get(pid, 0) + 1
+        return result
+
+    def stats(self) -> Dict:
+        wall = time.perf_counter() - self._started
+        with self._lock:
+            workers = {
+                pid: {
+                    "tasks": self._tasks[pid],
+                    "busy_seconds": round(busy, 3),
+                    "utilization": round(busy / wall, 3) if wall else 0.0,
+                }
+                for pid, busy in self._busy.items()
+            }
+        return {
+            "workers": self.workers,
+            "wall_seconds": round(wall, 3),
+            "per_worker": workers,
+        }
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._executor.shutdown(wait=True)
+
+
+_SHARED_POOLS: Dict[Tuple, RenderWorkerPool] = {}
+
+
+def shared_pool(workers: int = None, preload: Iterable[str] = ()) -> RenderWorkerPool:
+    """
+    Process-wide pool reused across calls; shut down at interpreter exit.
+    """
+    key = (workers or max(1, cpu_count() - 1), tuple(preload))
+    pool = _SHARED_POOLS.get(key)
+    if pool is None or pool._closed:
+        pool = RenderWorkerPool(workers=key[0], preload=key[1])
+        _SHARED_POOLS[key] = pool
+    return pool
+
+
+@atexit.register
+def _shutdown_shared_pools():
+    for pool in _SHARED_POOLS.values():
+        pool.close()
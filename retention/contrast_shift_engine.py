@@ -3,8 +3,7 @@ contrast_shift_engine.py
 Arc-aware contrast cycling to prevent long-form fatigue.
 """
 
-from moviepy.editor import CompositeVideoClip, vfx
-import numpy as np
+from retention.effect_schedule import EffectEvent, EffectSchedule
 
 
 class ContrastShiftEngine:
@@ -12,10 +11,9 @@ class ContrastShiftEngine:
     def __init__(self, cycle_duration: float = 90.0):
         self.cycle_duration = cycle_duration
 
-    def apply(self, clip):
+    def events(self, duration):
 
-        duration = clip.duration
-        segments = []
+        events = []
 
         current = 0.0
         toggle = False
@@ -23,18 +21,16 @@ class ContrastShiftEngine:
         while current < duration:
 
             end = min(current + self.cycle_duration, duration)
-            segment = clip.subclip(current, end)
 
             if toggle:
-                segment = segment.fx(vfx.colorx, 1.08)
+                events.append(EffectEvent(current, end, "colorx", (1.08,)))
             else:
-                segment = segment.fx(vfx.lum_contrast, 8, 20, 128)
-
-            segment = segment.set_start(current)
-
-            segments.append(segment)
+                events.append(EffectEvent(current, end, "lum_contrast", (8, 20, 128)))
 
             toggle = not toggle
             current += self.cycle_duration
 
-        return CompositeVideoClip(segments)
+        return events
+
+    def apply(self, clip):
+        return EffectSchedule(self.events(clip.duration)).apply(clip)
@@ -0,0 +1,143 @@
+"""
+effect_schedule.py
+Shared timed-effect schedule for the retention engines.
+
+Engines emit EffectEvents instead of wrapping the timeline in another
+CompositeVideoClip of subclips; one per-frame pass then applies only the
+effects active at t, in engine order, so stacked engines compose exactly
+like the old nested overlays without re-decoding the base clip.
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+from video_core.frame_filters import FILTERS
+
+
+@dataclass(frozen=True)
+class EffectEvent:
+    start: float
+    end: float
+    effect: str
+    params: tuple = ()
+
+    def is_active(self, t: float) -> bool:
+        return self.start <= t < self.end
+
+
+class EffectSchedule:
+
+    def __init__(self, events=None):
+        self._events: List[EffectEvent] = []
+        self._order: List[int] = []
+        self._starts: List[float] = []
+        self._max_span = 0.0
+        self.extend(events or [])
+
+    def __len__(self):
+        return len(self._events)
+
+    def extend(self, events):
+        """
+        Events keep their insertion order for application; the start index
+        is only used for lookup.
+        """
+        for event in events:
+            if event.effect not in FILTERS:
+                raise ValueError(f"Unknown effect: {event.effect}")
+
+            order = len(self._order)
+            idx = bisect_right(self._starts, event.start)
+
+            self._starts.insert(idx, event.start)
+            self._events.insert(idx, event)
+            self._order.insert(idx, order)
+            self._max_span = max(self._max_span, event.end - event.start)
+
+        return self
+
+    def active(self, t: float) -> List[EffectEvent]:
+        idx = bisect_right(self._starts, t)
+        active = []
+
+        while idx > 0:
+            idx -= 1
+            event = self._events[idx]
+            if event.start < t - self._max_span:
+                break
+            if event.is_active(t):
+                active.append((self._order[idx], event))
+
+        active.sort(key=lambda item: item[0])
+        return [event for _, event in active]
+
+    def window(self, start: float, end: float) -> List[EffectEvent]:
+        """
+        Events overlapping [start, end), in application order.
+        """
+        overlapping = [
+            (order, event)
+            for order, event in zip(self._order, self._events)
+            if event.start < end and event.end > start
+        ]
+        overlapping.sort(key=lambda item: item[0])
+        return [event for _, event in overlapping]
+
+    def apply_frame(self, frame: np.ndarray, t: float, scratch: np.ndarray = None):
+        """
+        Applies active effects to `frame` in place; returns the frame.
+        """
+        active = self.active(t)
+        if not active:
+            return frame
+
+        if scratch is None:
+            scratch = np.empty(frame.shape, dtype=np.float32)
+
+        for event in active:
+            FILTERS[event.effect](frame, scratch, *event.params)
+
+        return frame
+
+    def apply(self, clip):
+        """
+        moviepy path: a single fl pass over the base clip.
+        """
+        def effects(get_frame, t):
+            frame = get_frame(t)
+            if not self.active(t):
+                return frame
+            return self.apply_frame(np.array(frame, dtype=np.uint8), t)
+
+        return clip.fl(effects, keep_duration=True)
+
+
+class RetentionEffectScheduler:
+    """
+    Collects events from every retention engine into one schedule.
+    """
+
+    def __init__(self, engines=None):
+        if engines is None:
+            from retention.spike_injector import SpikeInjector
+            from retention.pattern_interrupt_engine import PatternInterruptEngine
+            from retention.contrast_shift_engine import ContrastShiftEngine
+            from retention.mid_video_reset import MidVideoReset
+
+            engines = [
+                ContrastShiftEngine(),
+                SpikeInjector(),
+                PatternInterruptEngine(),
+                MidVideoReset(),
+            ]
+
+        self.engines = engines
+
+    def build(self, duration: float) -> EffectSchedule:
+        schedule = EffectSchedule()
+        for engine in self.engines:
+            schedule.extend(engine.events(duration))
+        return schedule
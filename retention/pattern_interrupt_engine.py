@@ -4,9 +4,10 @@ Injects rapid perceptual reset bursts.
 Used at psychologically calculated fatigue windows.
 """
 
-from moviepy.editor import CompositeVideoClip, vfx
 import numpy as np
 
+from retention.effect_schedule import EffectEvent, EffectSchedule
+
 
 class PatternInterruptEngine:
 
@@ -14,24 +15,21 @@ class PatternInterruptEngine:
         self.interval = interrupt_interval
         self.duration = duration
 
-    def apply(self, clip):
+    def events(self, duration):
 
-        duration = clip.duration
         interrupt_times = np.arange(self.interval, duration, self.interval)
 
-        base = clip
-        overlays = []
+        events = []
 
         for t in interrupt_times:
 
-            segment = base.subclip(t, min(t + self.duration, duration))
+            end = float(min(t + self.duration, duration))
 
             # High contrast + slight color inversion blend
-            segment = segment.fx(vfx.lum_contrast, 25, 60, 128)
-            segment = segment.fx(vfx.colorx, 1.2)
+            events.append(EffectEvent(float(t), end, "lum_contrast", (25, 60, 128)))
+            events.append(EffectEvent(float(t), end, "colorx", (1.2,)))
 
-            segment = segment.set_start(t)
+        return events
 
-            overlays.append(segment)
-
-        return CompositeVideoClip([base] + overlays)
+    def apply(self, clip):
+        return EffectSchedule(self.events(clip.duration)).apply(clip)
@@ -4,9 +4,10 @@ Time-windowed micro dopamine spike system.
 Applies short intensity bursts at calculated timestamps.
 """
 
-from moviepy.editor import CompositeVideoClip, vfx
 import numpy as np
 
+from retention.effect_schedule import EffectEvent, EffectSchedule
+
 
 class SpikeInjector:
 
@@ -14,24 +15,20 @@ class SpikeInjector:
         self.interval = interval_seconds
         self.spike_duration = spike_duration
 
-    def apply(self, clip):
+    def events(self, duration):
 
-        duration = clip.duration
         spike_times = np.arange(self.interval, duration, self.interval)
 
-        base = clip
-
-        overlays = []
-
-        for t in spike_times:
-
-            segment = base.subclip(t, min(t + self.spike_duration, duration))
+        # Controlled brightness + contrast spike
+        return [
+            EffectEvent(
+                float(t),
+                float(min(t + self.spike_duration, duration)),
+                "lum_contrast",
+                (15, 35, 128)
+            )
+            for t in spike_times
+        ]
 
-            # Controlled brightness + contrast spike
-            segment = segment.fx(vfx.lum_contrast, 15, 35, 128)
-
-            segment = segment.set_start(t)
-
-            overlays.append(segment)
-
-        return CompositeVideoClip([base] + overlays)
+    def apply(self, clip):
+        return EffectSchedule(self.events(clip.duration)).apply(clip)
@@ -6,6 +6,11 @@ from pathlib import Path
 
 from groq import Groq
 
+try:
+    from scripts.groq_rate_limiter import limited_client
+except ImportError:  # run as a script from scripts/
+    from groq_rate_limiter import limited_client
+
 # ============================
 # CONFIG
 # ============================
@@ -38,7 +43,7 @@ def groq_generate(prompt: str) -> str:
     if not GROQ_API_KEY:
         raise RuntimeError("GROQ_API_KEY not set")
 
-    client = Groq(api_key=GROQ_API_KEY)
+    client = limited_client(Groq(api_key=GROQ_API_KEY))
 
     for attempt in range(1, MAX_RETRIES + 1):
         try:
@@ -2,6 +2,11 @@
 import json, os, sys, re
 from pathlib import Path
 from groq import Groq
+
+try:
+    from scripts.groq_rate_limiter import limited_client
+except ImportError:  # run as a script from scripts/
+    from groq_rate_limiter import limited_client
 from collections import OrderedDict
 
 # ============================
@@ -118,7 +123,7 @@ def main():
     outline = topic.get("outline", "")
     title = topic.get("title", "")
 
-    client = Groq(api_key=GROQ_API_KEY)
+    client = limited_client(Groq(api_key=GROQ_API_KEY))
 
     # ============================
     # 🔥 ENGINEERED PROMPT
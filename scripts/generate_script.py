@@ -5,6 +5,11 @@ import re
 from pathlib import Path
 from groq import Groq
 
+try:
+    from scripts.groq_rate_limiter import limited_client
+except ImportError:  # run as a script from scripts/
+    from groq_rate_limiter import limited_client
+
 # ============================
 # CONFIG
 # ============================
@@ -36,7 +41,7 @@ ALLOWED_VISUALS = {
 # ============================
 
 def groq_generate(prompt: str) -> str:
-    client = Groq(api_key=GROQ_API_KEY)
+    client = limited_client(Groq(api_key=GROQ_API_KEY))
 
     resp = client.chat.completions.create(
         model=GROQ_MODEL,
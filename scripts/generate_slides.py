@@ -2,13 +2,18 @@ import json, os, sys
 from pathlib import Path
 from groq import Groq
 
+try:
+    from scripts.groq_rate_limiter import limited_client
+except ImportError:  # run as a script from scripts/
+    from groq_rate_limiter import limited_client
+
 GROQ_API_KEY = os.environ["GROQ_API_KEY"]
 MODEL = "llama-3.1-8b-instant"
 
 CURRENT_TOPIC_FILE = Path("current_topic.json")
 SLIDE_PLAN_FILE = Path("slide_plan.json")
 
-client = Groq(api_key=GROQ_API_KEY)
+client = limited_client(Groq(api_key=GROQ_API_KEY))
 
 def main():
     topic = json.loads(CURRENT_TOPIC_FILE.read_text())
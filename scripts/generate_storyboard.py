@@ -8,6 +8,11 @@ import sys
 from pathlib import Path
 from groq import Groq
 
+try:
+    from scripts.groq_rate_limiter import limited_client
+except ImportError:  # run as a script from scripts/
+    from groq_rate_limiter import limited_client
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 TOPIC_FILE = BASE_DIR / "current_topic.json"
@@ -130,7 +135,7 @@ def call_llm(topic_text):
     if not api_key:
         fail("GROQ_API_KEY missing")
 
-    client = Groq(api_key=api_key)
+    client = limited_client(Groq(api_key=api_key))
 
     response = client.chat.completions.create(
         model=MODEL,
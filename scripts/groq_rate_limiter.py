@@ -0,0 +1,391 @@
+# scripts/groq_rate_limiter.py
+
+import os
+import re
+import time
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger("GroqRateLimiter")
+
+# Free-tier defaults for llama-3.3-70b; override per account / model
+DEFAULT_RPM = int(os.getenv("GROQ_RPM", "30"))
+DEFAULT_TPM = int(os.getenv("GROQ_TPM", "6000"))
+DEFAULT_CONCURRENCY = int(os.getenv("GROQ_MAX_CONCURRENCY", "4"))
+
+# Budget shared by every process on the machine; empty keeps it per process
+BUDGET_DB = os.getenv("GROQ_BUDGET_DB", "data/groq_budget.db")
+
+# Completion budget assumed when a call does not pass max_tokens
+DEFAULT_COMPLETION_TOKENS = 1024
+CHARS_PER_TOKEN = 4
+
+
+# ----------------------------
+# HELPERS
+# ----------------------------
+
+def parse_duration(value) -> float:
+    """
+    Seconds from a retry-after / x-ratelimit-reset-* value:
+    "12", "7.66s", "2m59.56s", "120ms".
+    """
+    if value is None:
+        return 0.0
+    text = str(value).strip()
+    try:
+        return max(0.0, float(text))
+    except ValueError:
+        pass
+
+    units = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+    total = 0.0
+    for amount, unit in re.findall(r"([\d.]+)(ms|h|m|s)", text):
+        total += float(amount) * units[unit]
+    return total
+
+
+def estimate_tokens(messages, max_tokens=None) -> int:
+    """
+    Prompt tokens (~4 chars each) plus the completion budget.
+    """
+    if isinstance(messages, str):
+        chars = len(messages)
+    else:
+        chars = sum(len(str(m.get("content", ""))) for m in (messages or []))
+    completion = max_tokens if max_tokens else DEFAULT_COMPLETION_TOKENS
+    return chars // CHARS_PER_TOKEN + int(completion)
+
+
+def usage_tokens(result):
+    """
+    Actual total_tokens of an SDK response or a requests.Response, if reported.
+    """
+    usage = getattr(result, "usage", None)
+    if usage is not None:
+        return getattr(usage, "total_tokens", None)
+
+    if hasattr(result, "json"):
+        try:
+            return (result.json().get("usage") or {}).get("total_tokens")
+        except Exception:
+            return None
+    return None
+
+
+def _rate_limit_details(error):
+    """
+    (is rate limited, response headers) for an SDK / HTTP exception.
+    """
+    response = getattr(error, "response", None)
+    status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    headers = getattr(response, "headers", None) or {}
+
+    limited = status == 429 or "rate limit" in str(error).lower()
+    return limited, headers
+
+
+# ----------------------------
+# TOKEN BUCKET
+# ----------------------------
+
+class TokenBucket:
+    """
+    Holds up to `capacity` units, refilled continuously at
+    `capacity / period` per second. Not locked: GroqRateLimiter
+    serialises access.
+    """
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self.level = self.capacity
+        # Wall clock, not monotonic: the shared budget compares it across processes
+        self.updated = time.time()
+
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_for(self, amount: float) -> float:
+        """
+        Seconds until `amount` units are available (0 if they are now).
+        """
+        missing = min(amount, self.capacity) - self.level
+        return 0.0 if missing <= 0 else missing / self.rate
+
+    def take(self, amount: float):
+        self.level -= min(amount, self.capacity)
+
+    def give(self, amount: float):
+        self.level = min(self.capacity, self.level + amount)
+
+
+# ----------------------------
+# SHARED BUDGET
+# ----------------------------
+
+class SharedBudget:
+    """
+    Bucket levels and the 429 pause kept in SQLite, so the generate_*
+    scripts (separate processes) draw from one RPM / TPM budget instead
+    of each getting the full quota. BEGIN IMMEDIATE serialises every
+    read-modify-write across processes.
+    """
+
+    def __init__(self, path: str = BUDGET_DB, timeout: float = 30.0):
+        self.path = path
+        self.timeout = timeout
+        self._ready = False
+
+    def _connect(self):
+        if not self._ready:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        if not self._ready:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS groq_budget (
+                    name TEXT PRIMARY KEY,
+                    value REAL,
+                    updated REAL
+                )
+            """)
+            self._ready = True
+        return conn
+
+    @contextmanager
+    def transaction(self, limiter):
+        """
+        Loads the shared state into `limiter`, yields, then writes it back
+        in the same transaction.
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = {
+                name: (value, updated)
+                for name, value, updated in conn.execute("SELECT name, value, updated FROM groq_budget")
+            }
+
+            for name, bucket in (("requests", limiter.requests), ("tokens", limiter.tokens)):
+                if name in rows:
+                    level, updated = rows[name]
+                    bucket.level = min(bucket.capacity, level)
+                    bucket.updated = updated
+            if "blocked_until" in rows:
+                limiter.blocked_until = rows["blocked_until"][0]
+
+            yield
+
+            conn.executemany(
+                "INSERT OR REPLACE INTO groq_budget VALUES (?, ?, ?)",
+                [
+                    ("requests", limiter.requests.level, limiter.requests.updated),
+                    ("tokens", limiter.tokens.level, limiter.tokens.updated),
+                    ("blocked_until", limiter.blocked_until, time.time()),
+                ]
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+
+# ----------------------------
+# LIMITER
+# ----------------------------
+
+class GroqRateLimiter:
+    """
+    Shared requests-per-minute and tokens-per-minute budget for every
+    Groq caller in the process, and across processes when given a
+    SharedBudget.
+
+    Calls reserve their estimated tokens up front and run concurrently
+    (up to `max_concurrency` per process) while the budget allows; the
+    estimate is reconciled with the reported usage afterwards. A 429
+    pauses all callers for the server's retry-after instead of a fixed
+    sleep.
+    """
+
+    def __init__(self, rpm: int = DEFAULT_RPM, tpm: int = DEFAULT_TPM,
+                 max_concurrency: int = DEFAULT_CONCURRENCY, max_attempts: int = 4,
+                 shared: SharedBudget = None):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_attempts = max_attempts
+        self.blocked_until = 0.0
+        self.shared = shared
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrency))
+
+    @contextmanager
+    def _state(self):
+        """
+        Exclusive access to the buckets, synced with the shared budget.
+        """
+        with self._lock:
+            if self.shared is None:
+                yield
+            else:
+                with self.shared.transaction(self):
+                    yield
+
+    # ---------- budget ----------
+
+    def _reserve(self, tokens: int):
+        while True:
+            with self._state():
+                now = time.time()
+                self.requests.refill(now)
+                self.tokens.refill(now)
+
+                wait = max(
+                    self.blocked_until - now,
+                    self.requests.wait_for(1),
+                    self.tokens.wait_for(tokens),
+                )
+                if wait <= 0:
+                    self.requests.take(1)
+                    self.tokens.take(tokens)
+                    return
+
+            time.sleep(min(wait, 5.0))
+
+    @contextmanager
+    def acquire(self, tokens: int):
+        """
+        Blocks until one request and `tokens` tokens fit the budget.
+        """
+        with self._slots:
+            self._reserve(tokens)
+            yield
+
+    def settle(self, estimated: int, actual):
+        """
+        Refunds (or charges) the difference between the estimate and the
+        tokens the API actually counted.
+        """
+        if not actual:
+            return
+        with self._state():
+            self.tokens.refill(time.time())
+            if actual < estimated:
+                self.tokens.give(estimated - actual)
+            else:
+                self.tokens.take(actual - estimated)
+
+    def observe(self, headers):
+        """
+        Aligns the token bucket with x-ratelimit-remaining-tokens.
+        """
+        remaining = (headers or {}).get("x-ratelimit-remaining-tokens")
+        if remaining is None:
+            return
+        try:
+            remaining = float(remaining)
+        except ValueError:
+            return
+        with self._state():
+            self.tokens.refill(time.time())
+            self.tokens.level = min(self.tokens.level, remaining)
+
+    def backoff(self, headers=None, attempt: int = 0):
+        """
+        Pauses every caller until the server's retry-after (or the token
+        reset time); exponential fallback when no header is present.
+        """
+        headers = headers or {}
+        wait = parse_duration(headers.get("retry-after")) or \
+            parse_duration(headers.get("x-ratelimit-reset-tokens")) or \
+            min(60.0, 2.0 * 2 ** attempt)
+
+        with self._state():
+            self.blocked_until = max(self.blocked_until, time.time() + wait)
+
+        logger.warning(f"Groq rate limit: pausing calls for {wait:.1f}s")
+
+    # ---------- calls ----------
+
+    def run(self, send, tokens: int):
+        """
+        send() under the budget; retried on 429 after the advertised wait.
+        `send` may return a requests.Response or an SDK completion.
+        """
+        for attempt in range(self.max_attempts):
+            last = attempt == self.max_attempts - 1
+
+            with self.acquire(tokens):
+                try:
+                    result = send()
+                except Exception as e:
+                    limited, headers = _rate_limit_details(e)
+                    if not limited or last:
+                        raise
+                    self.backoff(headers, attempt)
+                    continue
+
+            headers = getattr(result, "headers", None)
+            if getattr(result, "status_code", None) == 429 and not last:
+                self.backoff(headers, attempt)
+                continue
+
+            self.observe(headers)
+            self.settle(tokens, usage_tokens(result))
+            return result
+
+        return result
+
+
+GROQ_LIMITER = GroqRateLimiter(shared=SharedBudget() if BUDGET_DB else None)
+
+
+# ----------------------------
+# SDK CLIENT WRAPPER
+# ----------------------------
+
+class _LimitedCompletions:
+
+    def __init__(self, completions, limiter):
+        self._completions = completions
+        self._limiter = limiter
+
+    def create(self, **kwargs):
+        tokens = estimate_tokens(kwargs.get("messages"), kwargs.get("max_tokens"))
+        return self._limiter.run(lambda: self._completions.create(**kwargs), tokens)
+
+    def __getattr__(self, name):
+        return getattr(self._completions, name)
+
+
+class _LimitedChat:
+
+    def __init__(self, chat, limiter):
+        self._chat = chat
+        self.completions = _LimitedCompletions(chat.completions, limiter)
+
+    def __getattr__(self, name):
+        return getattr(self._chat, name)
+
+
+class LimitedGroq:
+    """
+    Drop-in Groq client whose chat.completions.create goes through the
+    shared limiter; everything else is passed to the wrapped client.
+    """
+
+    def __init__(self, client, limiter: GroqRateLimiter = None):
+        self._client = client
+        self.chat = _LimitedChat(client.chat, limiter or GROQ_LIMITER)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+def limited_client(client, limiter: GroqRateLimiter = None) -> LimitedGroq:
+    return LimitedGroq(client, limiter)
@@ -4,6 +4,13 @@ import time
 import sqlite3
 import os
 import datetime
+import resource
+import threading
+
+try:
+    import psutil
+except Exception:
+    psutil = None
 
 DB = "data/render_benchmark.db"
 
@@ -23,6 +30,148 @@ def init_render_db():
         )
     """)
 
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS stage_stats (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_id TEXT,
+            case_name TEXT,
+            stage TEXT,
+            frames INTEGER,
+            wall_time REAL,
+            cpu_util REAL,
+            peak_rss_mb REAL,
+            fps REAL,
+            timestamp TEXT
+        )
+    """)
+
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS stage_baseline (
+            case_name TEXT,
+            stage TEXT,
+            wall_time REAL,
+            peak_rss_mb REAL,
+            fps REAL,
+            run_id TEXT,
+            PRIMARY KEY (case_name, stage)
+        )
+    """)
+
+    conn.commit()
+    conn.close()
+
+
+# ----------------------------
+# STAGE METER
+# ----------------------------
+
+def _rss_bytes():
+    """
+    RSS of this process plus child processes (ffmpeg encoders, pool workers).
+    """
+    if psutil is None:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    proc = psutil.Process()
+    total = proc.memory_info().rss
+    for child in proc.children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            pass
+    return total
+
+
+def _cpu_seconds():
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+class StageMeter:
+    """
+    with StageMeter() as m: ...  -> m.wall_time, m.cpu_util, m.peak_rss_mb, m.fps
+
+    Peak RSS is sampled every `interval` seconds (psutil), falling back to
+    the process high-water mark when psutil is unavailable.
+    """
+
+    def __init__(self, frames=0, interval=0.05):
+        self.frames = frames
+        self.interval = interval
+        self.peak_rss = 0
+        self._stop = threading.Event()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak_rss = max(self.peak_rss, _rss_bytes())
+
+    def __enter__(self):
+        self.peak_rss = _rss_bytes()
+        self._cpu = _cpu_seconds()
+        self._start = time.perf_counter()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.wall_time = time.perf_counter() - self._start
+        cpu = _cpu_seconds() - self._cpu
+        self._stop.set()
+        self._thread.join()
+        self.peak_rss = max(self.peak_rss, _rss_bytes())
+
+        cores = os.cpu_count() or 1
+        self.cpu_util = cpu / (self.wall_time * cores) if self.wall_time else 0.0
+        self.peak_rss_mb = self.peak_rss / (1024 ** 2)
+        self.fps = self.frames / self.wall_time if self.frames and self.wall_time else None
+
+    def as_row(self):
+        return {
+            "frames": self.frames,
+            "wall_time": round(self.wall_time, 4),
+            "cpu_util": round(self.cpu_util, 4),
+            "peak_rss_mb": round(self.peak_rss_mb, 1),
+            "fps": round(self.fps, 3) if self.fps else None,
+        }
+
+
+def record_stage(run_id, case_name, stage, row):
+    init_render_db()
+    conn = sqlite3.connect(DB)
+    conn.execute("""
+        INSERT INTO stage_stats
+        (run_id, case_name, stage, frames, wall_time, cpu_util, peak_rss_mb, fps, timestamp)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, (
+        run_id, case_name, stage,
+        row["frames"], row["wall_time"], row["cpu_util"], row["peak_rss_mb"], row["fps"],
+        datetime.datetime.now().isoformat()
+    ))
+    conn.commit()
+    conn.close()
+
+
+def load_baseline():
+    init_render_db()
+    conn = sqlite3.connect(DB)
+    rows = conn.execute(
+        "SELECT case_name, stage, wall_time, peak_rss_mb, fps FROM stage_baseline"
+    ).fetchall()
+    conn.close()
+    return {
+        (case_name, stage): {"wall_time": wall, "peak_rss_mb": rss, "fps": fps}
+        for case_name, stage, wall, rss, fps in rows
+    }
+
+
+def save_baseline(run_id, results):
+    init_render_db()
+    conn = sqlite3.connect(DB)
+    for (case_name, stage), row in results.items():
+        conn.execute(
+            "INSERT OR REPLACE INTO stage_baseline VALUES (?, ?, ?, ?, ?, ?)",
+            (case_name, stage, row["wall_time"], row["peak_rss_mb"], row["fps"], run_id)
+        )
     conn.commit()
     conn.close()
 
@@ -0,0 +1,253 @@
+# scripts/render_suite.py
+#
+# Offline, reproducible render benchmark.
+#
+# Builds seeded synthetic scene plans that cover every motion template,
+# typography style and retention effect, renders them with local images
+# and audio only, and records per-stage fps / peak RSS / CPU into
+# data/render_benchmark.db. Results are compared against the stored
+# baseline; regressions fail the run.
+#
+#   python -m scripts.render_suite --durations 10 30 --profiles draft final
+#   python -m scripts.render_suite --save-baseline
+
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import uuid
+import wave
+import zlib
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from scripts.render_benchmark import StageMeter, record_stage, load_baseline, save_baseline
+
+MOTIONS = ["kenburns", "parallax", "punch_zoom", "rotation_drift", "glitch_hit", "light_leak"]
+SCENE_SECONDS = 5.0
+SAMPLE_RATE = 48000
+
+
+# ----------------------------
+# SYNTHETIC INPUTS
+# ----------------------------
+
+def synthetic_image(path, seed, size=(2400, 1600)):
+    """
+    Seeded gradient + noise: realistic JPEG entropy, no network.
+    """
+    rng = np.random.default_rng(seed)
+    w, h = size
+    ys, xs = np.mgrid[0:h, 0:w].astype(np.float32)
+    base = rng.uniform(0, 255, 3).astype(np.float32)
+    grad = (xs / w)[..., None] * rng.uniform(-120, 120, 3) + (ys / h)[..., None] * rng.uniform(-120, 120, 3)
+    noise = rng.normal(0, 12, (h, w, 3))
+    pixels = np.clip(base + grad + noise, 0, 255).astype(np.uint8)
+    Image.fromarray(pixels).save(path, quality=90)
+
+
+def synthetic_audio(path, duration, seed):
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+    tone = 0.2 * np.sin(2 * np.pi * 220 * t) + 0.02 * rng.standard_normal(len(t))
+    pcm = (np.clip(tone, -1, 1) * 32767).astype(np.int16)
+
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(pcm.tobytes())
+
+
+def synthetic_plan(duration, seed):
+    """
+    Scenes cycle every motion template; the typography path (plain words,
+    shock highlights, chapter intro, countdown) and retention filters
+    rotate independently so every combination shows up in longer plans.
+    """
+    from scene_engine.scene_schema import (
+        Scene, VisualConfig, TypographyConfig, AudioConfig, RetentionConfig
+    )
+
+    rng = random.Random(seed)
+    scenes = []
+
+    for idx in range(max(1, int(round(duration / SCENE_SECONDS)))):
+        words = [f"word{rng.randint(0, 999)}" for _ in range(8)]
+        kind = idx % 4
+
+        if kind == 3:
+            words[0] = "countdown"
+
+        scenes.append(Scene(
+            narration=" ".join(words),
+            duration=SCENE_SECONDS,
+            scene_type="hook" if kind == 2 else "explanation",
+            visual=VisualConfig(
+                mode="stock",
+                concept=f"benchmark concept {idx % 7}",
+                style_profile="cinematic",
+                camera_motion=MOTIONS[idx % len(MOTIONS)],
+            ),
+            typography=TypographyConfig(
+                style="kinetic_bold",
+                highlight_words=words[1:3] if kind == 1 else [],
+                effect="pop",
+            ),
+            audio=AudioConfig(bg_curve="steady", sfx=[]),
+            retention=RetentionConfig(
+                pattern_interrupt=idx % 2 == 0,
+                contrast_shift=idx % 3 == 0,
+            ),
+            scene_id=str(uuid.UUID(int=rng.getrandbits(128))),
+            chapter=f"Chapter {idx // 4 + 1}",
+        ))
+
+    return scenes
+
+
+# ----------------------------
+# SUITE
+# ----------------------------
+
+def build_renderer(profile, work_dir, scenes, seed):
+    """
+    TimelineBuilder wired to a private image cache seeded with synthetic
+    stills, so resolve() never reaches a stock/AI API.
+    """
+    from image_engine.image_cache_manager import ImageCacheManager
+    from image_engine.image_ingest import ImageIngestor
+    from retention.effect_schedule import RetentionEffectScheduler
+    from video_core.timeline_builder import TimelineBuilder
+    from video_core.transition_engine import TransitionEngine
+
+    builder = TimelineBuilder(profile, effect_scheduler=RetentionEffectScheduler())
+    builder.transition_engine = TransitionEngine(
+        styles=TransitionEngine.STYLES, rng=random.Random(seed)
+    )
+
+    visual = builder.composer.visual_engine
+    visual.cache = ImageCacheManager(base_dir=str(work_dir / "images"))
+    builder.composer.ingestor = ImageIngestor(str(work_dir / "ingest"))
+
+    for scene in scenes:
+        concept = scene.visual.concept
+        mode = visual._decide_mode(concept)
+        key = f"{mode}:{concept}:{scene.visual.style_profile}"
+
+        if visual.cache.get_cached_path(key, mode) is None:
+            still = work_dir / "still.jpg"
+            synthetic_image(still, seed=zlib.crc32(concept.encode("utf-8")))
+            visual.cache.store(key, mode, still.read_bytes())
+
+    return builder
+
+
+def run_case(run_id, profile, duration, work_dir, seed, encode=True):
+    from video_core.frame_compositor import FrameCompositor, ffmpeg_binary
+
+    case_name = f"{profile.name}_{int(duration)}s"
+    scenes = synthetic_plan(duration, seed)
+    builder = build_renderer(profile, work_dir, scenes, seed)
+    results = {}
+
+    with StageMeter() as meter:
+        schedule = builder.build_schedule(scenes)
+    results[(case_name, "plan")] = meter.as_row()
+
+    frames = profile.frame_count(schedule.duration)
+    compositor = FrameCompositor(profile)
+
+    with StageMeter(frames=frames) as meter:
+        for n in range(frames):
+            compositor.composite(schedule, n / profile.fps)
+    results[(case_name, "composite")] = meter.as_row()
+
+    if encode and (shutil.which(ffmpeg_binary()) or Path(ffmpeg_binary()).exists()):
+        audio_path = work_dir / f"{case_name}.wav"
+        synthetic_audio(audio_path, schedule.duration, seed)
+
+        schedule = builder.build_schedule(scenes)
+        with StageMeter(frames=frames) as meter:
+            compositor.render(schedule, work_dir / f"{case_name}.mp4", audio_path)
+        results[(case_name, "encode")] = meter.as_row()
+
+    for (case, stage), row in results.items():
+        record_stage(run_id, case, stage, row)
+
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    A stage regresses when fps drops or peak RSS grows beyond `tolerance`
+    (wall time stands in for fps on frame-less stages).
+    """
+    regressions = []
+
+    for key, row in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+
+        if row["fps"] and base["fps"] and row["fps"] < base["fps"] * (1 - tolerance):
+            regressions.append((key, "fps", base["fps"], row["fps"]))
+        elif not row["fps"] and row["wall_time"] > base["wall_time"] * (1 + tolerance):
+            regressions.append((key, "wall_time", base["wall_time"], row["wall_time"]))
+
+        if row["peak_rss_mb"] > base["peak_rss_mb"] * (1 + tolerance):
+            regressions.append((key, "peak_rss_mb", base["peak_rss_mb"], row["peak_rss_mb"]))
+
+    return regressions
+
+
+def main(argv=None):
+    from video_core.render_profile import get_profile
+
+    parser = argparse.ArgumentParser(description="Offline render benchmark suite")
+    parser.add_argument("--durations", type=float, nargs="+", default=[10, 30])
+    parser.add_argument("--profiles", nargs="+", default=["draft", "final"])
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    parser.add_argument("--no-encode", action="store_true")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    run_id = uuid.uuid4().hex[:12]
+    work_dir = Path(tempfile.mkdtemp(prefix="render_suite_"))
+    results = {}
+
+    try:
+        for name in args.profiles:
+            for duration in args.durations:
+                results.update(run_case(
+                    run_id, get_profile(name), duration, work_dir, args.seed,
+                    encode=not args.no_encode
+                ))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    for (case, stage), row in results.items():
+        fps = f"{row['fps']:.1f} fps" if row["fps"] else "-"
+        print(
+            f"{case:<14} {stage:<10} {row['wall_time']:>8.2f}s {fps:>12} "
+            f"{row['peak_rss_mb']:>8.1f} MB  cpu {row['cpu_util']:.0%}"
+        )
+
+    if args.save_baseline:
+        save_baseline(run_id, results)
+        print(f"Baseline saved from run {run_id}")
+        return 0
+
+    regressions = compare(results, load_baseline(), args.tolerance)
+    for (case, stage), metric, before, after in regressions:
+        print(f"REGRESSION {case}/{stage}: {metric} {before} -> {after}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,370 @@
+# scripts/stage_tracer.py
+#
+# Hierarchical stage tracing for the pipelines.
+#
+# Every span records wall time, CPU time (including child processes such
+# as ffmpeg), RSS delta, bytes read/written and outbound HTTP calls made
+# while it was open (requests, httpx, googleapiclient and gRPC unary
+# calls). Traces export to Chrome trace-event JSON (open in
+# chrome://tracing or Perfetto) and to a rolling SQLite table.
+
+import contextvars
+import datetime
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+try:
+    import psutil
+except Exception:
+    psutil = None
+
+TRACE_DB = "data/pipeline_traces.db"
+TRACE_DIR = "logs/traces"
+KEEP_RUNS = 50
+
+
+# ----------------------------
+# PROCESS COUNTERS
+# ----------------------------
+
+def _cpu_seconds():
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def _rss_bytes():
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def _io_bytes():
+    if psutil is not None:
+        try:
+            io = psutil.Process().io_counters()
+            return io.read_bytes, io.write_bytes
+        except (AttributeError, psutil.Error):
+            pass
+    try:
+        counters = {}
+        with open("/proc/self/io") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                counters[name] = int(value)
+        return counters.get("rchar", 0), counters.get("wchar", 0)
+    except (OSError, ValueError):
+        return 0, 0
+
+
+# ----------------------------
+# SPANS
+# ----------------------------
+
+class Span:
+
+    def __init__(self, name, category, parent):
+        self.span_id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.category = category
+        self.parent = parent
+        self.thread_id = threading.get_ident()
+        self.api_calls = 0
+        self.error = None
+
+        self.start = time.time()
+        self._perf = time.perf_counter()
+        self._cpu = _cpu_seconds()
+        self._rss = _rss_bytes()
+        self._read, self._written = _io_bytes()
+
+    def close(self):
+        self.wall = time.perf_counter() - self._perf
+        self.cpu = _cpu_seconds() - self._cpu
+        self.rss_delta = _rss_bytes() - self._rss
+        read, written = _io_bytes()
+        self.read_bytes = read - self._read
+        self.write_bytes = written - self._written
+
+    def record_api_call(self):
+        span = self
+        while span is not None:
+            span.api_calls += 1
+            span = span.parent
+
+    def as_dict(self):
+        return {
+            "span_id": self.span_id,
+            "parent_id": self.parent.span_id if self.parent else None,
+            "name": self.name,
+            "category": self.category,
+            "start": self.start,
+            "wall": round(self.wall, 6),
+            "cpu": round(self.cpu, 6),
+            "rss_delta": self.rss_delta,
+            "read_bytes": self.read_bytes,
+            "write_bytes": self.write_bytes,
+            "api_calls": self.api_calls,
+            "error": self.error,
+        }
+
+
+class _TracedUnaryCall:
+    """
+    Wraps a grpc unary-unary multi-callable; google-api-core (Cloud TTS)
+    invokes it directly, other entry points pass straight through.
+    """
+
+    def __init__(self, call, method, tracer):
+        self._call = call
+        self._method = method
+        self._tracer = tracer
+
+    def __call__(self, *args, **kwargs):
+        with self._tracer._rpc_span(self._method) as span:
+            span.record_api_call()
+            return self._call(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._call, name)
+
+
+class StageTracer:
+
+    def __init__(self, db_path=TRACE_DB, trace_dir=TRACE_DIR, keep_runs=KEEP_RUNS):
+        self.db_path = db_path
+        self.trace_dir = trace_dir
+        self.keep_runs = keep_runs
+        self.run_id = None
+        self.spans = []
+        self._current = contextvars.ContextVar("stage_span", default=None)
+        self._lock = threading.Lock()
+        self._http_hooked = False
+
+    @property
+    def current(self):
+        return self._current.get()
+
+    @contextmanager
+    def span(self, name, category="stage"):
+        parent = self._current.get()
+        span = Span(name, category, parent)
+        token = self._current.set(span)
+
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.close()
+            self._current.reset(token)
+            with self._lock:
+                self.spans.append(span)
+
+    def traced(self, name=None, category="stage"):
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name or func.__name__, category):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @contextmanager
+    def run(self, name):
+        """
+        Root span for one pipeline run; flushed to SQLite and Chrome JSON
+        on exit, even when the run fails.
+        """
+        self.install_http_hooks()
+
+        nested = self.run_id is not None
+        if not nested:
+            self.run_id = datetime.datetime.now().strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+            self.spans = []
+
+        try:
+            with self.span(name, "run"):
+                yield self
+        finally:
+            if not nested:
+                self.flush()
+                self.run_id = None
+
+    # ----------------------------
+    # OUTBOUND API CALLS
+    # ----------------------------
+
+    def _http_span(self, method, url):
+        host = urlparse(str(url)).netloc or "unknown"
+        return self.span(f"{method} {host}", "api")
+
+    def _rpc_span(self, method):
+        # "/google.cloud.texttospeech.v1.TextToSpeech/SynthesizeSpeech"
+        method = method.decode() if isinstance(method, bytes) else str(method)
+        return self.span(f"RPC {method.rsplit('/', 1)[-1] or method}", "api")
+
+    def install_http_hooks(self):
+        """
+        Counts every outbound call as an "api" child span of whatever stage
+        issued it: requests/httpx (Groq, Pexels, news...), googleapiclient
+        (YouTube Data / Analytics; a resumable upload is one span) and gRPC
+        unary calls (Cloud TTS). Streaming gRPC calls are not counted.
+        """
+        if self._http_hooked:
+            return
+        self._http_hooked = True
+        tracer = self
+
+        try:
+            import requests
+
+            original = requests.Session.request
+
+            def request(session, method, url, *args, **kwargs):
+                with tracer._http_span(method, url) as span:
+                    span.record_api_call()
+                    return original(session, method, url, *args, **kwargs)
+
+            requests.Session.request = request
+        except Exception:
+            pass
+
+        try:
+            import httpx
+
+            original_send = httpx.Client.send
+
+            def send(client, request, *args, **kwargs):
+                with tracer._http_span(request.method, request.url) as span:
+                    span.record_api_call()
+                    return original_send(client, request, *args, **kwargs)
+
+            httpx.Client.send = send
+        except Exception:
+            pass
+
+        try:
+            from googleapiclient.http import HttpRequest
+
+            original_execute = HttpRequest.execute
+
+            def execute(request, *args, **kwargs):
+                with tracer._http_span(request.method, request.uri) as span:
+                    span.record_api_call()
+                    return original_execute(request, *args, **kwargs)
+
+            HttpRequest.execute = execute
+        except Exception:
+            pass
+
+        try:
+            from grpc import _channel
+
+            original_unary_unary = _channel.Channel.unary_unary
+
+            def unary_unary(channel, method, *args, **kwargs):
+                return _TracedUnaryCall(
+                    original_unary_unary(channel, method, *args, **kwargs), method, tracer
+                )
+
+            _channel.Channel.unary_unary = unary_unary
+        except Exception:
+            pass
+
+    # ----------------------------
+    # EXPORT
+    # ----------------------------
+
+    def chrome_trace(self):
+        pid = os.getpid()
+        events = []
+
+        for span in self.spans:
+            data = span.as_dict()
+            events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": int(span.start * 1e6),
+                "dur": int(span.wall * 1e6),
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": {
+                    k: data[k]
+                    for k in ("cpu", "rss_delta", "read_bytes", "write_bytes", "api_calls", "error")
+                },
+            })
+
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+        return path
+
+    def _init_db(self, conn):
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS trace_spans (
+                run_id TEXT,
+                span_id TEXT,
+                parent_id TEXT,
+                name TEXT,
+                category TEXT,
+                start REAL,
+                wall REAL,
+                cpu REAL,
+                rss_delta INTEGER,
+                read_bytes INTEGER,
+                write_bytes INTEGER,
+                api_calls INTEGER,
+                error TEXT
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_trace_run ON trace_spans (run_id)")
+
+    def flush(self):
+        if not self.spans:
+            return
+
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        self._init_db(conn)
+
+        conn.executemany(
+            "INSERT INTO trace_spans VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (self.run_id, d["span_id"], d["parent_id"], d["name"], d["category"],
+                 d["start"], d["wall"], d["cpu"], d["rss_delta"], d["read_bytes"],
+                 d["write_bytes"], d["api_calls"], d["error"])
+                for d in (span.as_dict() for span in self.spans)
+            ]
+        )
+
+        # Rolling window: keep only the most recent runs
+        conn.execute("""
+            DELETE FROM trace_spans WHERE run_id NOT IN (
+                SELECT run_id FROM trace_spans
+                GROUP BY run_id ORDER BY MIN(start) DESC LIMIT ?
+            )
+        """, (self.keep_runs,))
+
+        conn.commit()
+        conn.close()
+
+        self.export_chrome(os.path.join(self.trace_dir, f"{self.run_id}.json"))
+
+
+TRACER = StageTracer()
@@ -0,0 +1,47 @@
+"""
+test_audio_features.py
+The cached energy track must reproduce the uploader's original beat
+detector: sum of |sample| over int(rate * 0.1) sample windows.
+"""
+
+import numpy as np
+import pytest
+
+sf = pytest.importorskip("soundfile")
+
+from audio_engine.audio_features import extract  # noqa: E402
+
+
+def _original_detector(data, rate):
+    window = int(rate * 0.1)
+    energy = [np.sum(np.abs(data[i:i + window])) for i in range(0, len(data), window)]
+    threshold = np.mean(energy) * 1.5
+    return [i for i, e in enumerate(energy) if e > threshold]
+
+
+@pytest.mark.parametrize("rate, seconds", [(22050, 20.0), (24000, 12.37), (44100, 3.05)])
+def test_loud_windows_match_original_detector(tmp_path, rate, seconds):
+    rng = np.random.default_rng(rate)
+    n = int(rate * seconds)
+    t = np.arange(n) / rate
+    # Noise bed with periodic loud bursts
+    signal = 0.05 * rng.standard_normal(n) + 0.6 * (np.sin(2 * np.pi * 1.7 * t) > 0.8) * np.sin(2 * np.pi * 220 * t)
+    pcm = (np.clip(signal, -1, 1) * 32767).astype(np.int16)
+
+    path = tmp_path / "narration.wav"
+    # Small blocks so windows straddle block boundaries
+    sf.write(str(path), pcm, rate, subtype="PCM_16")
+    features = extract(str(path), block_seconds=0.73)
+
+    assert len(features.energy) == -(-n // int(rate * 0.1))
+    assert features.loud_windows(0.1, 1.5) == _original_detector(pcm.astype(np.int64), rate)
+
+
+def test_window_energy_rejects_partial_windows(tmp_path):
+    path = tmp_path / "tone.wav"
+    sf.write(str(path), np.zeros(22050, dtype=np.int16), 22050, subtype="PCM_16")
+    features = extract(str(path))
+
+    assert len(features.window_energy(0.2)) == 5
+    with pytest.raises(ValueError):
+        features.window_energy(0.15)
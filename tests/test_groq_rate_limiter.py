@@ -0,0 +1,45 @@
+"""
+test_groq_rate_limiter.py
+Limiters backed by one SharedBudget (as separate generate_* processes
+are) must draw from a single RPM / TPM budget and share 429 pauses.
+"""
+
+import time
+
+from scripts.groq_rate_limiter import GroqRateLimiter, SharedBudget
+
+
+def _limiter(db, rpm=3):
+    return GroqRateLimiter(rpm=rpm, tpm=100000, shared=SharedBudget(str(db)))
+
+
+def test_requests_drain_one_shared_budget(tmp_path):
+    db = tmp_path / "groq_budget.db"
+    first, second = _limiter(db), _limiter(db)
+
+    for _ in range(3):
+        first.run(lambda: None, 1)
+
+    with second._state():
+        second.requests.refill(time.time())
+        assert second.requests.wait_for(1) > 0
+
+
+def test_unshared_limiters_keep_separate_budgets():
+    first = GroqRateLimiter(rpm=3, tpm=100000)
+    second = GroqRateLimiter(rpm=3, tpm=100000)
+
+    for _ in range(3):
+        first.run(lambda: None, 1)
+
+    assert second.requests.wait_for(1) == 0
+
+
+def test_backoff_pauses_every_process(tmp_path):
+    db = tmp_path / "groq_budget.db"
+    first, second = _limiter(db), _limiter(db)
+
+    first.backoff({"retry-after": "30"})
+
+    with second._state():
+        assert second.blocked_until > time.time() + 20
@@ -0,0 +1,53 @@
+"""
+test_narration_cache.py
+Narration chunk cache: a changed speaking rate or language must not be
+served audio rendered with the old settings.
+"""
+
+import wave
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from audio_engine.narration_engine import FakeTTSBackend, NarrationEngine  # noqa: E402
+
+SSML = "<speak><prosody rate='medium'>Hello there.</prosody><break time='300ms'/></speak>"
+
+
+def _engine(tmp_path, **backend_kwargs):
+    backend = FakeTTSBackend(sample_rate=8000, latency=0.0, **backend_kwargs)
+    return NarrationEngine(backend, voice="en-US-Neural2-D", cache_dir=str(tmp_path / "cache"), workers=1)
+
+
+def _frames(path):
+    with wave.open(str(path), "rb") as w:
+        return w.getnframes()
+
+
+def test_same_settings_hit_cache(tmp_path):
+    _engine(tmp_path).synthesize(SSML, tmp_path / "a.wav")
+
+    engine = _engine(tmp_path)
+    engine.synthesize(SSML, tmp_path / "b.wav")
+
+    assert engine.last_stats["cache_hits"] == engine.last_stats["chunks"]
+
+
+def test_speaking_rate_misses_cache(tmp_path):
+    _engine(tmp_path, speaking_rate=1.0).synthesize(SSML, tmp_path / "normal.wav")
+
+    engine = _engine(tmp_path, speaking_rate=1.25)
+    engine.synthesize(SSML, tmp_path / "fast.wav")
+
+    assert engine.last_stats["cache_hits"] == 0
+    assert _frames(tmp_path / "fast.wav") < _frames(tmp_path / "normal.wav")
+
+
+def test_language_code_misses_cache(tmp_path):
+    _engine(tmp_path, language_code="en-US").synthesize(SSML, tmp_path / "us.wav")
+
+    engine = _engine(tmp_path, language_code="en-GB")
+    engine.synthesize(SSML, tmp_path / "gb.wav")
+
+    assert engine.last_stats["cache_hits"] == 0
@@ -1,15 +1,31 @@
 import numpy as np
 import soundfile as sf
-from moviepy import VideoClip
 from pathlib import Path
 from scipy.signal import butter, lfilter
-import random
+from functools import lru_cache
+from multiprocessing import Pool, cpu_count
+import subprocess
+import hashlib
 import json
 
+try:
+    from imageio_ffmpeg import get_ffmpeg_exe
+except Exception:
+    get_ffmpeg_exe = None
+
 BASE_DIR = Path("assets")
+MANIFEST = BASE_DIR / "manifest.json"
 SR = 48000
 WIDTH = 1920
 HEIGHT = 1080
+FPS = 30
+CHUNK_FRAMES = 8
+NOISE_POOL = 4
+NOISE_PAD = 128
+GLITCH_SHIFT = 50
+
+# Bump when a generator's output changes for the same parameters
+GENERATOR_VERSION = 3
 
 
 # ==========================================================
@@ -31,6 +47,57 @@ def create_dirs():
         (BASE_DIR / d).mkdir(parents=True, exist_ok=True)
 
 
+# ==========================================================
+# MANIFEST (skip up-to-date assets)
+# ==========================================================
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def params_hash(kind, params):
+    payload = json.dumps(
+        {"kind": kind, "params": params, "version": GENERATOR_VERSION},
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_manifest():
+    if MANIFEST.exists():
+        with open(MANIFEST) as f:
+            return json.load(f)
+    return {}
+
+
+def save_manifest(manifest):
+    with open(MANIFEST, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def build_asset(manifest, path, kind, params, generate):
+    """
+    Regenerates `path` only when its parameters changed or the file on
+    disk no longer matches the recorded content hash.
+    """
+    key = str(path.relative_to(BASE_DIR))
+    wanted = params_hash(kind, params)
+    entry = manifest.get(key)
+
+    if entry and entry["params"] == wanted and path.exists():
+        if file_sha256(path) == entry["sha256"]:
+            print(f"Up to date: {key}")
+            return
+
+    generate(path, **params)
+    manifest[key] = {"params": wanted, "sha256": file_sha256(path)}
+    save_manifest(manifest)
+
+
 # ==========================================================
 # AUDIO ENGINE (ELITE)
 # ==========================================================
@@ -46,146 +113,225 @@ def stereo_width(signal, width=0.5):
     return np.column_stack([left, right])
 
 
-def multi_band_impact(filename):
+def multi_band_impact(path, seed=0):
+    rng = np.random.default_rng(seed)
     duration = 1.2
     t = np.linspace(0, duration, int(SR * duration))
 
     sub = np.sin(2 * np.pi * 40 * t) * np.exp(-3 * t)
     mid = np.sin(2 * np.pi * 120 * t) * np.exp(-5 * t)
-    high = np.random.randn(len(t)) * np.exp(-30 * t)
+    high = rng.standard_normal(len(t)) * np.exp(-30 * t)
 
     composite = sub + mid + high * 0.4
     composite = normalize(composite)
 
-    sf.write(BASE_DIR / "sfx" / filename,
-             stereo_width(composite, 0.6),
-             SR)
+    sf.write(path, stereo_width(composite, 0.6), SR)
 
 
-def harmonic_riser(filename):
+def harmonic_riser(path, seed=0):
+    rng = np.random.default_rng(seed)
     duration = 4.0
     t = np.linspace(0, duration, int(SR * duration))
 
     base = np.sin(2 * np.pi * (100 + 1500 * t) * t)
     harmonic = np.sin(2 * np.pi * (300 + 2500 * t) * t)
-    noise = np.random.randn(len(t)) * 0.2
+    noise = rng.standard_normal(len(t)) * 0.2
 
     envelope = np.linspace(0, 1, len(t)) ** 2
 
     mix = (base + harmonic * 0.5 + noise) * envelope
     mix = normalize(mix)
 
-    sf.write(BASE_DIR / "sfx" / filename,
-             stereo_width(mix, 0.7),
-             SR)
+    sf.write(path, stereo_width(mix, 0.7), SR)
 
 
-def cinematic_whoosh(filename):
+def cinematic_whoosh(path, seed=0):
+    rng = np.random.default_rng(seed)
     duration = 1.5
     t = np.linspace(0, duration, int(SR * duration))
 
-    noise = np.random.randn(len(t))
+    noise = rng.standard_normal(len(t))
     envelope = np.linspace(0, 1, len(t)) ** 3
     filtered = lfilter(*butter(4, 0.4), noise)
 
     mix = filtered * envelope
     mix = normalize(mix)
 
-    sf.write(BASE_DIR / "sfx" / filename,
-             stereo_width(mix, 0.5),
-             SR)
+    sf.write(path, stereo_width(mix, 0.5), SR)
 
 
 # ==========================================================
 # VISUAL ENGINE (ELITE)
 # ==========================================================
 
-def volumetric_light_leak(filename, seed):
-    random.seed(seed)
+def loop_omega(omega, duration):
+    """
+    Nearest angular frequency that completes whole cycles in `duration`,
+    so the last frame flows back into the first.
+    """
+    cycles = max(1, round(omega * duration / (2 * np.pi)))
+    return 2 * np.pi * cycles / duration
 
-    def make_frame(t):
-        frame = np.zeros((HEIGHT, WIDTH, 3))
 
-        cx = int(WIDTH * (0.3 + 0.4 * np.sin(t * 0.5)))
-        cy = int(HEIGHT * (0.5 + 0.3 * np.cos(t * 0.4)))
+@lru_cache(maxsize=1)
+def glow_grid():
+    """
+    exp(-dist / 250) around the centre of a 3x canvas; every light leak
+    frame is a window into it, so distances are computed once per worker.
+    """
+    ys = np.arange(3 * HEIGHT, dtype=np.float32) - 1.5 * HEIGHT
+    xs = np.arange(3 * WIDTH, dtype=np.float32) - 1.5 * WIDTH
+    dist = np.sqrt(ys[:, None] ** 2 + xs[None, :] ** 2)
+    return np.exp(-dist / 250).astype(np.float32)
+
+
+def light_leak_frame(n, duration, seed):
+    rng = np.random.default_rng(seed)
+    phase_x, phase_y, phase_f = rng.uniform(0, 2 * np.pi, 3)
+    t = n / FPS
+
+    cx = int(WIDTH * (0.3 + 0.4 * np.sin(loop_omega(0.5, duration) * t + phase_x)))
+    cy = int(HEIGHT * (0.5 + 0.3 * np.cos(loop_omega(0.4, duration) * t + phase_y)))
+    flicker = 0.7 + 0.3 * np.sin(loop_omega(10, duration) * t + phase_f)
+
+    x0 = int(1.5 * WIDTH) - cx
+    y0 = int(1.5 * HEIGHT) - cy
+    glow = glow_grid()[y0:y0 + HEIGHT, x0:x0 + WIDTH]
+
+    tint = np.array([1.0, 0.6, 0.3], dtype=np.float32) * (255 * flicker)
+    return np.clip(glow[..., None] * tint, 0, 255).astype(np.uint8)
+
+
+@lru_cache(maxsize=4)
+def noise_pool(seed, high, gray=False):
+    """
+    A few padded RGB noise tiles per worker; frames are offset windows
+    into them, so no frame draws a full-resolution random array. Gray
+    tiles are expanded to RGB once here rather than on every frame.
+    """
+    rng = np.random.default_rng(seed)
+    shape = (NOISE_POOL, HEIGHT + NOISE_PAD, WIDTH + NOISE_PAD)
+
+    if gray:
+        return np.repeat(rng.integers(0, high, shape + (1,), dtype=np.uint8), 3, axis=3)
+    return rng.integers(0, high, shape + (3,), dtype=np.uint8)
+
+
+def noise_window(pool, rng, margin=0):
+    """
+    Random HEIGHT x WIDTH window of a random pool entry, at least `margin`
+    pixels from the tile edges.
+    """
+    entry = pool[rng.integers(0, NOISE_POOL)]
+    y, x = rng.integers(margin, NOISE_PAD - margin + 1, 2)
+    return entry, y, x
+
+
+def glitch_frame(n, duration, seed):
+    rng = np.random.default_rng((seed, n % int(duration * FPS)))
+    entry, y, x = noise_window(noise_pool(seed, 255), rng, GLITCH_SHIFT)
+
+    # Channel shifts become per-channel window offsets instead of rolls
+    shifts = np.zeros((3, 2), dtype=np.int64)
+    for _ in range(5):
+        x_shift, y_shift = rng.integers(-GLITCH_SHIFT, GLITCH_SHIFT + 1, 2)
+        channel = rng.integers(0, 3)
+        shifts[channel] = np.clip(shifts[channel] + (y_shift, x_shift), -GLITCH_SHIFT, GLITCH_SHIFT)
+
+    frame = np.empty((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    for channel, (dy, dx) in enumerate(shifts):
+        frame[..., channel] = entry[y - dy:y - dy + HEIGHT, x - dx:x - dx + WIDTH, channel]
+
+    return frame
+
+
+def grain_frame(n, duration, seed):
+    rng = np.random.default_rng((seed, n % int(duration * FPS)))
+    entry, y, x = noise_window(noise_pool(seed, 50, gray=True), rng)
+
+    # Contiguous copy: tobytes() on a strided window is far slower
+    return np.ascontiguousarray(entry[y:y + HEIGHT, x:x + WIDTH])
+
+
+FRAME_GENERATORS = {
+    "light_leak": light_leak_frame,
+    "glitch": glitch_frame,
+    "grain": grain_frame,
+}
+
+
+def render_chunk(task):
+    kind, frames, duration, seed = task
+    make_frame = FRAME_GENERATORS[kind]
+    return b"".join(make_frame(n, duration, seed).tobytes() for n in frames)
+
+
+def encode_video(path, kind, duration, seed, bitrate="8000k"):
+    """
+    Frames are rendered in parallel chunks and piped, in order, into a
+    single ffmpeg encoder.
+    """
+    total = int(round(duration * FPS))
+    chunks = [
+        (kind, range(start, min(start + CHUNK_FRAMES, total)), duration, seed)
+        for start in range(0, total, CHUNK_FRAMES)
+    ]
 
-        for y in range(HEIGHT):
-            for x in range(WIDTH):
-                dist = np.sqrt((x - cx) ** 2 + (y - cy) ** 2)
-                glow = np.exp(-dist / 250)
-                flicker = 0.7 + 0.3 * np.sin(t * 10)
-                val = glow * 255 * flicker
-                frame[y, x] = [val, val * 0.6, val * 0.3]
+    command = [
+        get_ffmpeg_exe() if get_ffmpeg_exe else "ffmpeg", "-y",
+        "-loglevel", "error",
+        "-f", "rawvideo",
+        "-pix_fmt", "rgb24",
+        "-s", f"{WIDTH}x{HEIGHT}",
+        "-r", str(FPS),
+        "-i", "-",
+        "-c:v", "libx264",
+        "-b:v", bitrate,
+        "-pix_fmt", "yuv420p",
+        str(path),
+    ]
 
-        return np.clip(frame, 0, 255).astype(np.uint8)
+    process = subprocess.Popen(command, stdin=subprocess.PIPE)
 
-    clip = VideoClip(make_frame, duration=5)
-    clip.write_videofile(
-        str(BASE_DIR / "overlays" / filename),
-        fps=30,
-        codec="libx264",
-        audio=False,
-        bitrate="8000k"
-    )
-    clip.close()
+    try:
+        with Pool(max(1, cpu_count() - 1)) as pool:
+            for data in pool.imap(render_chunk, chunks):
+                process.stdin.write(data)
+    finally:
+        process.stdin.close()
+        code = process.wait()
 
+    if code != 0:
+        raise RuntimeError(f"ffmpeg exited with status {code} for {path}")
 
-def cinematic_glitch(filename):
-    def make_frame(t):
-        base = np.random.randint(0, 255, (HEIGHT, WIDTH, 3))
 
-        for _ in range(5):
-            x_shift = random.randint(-50, 50)
-            y_shift = random.randint(-50, 50)
-            channel = random.randint(0, 2)
-            base[:, :, channel] = np.roll(base[:, :, channel], x_shift, axis=1)
-            base[:, :, channel] = np.roll(base[:, :, channel], y_shift, axis=0)
+def volumetric_light_leak(path, seed=0):
+    encode_video(path, "light_leak", duration=5, seed=seed)
 
-        return base.astype(np.uint8)
 
-    clip = VideoClip(make_frame, duration=2)
-    clip.write_videofile(
-        str(BASE_DIR / "overlays" / filename),
-        fps=30,
-        codec="libx264",
-        audio=False,
-        bitrate="8000k"
-    )
-    clip.close()
-
-
-def seamless_grain_loop(filename):
-    def make_frame(t):
-        noise = np.random.randint(0, 50, (HEIGHT, WIDTH))
-        frame = np.stack([noise]*3, axis=-1)
-        return frame.astype(np.uint8)
-
-    clip = VideoClip(make_frame, duration=3)
-    clip.write_videofile(
-        str(BASE_DIR / "grain" / filename),
-        fps=30,
-        codec="libx264",
-        audio=False,
-        bitrate="6000k"
-    )
-    clip.close()
+def cinematic_glitch(path, seed=0):
+    encode_video(path, "glitch", duration=2, seed=seed)
+
+
+def seamless_grain_loop(path, seed=0):
+    encode_video(path, "grain", duration=3, seed=seed, bitrate="6000k")
 
 
 # ==========================================================
 # MOTION TEMPLATE GENERATOR
 # ==========================================================
 
-def generate_motion_templates():
-    templates = {
-        "hook_motion": {"zoom": 0.18, "rotation": 1.2, "shake": 0.6},
-        "tension_motion": {"zoom": 0.08, "rotation": 0.3, "shake": 0.1},
-        "climax_motion": {"zoom": 0.25, "rotation": 2.0, "shake": 0.8},
-        "reset_motion": {"zoom": 0.12, "rotation": 0.5, "shake": 0.2}
-    }
+MOTION_TEMPLATES = {
+    "hook_motion": {"zoom": 0.18, "rotation": 1.2, "shake": 0.6},
+    "tension_motion": {"zoom": 0.08, "rotation": 0.3, "shake": 0.1},
+    "climax_motion": {"zoom": 0.25, "rotation": 2.0, "shake": 0.8},
+    "reset_motion": {"zoom": 0.12, "rotation": 0.5, "shake": 0.2}
+}
+
 
-    for name, data in templates.items():
-        with open(BASE_DIR / "motion_templates" / f"{name}.json", "w") as f:
-            json.dump(data, f, indent=2)
+def write_motion_template(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
 
 
 # ==========================================================
@@ -194,19 +340,28 @@ def generate_motion_templates():
 
 def main():
     create_dirs()
+    manifest = load_manifest()
 
     # Generate multiple variants
     for i in range(3):
-        volumetric_light_leak(f"light_leak_variant_{i}.mp4", seed=i)
-        cinematic_glitch(f"glitch_variant_{i}.mp4")
-
-    seamless_grain_loop("grain_loop.mp4")
-
-    multi_band_impact("impact_pro.wav")
-    harmonic_riser("riser_pro.wav")
-    cinematic_whoosh("whoosh_pro.wav")
-
-    generate_motion_templates()
+        build_asset(manifest, BASE_DIR / "overlays" / f"light_leak_variant_{i}.mp4",
+                    "light_leak", {"seed": i}, volumetric_light_leak)
+        build_asset(manifest, BASE_DIR / "overlays" / f"glitch_variant_{i}.mp4",
+                    "glitch", {"seed": i}, cinematic_glitch)
+
+    build_asset(manifest, BASE_DIR / "grain" / "grain_loop.mp4",
+                "grain", {"seed": 0}, seamless_grain_loop)
+
+    build_asset(manifest, BASE_DIR / "sfx" / "impact_pro.wav",
+                "impact", {"seed": 0}, multi_band_impact)
+    build_asset(manifest, BASE_DIR / "sfx" / "riser_pro.wav",
+                "riser", {"seed": 0}, harmonic_riser)
+    build_asset(manifest, BASE_DIR / "sfx" / "whoosh_pro.wav",
+                "whoosh", {"seed": 0}, cinematic_whoosh)
+
+    for name, data in MOTION_TEMPLATES.items():
+        build_asset(manifest, BASE_DIR / "motion_templates" / f"{name}.json",
+                    "motion_template", {"data": data}, write_motion_template)
 
     print("ELITE cinematic assets generated.")
 
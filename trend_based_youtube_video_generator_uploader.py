@@ -38,9 +38,10 @@ import requests
 
 import statistics
 import uuid
-import shutil
 from collections import defaultdict
 from sentence_transformers import SentenceTransformer, util
+from video_core.transition_engine import TransitionEngine
+from scripts.stage_tracer import TRACER
 # ==========================================================
 # NON-DETERMINISTIC CHAOS ENGINE
 # ==========================================================
@@ -237,21 +238,11 @@ def significant_winner(memory):
 # DYNAMIC TRANSITION ENGINE
 # ==========================================================
 
-def dynamic_transition(clip_a, clip_b):
-    style = random.choice(["crossfade", "hard_cut", "zoom_flash"])
-
-    if style == "crossfade":
-        return concatenate_videoclips(
-            [clip_a.crossfadeout(0.3), clip_b.crossfadein(0.3)],
-            method="compose"
-        )
+DYNAMIC_TRANSITIONS = TransitionEngine(
+    transition_duration=0.3,
+    styles=TransitionEngine.STYLES
+)
 
-    elif style == "zoom_flash":
-        clip_b = clip_b.resize(lambda t: 1 + 0.02*np.sin(t*10))
-        return concatenate_videoclips([clip_a, clip_b], method="compose")
-
-    else:
-        return concatenate_videoclips([clip_a, clip_b], method="compose")
 
 # ==========================================================
 # NON-DETERMINISTIC PACING ENGINE
@@ -390,11 +381,8 @@ def enterprise_compose_video(scenes, narration):
 
         final_clips.append(clip)
 
-    # Dynamic transitions
-    stitched = final_clips[0]
-
-    for c in final_clips[1:]:
-        stitched = dynamic_transition(stitched, c)
+    # Dynamic transitions on one flat timeline (no nested concatenation)
+    stitched = DYNAMIC_TRANSITIONS.apply_transitions(final_clips)
 
     # Attach narration audio
     music_path = select_music(scenes[0]["emotion"])
@@ -428,15 +416,14 @@ from moviepy.editor import (
     CompositeVideoClip,
     CompositeAudioClip,
     concatenate_videoclips,
-    ColorClip,
-    TextClip
+    ColorClip
 )
 
-from google.cloud import texttospeech
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
 from google.oauth2.credentials import Credentials
 from groq import Groq
+from scripts.groq_rate_limiter import limited_client
 
 # ================= CONFIG (PRESERVED) =================
 
@@ -449,7 +436,8 @@ YT_CLIENT_ID = os.getenv("YT_CLIENT_ID")
 YT_CLIENT_SECRET = os.getenv("YT_CLIENT_SECRET")
 YT_REFRESH_TOKEN = os.getenv("YT_REFRESH_TOKEN")
 
-groq_client = Groq(api_key=GROQ_API_KEY)
+# Shared RPM/TPM budget across every LLM step
+groq_client = limited_client(Groq(api_key=GROQ_API_KEY))
 visual_embedder = SentenceTransformer("all-MiniLM-L6-v2")
 
 ROOT = Path(".")
@@ -1569,94 +1557,13 @@ VOICE_MAP = {
 
 def generate_narration(ssml_text):
 
-    client = texttospeech.TextToSpeechClient()
     voice_name = VOICE_MAP.get("serious", "en-US-Wavenet-D")
 
-    MAX_BYTES = 4800  # safe margin under 5000
-
-    # Remove outer speak if present
-    ssml_text = ssml_text.replace("<speak>", "").replace("</speak>", "")
-
-    # Split by prosody blocks (safe SSML boundaries)
-    blocks = re.findall(r'<prosody.*?>.*?</prosody>\s*<break.*?/>', ssml_text, re.DOTALL)
-
-    if not blocks:
-        blocks = [ssml_text]
-
-    parts = []
-    current = ""
-
-    for block in blocks:
-
-        candidate = current + block
-
-        wrapped = f"<speak>{candidate}</speak>"
+    # Chunks synthesize concurrently, are cached per (SSML, voice) and
+    # join sample-exactly into one WAV
+    engine = NarrationEngine(GoogleTTSBackend(), voice_name, workers=4)
 
-        if len(wrapped.encode("utf-8")) > MAX_BYTES:
-
-            if current:
-                parts.append(current)
-
-            # If single block too large, hard truncate safely
-            if len(block.encode("utf-8")) > MAX_BYTES:
-
-                safe_block = block.encode("utf-8")[:MAX_BYTES-50].decode("utf-8", errors="ignore")
-
-                parts.append(safe_block)
-
-                current = ""
-
-            else:
-                current = block
-
-        else:
-            current = candidate
-
-    if current:
-        parts.append(current)
-
-    audio_chunks = []
-
-    for i, chunk in enumerate(parts):
-
-        chunk = f"<speak>{chunk}</speak>"
-
-        response = client.synthesize_speech(
-            input=texttospeech.SynthesisInput(ssml=chunk),
-            voice=texttospeech.VoiceSelectionParams(
-                language_code="en-US",
-                name=voice_name
-            ),
-            audio_config=texttospeech.AudioConfig(
-                audio_encoding=texttospeech.AudioEncoding.LINEAR16,
-                speaking_rate=1.0
-            )
-        )
-
-        part_path = OUTPUT / f"narration_part_{i}.wav"
-
-        with open(part_path, "wb") as f:
-            f.write(response.audio_content)
-
-        audio_chunks.append(str(part_path))
-
-    final_output = OUTPUT / "narration.wav"
-
-    try:
-        subprocess.run([
-            "ffmpeg",
-            "-y",
-            "-f", "concat",
-            "-safe", "0",
-            "-i", "<(for f in " + " ".join(audio_chunks) + "; do echo \"file '$f'\"; done)",
-            "-c", "copy",
-            str(final_output)
-        ], shell=True, check=True)
-
-    except:
-        shutil.copy(audio_chunks[0], final_output)
-
-    return final_output
+    return Path(engine.synthesize(ssml_text, OUTPUT / "narration.wav"))
 
 # ================= MULTI SOURCE MEDIA =================
 
@@ -1747,7 +1654,12 @@ def generate_thumbnail_variants(topic):
 # ================= ADDITIONAL IMPORTS (NO REMOVAL) =================
 
 import numpy as np
-from scipy.io import wavfile
+from dataclasses import replace
+from typography.text_rasterizer import TEXT_ATLAS
+from typography.text_style_registry import TextStyle
+from audio_engine.loudness import LoudnessNormalizer
+from audio_engine.audio_features import AUDIO_FEATURES
+from audio_engine.narration_engine import NarrationEngine, GoogleTTSBackend
 
 # ================= BEAT DETECTION ENGINE =================
 
@@ -1756,36 +1668,26 @@ def master_audio(input_path):
     output_path = OUTPUT / "narration_mastered.wav"
 
     try:
-        subprocess.run([
-            "ffmpeg",
-            "-i", str(input_path),
-            "-af", "acompressor,alimiter",
-            str(output_path)
-        ], check=True)
+        # EBU R128: -14 LUFS integrated, -1 dBTP; cached by content hash
+        report = LoudnessNormalizer(target_lufs=-14.0, true_peak_db=-1.0).normalize(
+            str(input_path), str(output_path)
+        )
+        log.info(
+            f"Mastered narration: {report['integrated_lufs']:.1f} LUFS -> "
+            f"{report['target_lufs']:.1f} LUFS (gain {report['gain_db']:+.1f} dB)"
+        )
 
         return output_path
 
-    except:
+    except Exception as e:
+        log.warning(f"Mastering failed, using raw narration: {e}")
         return input_path
         
 def detect_beats_from_audio(audio_path):
+    # 100 ms windows louder than 1.5x the mean, from the shared feature cache
     try:
-        rate, data = wavfile.read(str(audio_path))
-        if len(data.shape) > 1:
-            data = data[:,0]
-
-        window = int(rate * 0.1)
-        energy = []
-
-        for i in range(0, len(data), window):
-            segment = data[i:i+window]
-            energy.append(np.sum(np.abs(segment)))
-
-        threshold = np.mean(energy) * 1.5
-        beats = [i for i, e in enumerate(energy) if e > threshold]
-
-        return beats
-    except:
+        return AUDIO_FEATURES.features(audio_path).loud_windows(0.1, 1.5)
+    except Exception:
         return []
 
 # ================= SILENCE BEFORE REVEAL =================
@@ -1847,14 +1749,24 @@ def apply_multi_camera_motion(clip, intensity, duration):
 
 # ================= SUBTITLE ANIMATION =================
 
+# Same face the TextClip rendered: moviepy's default, ImageMagick "Courier"
+SUBTITLE_STYLE = TextStyle(
+    font="Courier",
+    font_size=40,
+    color="white",
+    stroke_color=None,
+    stroke_width=0,
+    kerning=0
+)
+
 def animated_subtitle(text, duration, intensity):
 
     base_size = 40 + int(intensity*20)
 
-    subtitle = TextClip(
+    # Shared Pillow sprite atlas instead of one ImageMagick call per scene
+    subtitle = TEXT_ATLAS.clip(
         text[:80],
-        fontsize=base_size,
-        color='white'
+        replace(SUBTITLE_STYLE, font_size=base_size)
     )
 
     subtitle = subtitle.set_position(
@@ -2042,10 +1954,16 @@ Rules:
 # ================= MAIN =================
 
 def run():
+    with TRACER.run("trend_uploader"):
+        _run()
+
+
+def _run():
 
     memory = load_memory()
 
-    trends = discover_trends()
+    with TRACER.span("discover_trends", "api"):
+        trends = discover_trends()
 
     # Limit velocity scoring to first 5 only
     limited_trends = trends[:5]
@@ -2055,7 +1973,8 @@ def run():
     topic = sorted(scored, key=lambda x:x[1], reverse=True)[0][0]
     # ================= THUMBNAIL BANDIT SETUP =================
 
-    thumbnail_variants = generate_thumbnail_variants(topic)
+    with TRACER.span("thumbnail_variants", "media"):
+        thumbnail_variants = generate_thumbnail_variants(topic)
 
     initialize_bandit(memory)
 
@@ -2075,7 +1994,8 @@ def run():
         hooks = generate_hook_variants(topic)
         best_hook = random.choice(hooks)
 
-    scenes = generate_script(topic, memory)
+    with TRACER.span("generate_script", "llm"):
+        scenes = generate_script(topic, memory)
     scenes = optimize_script_for_retention(scenes, memory)
     scenes = track_open_loops(scenes)
     
@@ -2102,15 +2022,20 @@ def run():
     ssml_script = build_ssml_script(scenes)
     ssml_script = inject_silence_before_reveal(ssml_script)
 
-    narration = generate_narration(ssml_script)
-    narration = master_audio(narration)
+    with TRACER.span("narration", "tts"):
+        narration = generate_narration(ssml_script)
+
+    with TRACER.span("master_audio", "audio"):
+        narration = master_audio(narration)
 
-    video = enterprise_compose_video(scenes, narration)
+    with TRACER.span("compose_video", "render"):
+        video = enterprise_compose_video(scenes, narration)
 
     title = generate_title(topic)
     description = f"Full breakdown of {topic}. Future impact, hidden forces, and what it means for you."
 
-    video_id = upload_to_youtube(video, title, description, chosen_thumb)
+    with TRACER.span("youtube_upload", "upload"):
+        video_id = upload_to_youtube(video, title, description, chosen_thumb)
 
     log.info("VIDEO UPLOADED")
     
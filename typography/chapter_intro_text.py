@@ -3,25 +3,35 @@ chapter_intro_text.py
 Large cinematic chapter break typography.
 """
 
-from moviepy.editor import TextClip
+from dataclasses import replace
+
+import numpy as np
+
+from typography.text_rasterizer import TEXT_ATLAS
+from typography.text_style_registry import TextStyleRegistry
 
 
 class ChapterIntroText:
 
+    MAX_SCALE = 1.2
+
+    def __init__(self, scale: float = 1.0):
+        self.scale = scale
+        # Sizes the TextClip builder always used; the registry entry is smaller
+        self.style = replace(TextStyleRegistry().get("chapter_intro"), font_size=140)
+
+    def motion(self, t, duration):
+        scale = np.where(t < 1, 1.2 - 0.2 * t, 1.0)
+        return scale, 0.0, 0.0, 0.0
+
     def build(self, chapter_title: str, duration: float):
 
-        clip = TextClip(
+        clip = TEXT_ATLAS.animated_clip(
             chapter_title.upper(),
-            font="Montserrat-ExtraBold",
-            fontsize=140,
-            color="#00FFC6",
-            stroke_color="black",
-            stroke_width=4
-        ).set_duration(duration)
-
-        def fade_scale(t):
-            if t < 1:
-                return 1.2 - 0.2 * t
-            return 1.0
-
-        return clip.resize(lambda t: fade_scale(t)).set_position("center")
+            self.style,
+            self,
+            duration,
+            scale=self.scale
+        )
+
+        return clip.set_position("center")
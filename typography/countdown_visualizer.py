@@ -3,29 +3,39 @@ countdown_visualizer.py
 High tension countdown animation.
 """
 
-from moviepy.editor import TextClip, CompositeVideoClip
+from dataclasses import replace
+
+from moviepy.editor import CompositeVideoClip
+
+from typography.text_rasterizer import TEXT_ATLAS
+from typography.text_style_registry import TextStyleRegistry
 
 
 class CountdownVisualizer:
 
+    MAX_SCALE = 1.3
+
+    def __init__(self, scale: float = 1.0):
+        self.scale = scale
+        # Sizes the TextClip builder always used; the registry entry is smaller
+        self.style = replace(TextStyleRegistry().get("countdown"), font_size=180, stroke_width=6)
+
+    def motion(self, t, duration):
+        return 1 + 0.3 * t, 0.0, 0.0, 0.0
+
     def build(self, seconds: int):
 
         clips = []
 
         for i in range(seconds, 0, -1):
-            clip = TextClip(
+            clip = TEXT_ATLAS.animated_clip(
                 str(i),
-                font="Montserrat-Black",
-                fontsize=180,
-                color="#FF0055",
-                stroke_color="black",
-                stroke_width=6
-            ).set_duration(1)
-
-            def pulse(t):
-                return 1 + 0.3 * t
+                self.style,
+                self,
+                1,
+                scale=self.scale
+            )
 
-            clip = clip.resize(lambda t: pulse(t))
             clip = clip.set_position("center")
             clip = clip.set_start(seconds - i)
 
@@ -3,15 +3,17 @@ kinetic_text.py
 Word-by-word animated typography engine.
 """
 
-from moviepy.editor import TextClip, CompositeVideoClip
+from moviepy.editor import CompositeVideoClip
 from typography.rhythm_sync import RhythmSync
 from typography.shock_word_highlighter import ShockWordHighlighter
+from typography.text_rasterizer import TEXT_ATLAS
 from typography.text_style_registry import TextStyleRegistry
 
 
 class KineticText:
 
-    def __init__(self):
+    def __init__(self, scale: float = 1.0):
+        self.scale = scale
         self.rhythm = RhythmSync()
         self.highlighter = ShockWordHighlighter()
         self.styles = TextStyleRegistry()
@@ -30,16 +32,12 @@ class KineticText:
             word_duration = duration - start_time
 
             if word in highlight_words:
-                clip = self.highlighter.build_clip(word, style, word_duration)
+                clip = self.highlighter.build_clip(
+                    word, style, word_duration, scale=self.scale
+                )
             else:
-                clip = TextClip(
-                    word,
-                    font=style.font,
-                    fontsize=style.font_size,
-                    color=style.color,
-                    stroke_color=style.stroke_color,
-                    stroke_width=style.stroke_width
-                ).set_duration(word_duration)
+                clip = TEXT_ATLAS.clip(word, style, self.scale)
+                clip = clip.set_duration(word_duration)
 
             clip = clip.set_start(start_time)
             clip = clip.set_position(("center", "center"))
@@ -3,28 +3,20 @@ shock_word_highlighter.py
 Applies dynamic scale & color pulse to key words.
 """
 
-from moviepy.editor import TextClip
 import numpy as np
 
+from typography.text_rasterizer import TEXT_ATLAS
 
-class ShockWordHighlighter:
 
-    def build_clip(self, word, style, duration):
+class ShockWordHighlighter:
 
-        base_clip = TextClip(
-            word,
-            font=style.font,
-            fontsize=style.font_size,
-            color=style.color,
-            stroke_color=style.stroke_color,
-            stroke_width=style.stroke_width
-        ).set_duration(duration)
+    MAX_SCALE = 1.48
 
-        def scale(t):
-            if t < 0.4:
-                return 1 + (0.4 - t) * 1.2
-            return 1.0
+    def motion(self, t, duration):
+        scale = np.where(t < 0.4, 1 + (0.4 - t) * 1.2, 1.0)
+        return scale, 0.0, 0.0, 0.0
 
-        animated = base_clip.resize(lambda t: scale(t))
+    def build_clip(self, word, style, duration, scale=1.0):
 
-        return animated
+        # Sprite comes from the shared atlas; the pop is a warp of it
+        return TEXT_ATLAS.animated_clip(word, style, self, duration, scale=scale)
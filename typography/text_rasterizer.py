@@ -0,0 +1,198 @@
+"""
+text_rasterizer.py
+Pillow text rasterizer with a process-wide word-sprite atlas.
+
+Each distinct (text, style, scale) is rasterized once, stored with
+premultiplied alpha in a byte-bounded LRU, and blitted from there.
+Replaces the ImageMagick subprocess behind every moviepy TextClip.
+"""
+
+from collections import OrderedDict
+from dataclasses import astuple
+from functools import lru_cache
+from pathlib import Path
+import math
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+FONT_DIRS = [Path("assets/fonts"), Path("assets/fonts/static")]
+FALLBACK_FONTS = ["DejaVuSans-Bold.ttf", "DejaVuSans.ttf"]
+
+# ImageMagick face names and the files that provide them; "Courier" is
+# moviepy's TextClip default
+FONT_ALIASES = {
+    "Courier": [
+        "NimbusMonoPS-Regular.otf", "NimbusMonoPS-Regular.t1", "n022003l.pfb",
+        "cour.ttf", "Courier New.ttf", "LiberationMono-Regular.ttf",
+        "DejaVuSansMono.ttf",
+    ],
+}
+
+
+@lru_cache(maxsize=64)
+def load_font(name: str, size: int):
+    """
+    Resolves ImageMagick-style names ("Montserrat-Bold") to a TrueType face.
+    """
+    candidates = []
+    for directory in FONT_DIRS:
+        candidates += [directory / f"{name}.ttf", directory / f"{name}.otf"]
+    candidates += [f"{name}.ttf", f"{name}.otf", name]
+    candidates += FONT_ALIASES.get(name, []) + FALLBACK_FONTS
+
+    for candidate in candidates:
+        try:
+            return ImageFont.truetype(str(candidate), size)
+        except OSError:
+            continue
+
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+class Sprite:
+
+    def __init__(self, rgb: np.ndarray, alpha: np.ndarray):
+        self.rgb = rgb          # premultiplied, uint8
+        self.alpha = alpha      # uint8
+        self._alpha_f = None
+        self._straight = None
+
+    @property
+    def size(self):
+        return (self.alpha.shape[1], self.alpha.shape[0])
+
+    @property
+    def nbytes(self) -> int:
+        return self.rgb.nbytes + self.alpha.nbytes
+
+    def alpha_f(self) -> np.ndarray:
+        if self._alpha_f is None:
+            self._alpha_f = self.alpha.astype(np.float32) / 255.0
+        return self._alpha_f
+
+    def straight_rgba(self) -> np.ndarray:
+        """
+        Un-premultiplied RGBA for consumers that blend straight alpha
+        (moviepy masks, warps).
+        """
+        if self._straight is None:
+            a = np.maximum(self.alpha, 1).astype(np.float32)[..., None]
+            rgb = np.clip(self.rgb * (255.0 / a), 0, 255).astype(np.uint8)
+            self._straight = np.dstack([rgb, self.alpha])
+        return self._straight
+
+
+class TextRasterizer:
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._sprites = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        return {
+            "sprites": len(self._sprites),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def sprite(self, text: str, style, scale: float = 1.0) -> Sprite:
+
+        key = (text, astuple(style), round(scale, 4))
+
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        sprite = self._rasterize(text, style, scale)
+
+        self._sprites[key] = sprite
+        self._bytes += sprite.nbytes
+
+        while self._bytes > self.max_bytes and len(self._sprites) > 1:
+            _, evicted = self._sprites.popitem(last=False)
+            self._bytes -= evicted.nbytes
+
+        return sprite
+
+    def _rasterize(self, text, style, scale) -> Sprite:
+
+        font = load_font(style.font, max(1, int(round(style.font_size * scale))))
+        stroke = int(math.ceil(style.stroke_width * scale)) if style.stroke_color else 0
+
+        left, top, right, bottom = font.getbbox(text, stroke_width=stroke)
+        size = (max(1, right - left), max(1, bottom - top))
+
+        image = Image.new("RGBA", size, (0, 0, 0, 0))
+        ImageDraw.Draw(image).text(
+            (-left, -top),
+            text,
+            font=font,
+            fill=style.color,
+            stroke_width=stroke,
+            stroke_fill=style.stroke_color,
+        )
+
+        rgba = np.asarray(image.convert("RGBa"))
+        return Sprite(
+            np.ascontiguousarray(rgba[..., :3]),
+            np.ascontiguousarray(rgba[..., 3]),
+        )
+
+    # ----------------------------
+    # MOVIEPY ADAPTERS
+    # ----------------------------
+
+    def clip(self, text: str, style, scale: float = 1.0):
+        """
+        Static ImageClip with mask, drop-in for a TextClip.
+        """
+        from moviepy.editor import ImageClip
+
+        sprite = self.sprite(text, style, scale)
+        rgba = sprite.straight_rgba()
+
+        clip = ImageClip(rgba[..., :3])
+        clip.mask = ImageClip(sprite.alpha_f(), ismask=True)
+
+        # Lets the native compositor blit the premultiplied sprite directly
+        # for as long as the clip's frame function is untouched.
+        clip.sprite = (sprite, clip.make_frame)
+        clip.profile_name = "text_sprite"
+        return clip
+
+    def animated_clip(self, text, style, template, duration, scale=1.0, fps=30):
+        """
+        Warped sprite: template.motion scales it inside a fixed box sized
+        for the template's largest zoom.
+        """
+        from motion_engine.affine_warp import WARP_ENGINE, warp_clip
+
+        sprite = self.sprite(text, style, scale)
+        w, h = sprite.size
+        box = (math.ceil(w * template.MAX_SCALE), math.ceil(h * template.MAX_SCALE))
+
+        plan = WARP_ENGINE.plan(
+            sprite.straight_rgba(),
+            template,
+            duration,
+            box,
+            fps,
+            fit_size=(w, h),
+            image_key=("text", text, astuple(style), round(scale, 4)),
+        )
+
+        return warp_clip(plan, name=f"text:{type(template).__name__}")
+
+
+TEXT_ATLAS = TextRasterizer()
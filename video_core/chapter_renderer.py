@@ -0,0 +1,123 @@
+"""
+chapter_renderer.py
+Chapter-parallel native rendering.
+
+Each chapter (ChapterStructurer assigns 20 scenes per chapter) is rendered
+to its own GOP-closed segment in a process pool, on the same global frame
+grid and transition plan as a single-pass render, then stream-copied into
+the final file.
+"""
+
+import logging
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import cpu_count
+from pathlib import Path
+
+from video_core.frame_compositor import FrameCompositor
+from video_core.frame_profiler import FRAME_PROFILER
+from video_core.segment_concat import concat_segments
+from video_core.timeline_builder import TimelineBuilder
+from video_core.transition_engine import TransitionEngine
+
+logger = logging.getLogger("ChapterRenderer")
+
+
+def render_segment(task):
+    """
+    -> (segment path, frame profiler rows for the parent to merge)
+    """
+    profile, scenes, start, transitions, total, frame_range, output_path, effect_scheduler = task
+
+    with FRAME_PROFILER.collect() as stats:
+        builder = TimelineBuilder(profile, effect_scheduler=effect_scheduler)
+        schedule = builder.build_schedule(
+            scenes, start=start, transitions=transitions, total_duration=total
+        )
+        path = FrameCompositor(profile).render(schedule, output_path, frame_range=frame_range)
+
+    return path, FRAME_PROFILER.snapshot(stats)
+
+
+def group_chapters(scenes):
+    """
+    Consecutive scenes sharing a chapter label -> [(start_index, [scenes])]
+    """
+    groups = []
+
+    for idx, scene in enumerate(scenes):
+        if groups and groups[-1][1][-1].chapter == scene.chapter:
+            groups[-1][1].append(scene)
+        else:
+            groups.append((idx, [scene]))
+
+    return groups
+
+
+class ChapterRenderer:
+
+    def __init__(self, profile, workers=None, transition_engine=None, effect_scheduler=None):
+        self.profile = profile
+        self.effect_scheduler = effect_scheduler
+        self.workers = workers or max(1, cpu_count() - 1)
+        self.transition_engine = transition_engine or TransitionEngine()
+
+    def plan(self, scenes, segment_dir):
+        """
+        One task per chapter. Chapter k owns global frames
+        [first_frame(start_k), first_frame(start_k+1)) so the joined
+        segments land on exactly the single-pass frame grid. The scene
+        before a chapter rides along so a crossfade into the chapter still
+        has its outgoing side.
+        """
+        durations = [scene.duration for scene in scenes]
+        transitions = self.transition_engine.plan(durations)
+        starts, total = self.transition_engine.layout(durations, transitions)
+        starts.append(total)
+
+        tasks = []
+        groups = group_chapters(scenes)
+
+        for number, (first_idx, chapter_scenes) in enumerate(groups):
+            last_idx = first_idx + len(chapter_scenes)
+            context_idx = max(first_idx - 1, 0)
+
+            frame_range = (
+                self.profile.frame_count(starts[first_idx]),
+                self.profile.frame_count(starts[last_idx]),
+            )
+
+            tasks.append((
+                self.profile,
+                scenes[context_idx:last_idx],
+                starts[context_idx],
+                transitions[context_idx:last_idx],
+                total,
+                frame_range,
+                str(Path(segment_dir) / f"chapter_{number:03d}.mp4"),
+                self.effect_scheduler,
+            ))
+
+        return tasks
+
+    def render(self, scenes, output_path, audio_path=None):
+
+        output_path = Path(output_path)
+        segment_dir = output_path.parent / f"{output_path.stem}_segments"
+        segment_dir.mkdir(parents=True, exist_ok=True)
+
+        tasks = self.plan(scenes, segment_dir)
+        workers = min(self.workers, len(tasks)) or 1
+
+        logger.info(f"Rendering {len(tasks)} chapters on {workers} workers")
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            segments = []
+            for segment, stats in pool.map(render_segment, tasks):
+                segments.append(segment)
+                FRAME_PROFILER.merge(stats)
+
+        concat_segments(segments, output_path, audio_path, self.profile.audio_codec)
+        shutil.rmtree(segment_dir, ignore_errors=True)
+
+        return output_path
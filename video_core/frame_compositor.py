@@ -0,0 +1,175 @@
+"""
+frame_compositor.py
+Native render path: composites each frame of a LayerSchedule once into a
+preallocated uint8 buffer and streams raw RGB straight into ffmpeg stdin.
+"""
+
+import logging
+import subprocess
+
+import numpy as np
+
+from motion_engine.affine_warp import center_zoom
+from video_core.frame_filters import apply_filters, crossfade, fade
+from video_core.render_profile import FINAL_PROFILE
+from video_core.transition_engine import zoom_flash_scale
+
+try:
+    from imageio_ffmpeg import get_ffmpeg_exe
+except Exception:
+    get_ffmpeg_exe = None
+
+logger = logging.getLogger("FrameCompositor")
+
+
+def ffmpeg_binary() -> str:
+    return get_ffmpeg_exe() if get_ffmpeg_exe else "ffmpeg"
+
+
+def blit(canvas, scratch, rgb, alpha, x, y, premultiplied=False):
+    """
+    Alpha-blends `rgb` onto `canvas` at (x, y), clipped to the canvas.
+    """
+    canvas_h, canvas_w = canvas.shape[:2]
+    h, w = rgb.shape[:2]
+
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + w, canvas_w), min(y + h, canvas_h)
+
+    if x1 <= x0 or y1 <= y0:
+        return
+
+    src = rgb[y0 - y:y1 - y, x0 - x:x1 - x, :3]
+    dst = canvas[y0:y1, x0:x1]
+
+    if alpha is None:
+        dst[...] = src
+        return
+
+    a = alpha[y0 - y:y1 - y, x0 - x:x1 - x, None]
+    work = scratch[y0:y1, x0:x1]
+
+    if premultiplied:
+        # src + dst * (1 - a)
+        np.multiply(dst, 1.0 - a, out=work)
+        work += src
+        dst[...] = work
+        return
+
+    # dst + a * (src - dst), truncated like moviepy's astype("uint8")
+    np.subtract(src, dst, out=work, dtype=np.float32)
+    work *= a
+    work += dst
+    dst[...] = work
+
+
+class FrameCompositor:
+
+    def __init__(self, profile=FINAL_PROFILE):
+        self.profile = profile
+        self.canvas = np.zeros((profile.height, profile.width, 3), dtype=np.uint8)
+        self.scratch = np.zeros((profile.height, profile.width, 3), dtype=np.float32)
+        self.overlay = None
+
+    # ----------------------------
+    # FRAME ASSEMBLY
+    # ----------------------------
+
+    def composite(self, schedule, t):
+        """
+        Writes the frame at timeline time `t` into the shared canvas.
+        Overlapping slots are drawn into a second buffer and crossfaded in;
+        every other frame is a single pass.
+        """
+        canvas = self.canvas
+        canvas.fill(0)
+
+        for order, slot in enumerate(schedule.active(t)):
+            local_t = t - slot.start
+
+            if order == 0:
+                self._draw_slot(slot, local_t, canvas)
+                fade(canvas, self.scratch, slot.fade_factor(local_t))
+                continue
+
+            if self.overlay is None:
+                self.overlay = np.zeros_like(canvas)
+
+            self.overlay.fill(0)
+            self._draw_slot(slot, local_t, self.overlay)
+            crossfade(canvas, self.scratch, self.overlay, slot.fade_factor(local_t))
+
+        if schedule.effects is not None:
+            schedule.effects.apply_frame(canvas, t, self.scratch)
+
+        return canvas
+
+    def _draw_slot(self, slot, local_t, target):
+
+        for layer in slot.layers:
+            if not layer.is_active(local_t):
+                continue
+
+            rgb = layer.frame(local_t)
+            alpha = layer.mask(local_t) if layer.mask else None
+            x, y = layer.position(local_t, rgb.shape[1], rgb.shape[0])
+
+            blit(target, self.scratch, rgb, alpha, x, y, layer.premultiplied)
+
+        if slot.filters:
+            apply_filters(target, self.scratch, slot.filters)
+
+        if slot.zoom_flash:
+            target[...] = center_zoom(target, zoom_flash_scale(local_t))
+
+    # ----------------------------
+    # FFMPEG STREAM
+    # ----------------------------
+
+    def _ffmpeg_command(self, output_path, audio_path=None):
+        profile = self.profile
+
+        command = [
+            ffmpeg_binary(), "-y",
+            "-loglevel", "error",
+            "-f", "rawvideo",
+            "-vcodec", "rawvideo",
+            "-s", f"{profile.width}x{profile.height}",
+            "-pix_fmt", "rgb24",
+            "-r", str(profile.fps),
+            "-i", "-",
+        ]
+
+        if audio_path:
+            command += ["-i", str(audio_path), "-c:a", profile.audio_codec, "-shortest"]
+        else:
+            command += ["-an"]
+
+        return command + profile.ffmpeg_output_args() + [str(output_path)]
+
+    def render(self, schedule, output_path, audio_path=None, frame_range=None):
+        """
+        frame_range: optional (first, last) global frame indices to render,
+        used when the timeline is split into independently encoded segments.
+        """
+        fps = self.profile.fps
+        first, last = frame_range or (0, self.profile.frame_count(schedule.duration))
+
+        process = subprocess.Popen(
+            self._ffmpeg_command(output_path, audio_path),
+            stdin=subprocess.PIPE,
+        )
+
+        try:
+            for n in range(first, last):
+                frame = self.composite(schedule, n / fps)
+                process.stdin.write(frame.data)
+        finally:
+            process.stdin.close()
+            code = process.wait()
+
+        if code != 0:
+            raise RuntimeError(f"ffmpeg exited with status {code} for {output_path}")
+
+        logger.info(f"Streamed {last - first} frames -> {output_path}")
+        return output_path
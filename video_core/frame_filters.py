@@ -0,0 +1,62 @@
+"""
+frame_filters.py
+In-place NumPy equivalents of the moviepy vfx used by the retention stack.
+"""
+
+import numpy as np
+
+
+def colorx(frame: np.ndarray, scratch: np.ndarray, factor: float):
+    """
+    vfx.colorx: min(255, factor * frame)
+    """
+    np.multiply(frame, factor, out=scratch)
+    np.minimum(scratch, 255, out=scratch)
+    frame[...] = scratch
+
+
+def lum_contrast(frame: np.ndarray, scratch: np.ndarray, lum=0, contrast=0, contrast_thr=127):
+    """
+    vfx.lum_contrast: frame + lum + contrast * (frame - thr), clipped to [0, 255]
+    """
+    np.multiply(frame, 1.0 + contrast, out=scratch)
+    scratch += lum - contrast * float(contrast_thr)
+    np.clip(scratch, 0, 255, out=scratch)
+    frame[...] = scratch
+
+
+def fade(frame: np.ndarray, scratch: np.ndarray, factor: float):
+    """
+    Fade against the black canvas.
+    """
+    if factor >= 1.0:
+        return
+    np.multiply(frame, factor, out=scratch)
+    frame[...] = scratch
+
+
+def crossfade(frame: np.ndarray, scratch: np.ndarray, overlay: np.ndarray, weight: float):
+    """
+    Blends an incoming slot over the frame: frame + w * (overlay - frame)
+    """
+    if weight <= 0.0:
+        return
+    if weight >= 1.0:
+        frame[...] = overlay
+        return
+    np.subtract(overlay, frame, out=scratch, dtype=np.float32)
+    scratch *= weight
+    scratch += frame
+    frame[...] = scratch
+
+
+FILTERS = {
+    "colorx": colorx,
+    "lum_contrast": lum_contrast,
+    "fade": fade,
+}
+
+
+def apply_filters(frame: np.ndarray, scratch: np.ndarray, filters):
+    for name, *params in filters:
+        FILTERS[name](frame, scratch, *params)
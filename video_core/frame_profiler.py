@@ -0,0 +1,228 @@
+"""
+frame_profiler.py
+Opt-in per-layer frame-fetch profiler for scene clip trees.
+
+Enable with FRAME_PROFILER=1 (or FRAME_PROFILER.enable()). Every layer's
+frame function is wrapped to count calls, accumulate inclusive and self
+time (time spent in child layers is subtracted) and count redundant
+re-evaluations of the same t, keyed by scene and layer path. Disabled, the
+builders pay nothing: no clip is wrapped.
+
+Render worker processes collect per task and return a snapshot that the
+parent merges, so chapter and incremental renders report every layer.
+"""
+
+from collections import defaultdict
+from contextlib import contextmanager
+import json
+import os
+import threading
+import time
+
+
+def layer_name(clip) -> str:
+    """
+    Builders tag clips with `profile_name`; otherwise the clip type.
+    """
+    return getattr(clip, "profile_name", None) or type(clip).__name__
+
+
+class LayerStats:
+
+    __slots__ = ("calls", "total", "self_time", "redundant", "last_t")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.self_time = 0.0
+        self.redundant = 0
+        self.last_t = None
+
+
+class FrameProfiler:
+
+    def __init__(self, enabled=None):
+        if enabled is None:
+            enabled = os.environ.get("FRAME_PROFILER", "") not in ("", "0")
+        self.enabled = enabled
+        self.stats = defaultdict(LayerStats)
+        self._local = threading.local()
+
+    def enable(self):
+        self.enabled = True
+        # Render worker processes started from here on profile too
+        os.environ["FRAME_PROFILER"] = "1"
+
+    def reset(self):
+        self.stats.clear()
+
+    # ----------------------------
+    # WORKER STATS
+    # ----------------------------
+
+    @contextmanager
+    def collect(self):
+        """
+        Records into fresh stats for the duration of the block (one render
+        task); yields them for snapshot().
+        """
+        outer, self.stats = self.stats, defaultdict(LayerStats)
+        try:
+            yield self.stats
+        finally:
+            self.stats = outer
+
+    def snapshot(self, stats=None) -> list:
+        """
+        Picklable rows: [(scene, layer, calls, total, self_time, redundant)]
+        """
+        stats = self.stats if stats is None else stats
+        return [
+            (scene, layer, s.calls, s.total, s.self_time, s.redundant)
+            for (scene, layer), s in stats.items()
+            if s.calls
+        ]
+
+    def merge(self, rows):
+        for scene, layer, calls, total, self_time, redundant in rows or []:
+            stats = self.stats[(scene, layer)]
+            stats.calls += calls
+            stats.total += total
+            stats.self_time += self_time
+            stats.redundant += redundant
+
+    # ----------------------------
+    # WRAPPING
+    # ----------------------------
+
+    def wrap(self, fn, scene, layer):
+        """
+        Returns `fn` timed under (scene, layer).
+        """
+        stats = self.stats[(scene, layer)]
+        local = self._local
+
+        def profiled(t, *args, **kwargs):
+            stack = getattr(local, "stack", None)
+            if stack is None:
+                stack = local.stack = []
+
+            if stats.last_t is not None and t == stats.last_t:
+                stats.redundant += 1
+            stats.last_t = t
+
+            stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                return fn(t, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                children = stack.pop()
+                stats.calls += 1
+                stats.total += elapsed
+                stats.self_time += elapsed - children
+                if stack:
+                    stack[-1] += elapsed
+
+        return profiled
+
+    def instrument(self, clip, scene, path=None):
+        """
+        moviepy path: wraps make_frame of every clip in the tree (and its
+        mask) in place. Returns the clip.
+        """
+        if not self.enabled:
+            return clip
+
+        path = f"{path}/{layer_name(clip)}" if path else layer_name(clip)
+
+        for child in getattr(clip, "clips", None) or []:
+            self.instrument(child, scene, path)
+
+        sprite_tag = getattr(clip, "sprite", None)
+        wrapped = self.wrap(clip.make_frame, scene, path)
+
+        if sprite_tag is not None and sprite_tag[1] is clip.make_frame:
+            # Keep the native compositor's premultiplied fast path valid
+            clip.sprite = (sprite_tag[0], wrapped)
+
+        clip.make_frame = wrapped
+
+        if getattr(clip, "mask", None) is not None:
+            clip.mask.make_frame = self.wrap(clip.mask.make_frame, scene, f"{path}/mask")
+
+        return clip
+
+    def instrument_layers(self, layers, scene):
+        """
+        Native path: wraps the flattened Layer frame/mask functions.
+        """
+        if not self.enabled:
+            return layers
+
+        for layer in layers:
+            layer.frame = self.wrap(layer.frame, scene, layer.name)
+            if layer.mask is not None:
+                layer.mask = self.wrap(layer.mask, scene, f"{layer.name}/mask")
+
+        return layers
+
+    # ----------------------------
+    # REPORT
+    # ----------------------------
+
+    def report(self, top=None):
+        rows = [
+            {
+                "scene": scene,
+                "layer": layer,
+                "calls": s.calls,
+                "self_ms": round(s.self_time * 1000, 3),
+                "total_ms": round(s.total * 1000, 3),
+                "ms_per_call": round(s.total * 1000 / s.calls, 3) if s.calls else 0.0,
+                "redundant": s.redundant,
+            }
+            for (scene, layer), s in self.stats.items()
+            if s.calls
+        ]
+        rows.sort(key=lambda row: row["self_ms"], reverse=True)
+        return rows[:top] if top else rows
+
+    def by_layer(self):
+        """
+        Hot spots across the scene mix: self time summed per layer path.
+        """
+        totals = defaultdict(lambda: {"calls": 0, "self_ms": 0.0, "redundant": 0, "scenes": 0})
+
+        for row in self.report():
+            entry = totals[row["layer"]]
+            entry["calls"] += row["calls"]
+            entry["self_ms"] += row["self_ms"]
+            entry["redundant"] += row["redundant"]
+            entry["scenes"] += 1
+
+        return sorted(
+            ({"layer": layer, **entry} for layer, entry in totals.items()),
+            key=lambda row: row["self_ms"],
+            reverse=True,
+        )
+
+    def format_report(self, top=25):
+        lines = [
+            f"{'scene':<28} {'layer':<44} {'calls':>7} {'self ms':>10} {'ms/call':>8} {'redundant':>9}"
+        ]
+        for row in self.report(top):
+            lines.append(
+                f"{row['scene'][:28]:<28} {row['layer'][:44]:<44} {row['calls']:>7} "
+                f"{row['self_ms']:>10.1f} {row['ms_per_call']:>8.2f} {row['redundant']:>9}"
+            )
+        return "\n".join(lines)
+
+    def dump(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"scenes": self.report(), "layers": self.by_layer()}, f, indent=2)
+        return path
+
+
+FRAME_PROFILER = FrameProfiler()
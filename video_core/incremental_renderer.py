@@ -0,0 +1,147 @@
+"""
+incremental_renderer.py
+Per-scene segment rendering backed by the SegmentCache.
+
+Every scene owns global frames [first_frame(start_i), first_frame(start_i+1))
+of the single-pass frame grid and is encoded to its own GOP-closed segment.
+A re-run re-encodes only scenes whose key changed and stream-copies the
+rest into the final file.
+"""
+
+import logging
+import random
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import cpu_count
+from pathlib import Path
+
+from image_engine.visual_decision_engine import VisualDecisionEngine
+from video_core.chapter_renderer import render_segment
+from video_core.frame_profiler import FRAME_PROFILER
+from video_core.segment_cache import SegmentCache, segment_key, scene_fingerprint
+from video_core.segment_concat import concat_segments
+from video_core.transition_engine import TransitionEngine
+
+logger = logging.getLogger("IncrementalRenderer")
+
+
+class IncrementalRenderer:
+
+    def __init__(
+        self,
+        profile,
+        cache=None,
+        workers=None,
+        transition_engine=None,
+        effect_scheduler=None
+    ):
+        self.profile = profile
+        self.cache = cache or SegmentCache()
+        self.workers = workers or max(1, cpu_count() - 1)
+        # Seeded so an unchanged plan draws the same transitions every run.
+        self.transition_engine = transition_engine or TransitionEngine(rng=random.Random(0))
+        self.effect_scheduler = effect_scheduler
+        self.visual_engine = VisualDecisionEngine()
+
+    def _assets(self, scene):
+        return [str(self.visual_engine.resolve(scene))]
+
+    def plan(self, scenes):
+        """
+        -> [(key, task)] in timeline order. The key covers the scene, its
+        assets, the incoming transition (and the outgoing scene it blends
+        with), the window's frame count and sub-frame phase, and any
+        timeline-wide effects that land inside the window.
+        """
+        fps = self.profile.fps
+        durations = [scene.duration for scene in scenes]
+        transitions = self.transition_engine.plan(durations)
+        starts, total = self.transition_engine.layout(durations, transitions)
+        starts.append(total)
+
+        effects = self.effect_scheduler.build(total) if self.effect_scheduler else None
+        assets = [self._assets(scene) for scene in scenes]
+
+        planned = []
+
+        for idx, scene in enumerate(scenes):
+            start, end = starts[idx], starts[idx + 1]
+            first = self.profile.frame_count(start)
+            last = self.profile.frame_count(end)
+
+            transition = transitions[idx]
+            context_idx = idx - 1 if idx and transition.overlap else idx
+
+            context = {
+                "transition": [transition.style, round(transition.overlap, 6)],
+                "frames": last - first,
+                "phase": round(first / fps - start, 6),
+            }
+
+            if context_idx != idx:
+                context["previous"] = {
+                    "scene": scene_fingerprint(scenes[context_idx]),
+                    "assets": assets[context_idx],
+                    "transition": [transitions[context_idx].style],
+                    "offset": round(start - starts[context_idx], 6),
+                }
+
+            if effects is not None:
+                context["effects"] = [
+                    [event.effect, round(event.start - start, 6), round(event.end - start, 6), list(event.params)]
+                    for event in effects.window(start, end)
+                ]
+
+            key = segment_key(scene, self.profile, assets[idx], context)
+
+            task = (
+                self.profile,
+                scenes[context_idx:idx + 1],
+                starts[context_idx],
+                transitions[context_idx:idx + 1],
+                total,
+                (first, last),
+                None,
+                self.effect_scheduler,
+            )
+            planned.append((key, task))
+
+        return planned
+
+    def render(self, scenes, output_path, audio_path=None):
+
+        output_path = Path(output_path)
+        planned = self.plan(scenes)
+
+        segments = [self.cache.get(key) for key, _ in planned]
+        misses = [idx for idx, path in enumerate(segments) if path is None]
+
+        logger.info(
+            f"{len(planned) - len(misses)}/{len(planned)} scene segments cached, "
+            f"rendering {len(misses)}"
+        )
+
+        if misses:
+            work_dir = Path(tempfile.mkdtemp(dir=self.cache.root))
+            tasks = []
+
+            for idx in misses:
+                key, task = planned[idx]
+                tasks.append(task[:6] + (str(work_dir / f"{key}.mp4"),) + task[7:])
+
+            workers = min(self.workers, len(tasks)) or 1
+            pinned = {key for key, _ in planned}
+
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    for idx, (rendered, stats) in zip(misses, pool.map(render_segment, tasks)):
+                        segments[idx] = self.cache.put(planned[idx][0], rendered, pinned)
+                        FRAME_PROFILER.merge(stats)
+            finally:
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+        concat_segments(segments, output_path, audio_path, self.profile.audio_codec)
+
+        logger.info(f"Segment cache: {self.cache.stats()}")
+        return output_path
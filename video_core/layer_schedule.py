@@ -0,0 +1,324 @@
+"""
+layer_schedule.py
+Flat, time-indexed layer schedule compiled from composed scene clips.
+
+Every scene becomes one SceneSlot holding its leaf layers with absolute
+(slot-relative) windows and resolved positions, so a frame is produced by
+walking a short list instead of pulling through nested composites.
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+from video_core.frame_profiler import FRAME_PROFILER, layer_name
+
+
+POSITION_KEYWORDS = {
+    "center": ("center", "center"),
+    "left": ("left", "center"),
+    "right": ("right", "center"),
+    "top": ("center", "top"),
+    "bottom": ("center", "bottom"),
+}
+
+
+@dataclass
+class Layer:
+    start: float
+    end: float
+    frame: Callable[[float], "object"]
+    mask: Optional[Callable[[float], "object"]]
+    position: Callable[[float, int, int], Tuple[int, int]]
+    premultiplied: bool = False
+    name: str = ""
+
+    def is_active(self, t: float) -> bool:
+        return self.start <= t < self.end
+
+
+@dataclass(eq=False)
+class SceneSlot:
+    start: float
+    end: float
+    layers: List[Layer] = field(default_factory=list)
+    filters: List[tuple] = field(default_factory=list)
+    fade_in: float = 0.0
+    fade_out: float = 0.0
+    zoom_flash: bool = False
+    factory: Optional[Callable[[], List[Layer]]] = None
+    on_release: Optional[Callable[[], None]] = None
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    @property
+    def is_lazy(self) -> bool:
+        return self.factory is not None
+
+    def materialize(self):
+        if self.factory is not None and not self.layers:
+            self.layers = self.factory()
+
+    def release(self):
+        """
+        Drops a lazy slot's layers (and the clips they close over).
+        """
+        if self.factory is None:
+            return
+        self.layers = []
+        if self.on_release is not None:
+            self.on_release()
+
+    def fade_factor(self, local_t: float) -> float:
+        factor = 1.0
+        if self.fade_in > 0 and local_t < self.fade_in:
+            factor = local_t / self.fade_in
+        remaining = self.duration - local_t
+        if self.fade_out > 0 and remaining < self.fade_out:
+            factor = min(factor, remaining / self.fade_out)
+        return max(0.0, factor)
+
+
+def resolve_position(pos, relative, size, box) -> Tuple[int, int]:
+    """
+    Mirrors moviepy's blit_on position rules inside a container box.
+    """
+    w, h = size
+    box_w, box_h = box
+
+    if isinstance(pos, str):
+        pos = POSITION_KEYWORDS[pos]
+
+    x, y = pos
+
+    if relative:
+        x, y = x * box_w, y * box_h
+
+    if isinstance(x, str):
+        x = {"center": (box_w - w) / 2, "left": 0, "right": box_w - w}[x]
+    if isinstance(y, str):
+        y = {"center": (box_h - h) / 2, "top": 0, "bottom": box_h - h}[y]
+
+    return int(x), int(y)
+
+
+def _is_composite(clip) -> bool:
+    return hasattr(clip, "clips") and hasattr(clip, "bg")
+
+
+def flatten_clip(clip, offset, window_end, origin, box, out, pos=None, path=""):
+    """
+    Appends the leaf layers of a (possibly nested) moviepy clip to `out`.
+
+    offset: slot time at which `clip` starts
+    origin: slot time -> top-left of the containing box on the canvas
+    box: size of the containing box
+    pos: optional override for the clip's own position function
+    path: layer path of the container, for the frame profiler
+
+    Composites are flattened only while untransformed: fx applied to a
+    CompositeVideoClip replace its make_frame, so apply those as slot
+    filters instead.
+    """
+    end = window_end if clip.duration is None else min(offset + clip.duration, window_end)
+    if end <= offset:
+        return
+
+    clip_pos = pos or clip.pos
+    path = f"{path}/{layer_name(clip)}" if path else layer_name(clip)
+    relative = getattr(clip, "relative_pos", False)
+
+    def place(t, w, h):
+        ox, oy = origin(t)
+        x, y = resolve_position(clip_pos(t - offset), relative, (w, h), box)
+        return ox + x, oy + y
+
+    if _is_composite(clip):
+        inner_w, inner_h = clip.size
+
+        def inner_origin(t):
+            return place(t, inner_w, inner_h)
+
+        for child in clip.clips:
+            flatten_clip(
+                child,
+                offset + child.start,
+                end,
+                inner_origin,
+                clip.size,
+                out,
+                path=path,
+            )
+        return
+
+    sprite_tag = getattr(clip, "sprite", None)
+    if sprite_tag is not None and sprite_tag[1] is clip.make_frame:
+        sprite = sprite_tag[0]
+        out.append(Layer(
+            start=offset,
+            end=end,
+            frame=lambda t: sprite.rgb,
+            mask=lambda t: sprite.alpha_f(),
+            position=place,
+            premultiplied=True,
+            name=path,
+        ))
+        return
+
+    def frame(t):
+        return clip.get_frame(t - offset)
+
+    def mask(t):
+        return clip.mask.get_frame(t - offset)
+
+    out.append(Layer(
+        start=offset,
+        end=end,
+        frame=frame,
+        mask=mask if clip.mask is not None else None,
+        position=place,
+        name=path,
+    ))
+
+
+def hold_layers(layers, end, hold):
+    """
+    Extends layers still showing at slot time `end` by `hold` seconds,
+    frozen on their frame at `end` (the outgoing side of a crossfade).
+    """
+    if hold <= 0:
+        return layers
+
+    def clamp(fn):
+        return lambda t, *args: fn(min(t, end), *args)
+
+    for layer in layers:
+        if layer.end < end - 1e-9:
+            continue
+        layer.end = end + hold
+        layer.frame = clamp(layer.frame)
+        layer.position = clamp(layer.position)
+        if layer.mask is not None:
+            layer.mask = clamp(layer.mask)
+
+    return layers
+
+
+class LayerSchedule:
+
+    def __init__(self, size, fps):
+        self.size = size
+        self.fps = fps
+        self.slots: List[SceneSlot] = []
+        self._starts: List[float] = []
+        self._max_span = 0.0
+        self._live: List[SceneSlot] = []
+        self.effects = None  # retention EffectSchedule on timeline time
+
+    @property
+    def duration(self) -> float:
+        return max((slot.end for slot in self.slots), default=0.0)
+
+    def add_slot(self, slot: SceneSlot) -> SceneSlot:
+        if self._starts and slot.start < self._starts[-1]:
+            raise ValueError("Scene slots must be added in start order.")
+
+        self.slots.append(slot)
+        self._starts.append(slot.start)
+        self._max_span = max(self._max_span, slot.duration)
+        return slot
+
+    def add_clip(
+        self, clip, start, duration, filters=None, fade_in=0.0, fade_out=0.0, zoom_flash=False,
+        label=None, hold=0.0
+    ):
+        """
+        Flattens a composed scene clip into a slot centred on the canvas,
+        matching the moviepy FlatTimeline.
+
+        fade_in blends the slot over whatever is beneath it (a crossfade
+        when it overlaps the previous slot, from black otherwise).
+        label: scene name the frame profiler reports layers under.
+        hold: seconds the last frame stays up under the next slot's fade_in.
+        """
+        slot = SceneSlot(
+            start=start,
+            end=start + duration + hold,
+            filters=list(filters or []),
+            fade_in=fade_in,
+            fade_out=fade_out,
+            zoom_flash=zoom_flash,
+        )
+
+        flatten_clip(
+            clip,
+            0.0,
+            duration,
+            lambda t: (0, 0),
+            self.size,
+            slot.layers,
+            pos=lambda t: "center",
+        )
+        hold_layers(slot.layers, duration, hold)
+        FRAME_PROFILER.instrument_layers(slot.layers, label or f"slot@{start:.2f}")
+
+        return self.add_slot(slot)
+
+    def add_lazy_clip(
+        self, clip_factory, start, duration, filters=None, fade_in=0.0, fade_out=0.0,
+        zoom_flash=False, on_release=None, label=None, hold=0.0
+    ):
+        """
+        Like add_clip, but the scene clip is only composed once its slot
+        becomes active and is dropped again when the slot ends, so only
+        the scenes under the playhead hold decoded pixels.
+        """
+        def factory():
+            layers = []
+            flatten_clip(
+                clip_factory(),
+                0.0,
+                duration,
+                lambda t: (0, 0),
+                self.size,
+                layers,
+                pos=lambda t: "center",
+            )
+            hold_layers(layers, duration, hold)
+            return FRAME_PROFILER.instrument_layers(layers, label or f"slot@{start:.2f}")
+
+        return self.add_slot(SceneSlot(
+            start=start,
+            end=start + duration + hold,
+            filters=list(filters or []),
+            fade_in=fade_in,
+            fade_out=fade_out,
+            zoom_flash=zoom_flash,
+            factory=factory,
+            on_release=on_release,
+        ))
+
+    def active(self, t: float) -> List[SceneSlot]:
+        idx = bisect_right(self._starts, t)
+        active = []
+
+        while idx > 0:
+            idx -= 1
+            slot = self.slots[idx]
+            if slot.start < t - self._max_span:
+                break
+            if slot.start <= t < slot.end:
+                active.append(slot)
+
+        active.reverse()
+
+        for slot in self._live:
+            if slot not in active:
+                slot.release()
+        for slot in active:
+            slot.materialize()
+        self._live = [slot for slot in active if slot.is_lazy]
+
+        return active
@@ -0,0 +1,38 @@
+"""
+lazy_clip.py
+Deferred scene clips for the moviepy timeline.
+"""
+
+
+class LazyClip:
+    """
+    Stands in for a composed scene clip on the FlatTimeline: duration and
+    size are known up front, the clip itself is only built when a frame is
+    requested and is dropped again by release().
+    """
+
+    audio = None
+
+    def __init__(self, factory, duration, size, on_release=None):
+        self.factory = factory
+        self.duration = duration
+        self.size = size
+        self.on_release = on_release
+        self._clip = None
+
+    @property
+    def is_materialized(self) -> bool:
+        return self._clip is not None
+
+    def get_frame(self, t):
+        if self._clip is None:
+            self._clip = self.factory()
+        return self._clip.get_frame(t)
+
+    def release(self):
+        if self._clip is None:
+            return
+        self._clip.close()
+        self._clip = None
+        if self.on_release is not None:
+            self.on_release()
@@ -3,31 +3,150 @@ render_orchestrator.py
 Enterprise render control with memory discipline.
 """
 
+import logging
 from pathlib import Path
+
 from video_core.timeline_builder import TimelineBuilder
+from video_core.frame_compositor import FrameCompositor
+from video_core.frame_profiler import FRAME_PROFILER
+from video_core.chapter_renderer import ChapterRenderer
+from video_core.incremental_renderer import IncrementalRenderer
+from video_core.render_profile import FINAL_PROFILE, get_profile
+from audio_engine.audio_layer_mixer import AudioLayerMixer
+from audio_engine.loudness import LoudnessNormalizer
+
+logger = logging.getLogger("RenderOrchestrator")
 
 
 class RenderOrchestrator:
 
-    def __init__(self, output_dir="renders"):
+    BACKENDS = ("native", "moviepy")
+
+    def __init__(
+        self,
+        output_dir="renders",
+        profile=FINAL_PROFILE,
+        backend="native",
+        chapter_parallel=False,
+        workers=None,
+        effect_scheduler=None,
+        segment_cache=None,
+        audio_backend="numpy"
+    ):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown render backend: {backend}")
+
+        if isinstance(profile, str):
+            profile = get_profile(profile)
+
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
-        self.timeline_builder = TimelineBuilder()
+        self.profile = profile
+        self.backend = backend
+        self.effect_scheduler = effect_scheduler
+        self.timeline_builder = TimelineBuilder(profile, effect_scheduler=effect_scheduler)
+        self.chapter_parallel = chapter_parallel
+        self.workers = workers
+        self.segment_cache = segment_cache
 
-    def render(self, scenes, filename="final_output.mp4"):
+        mixer_options = {}
+        if audio_backend == "numpy":
+            mixer_options = {
+                "sample_rate": profile.audio_sample_rate,
+                "normalizer": LoudnessNormalizer(),
+            }
+        self.audio_mixer = AudioLayerMixer(backend=audio_backend, **mixer_options)
 
-        final_video = self.timeline_builder.build(scenes)
+    def mix_audio(self, narration_path, music_path, sfx_events=None, filename="final_mix.wav"):
+        """
+        Narration + ducked music + SFX in one pass, loudness-normalised,
+        ready for render(audio_path=...).
+        """
+        output_path = self.output_dir / filename
+        self.audio_mixer.mix(str(narration_path), str(music_path), str(output_path), sfx_events)
+        return output_path
+
+    def render(self, scenes, filename="final_output.mp4", audio_path=None):
 
         output_path = self.output_dir / filename
 
+        if FRAME_PROFILER.enabled:
+            FRAME_PROFILER.reset()
+
+        # Decode every scene image once, before any render worker needs it
+        self.timeline_builder.composer.prepare(scenes)
+
+        result = self._render(scenes, output_path, audio_path)
+
+        if FRAME_PROFILER.enabled:
+            self._report_profile(output_path)
+
+        return result
+
+    def _render(self, scenes, output_path, audio_path=None):
+
+        if self.backend == "native":
+            try:
+                if self.segment_cache is not None:
+                    return self._render_incremental(scenes, output_path, audio_path)
+                if self.chapter_parallel:
+                    return self._render_chapters(scenes, output_path, audio_path)
+                return self._render_native(scenes, output_path, audio_path)
+            except Exception as e:
+                logger.warning(f"Native render failed, falling back to moviepy: {e}")
+
+        return self._render_moviepy(scenes, output_path, audio_path)
+
+    def _report_profile(self, output_path):
+        """
+        Hot-spot table in the log, full per-scene/per-layer JSON next to
+        the render.
+        """
+        report_path = FRAME_PROFILER.dump(
+            str(output_path.with_name(f"{output_path.stem}_frame_profile.json"))
+        )
+        logger.info(f"Frame profile ({report_path}):\n{FRAME_PROFILER.format_report()}")
+
+    def _render_native(self, scenes, output_path, audio_path=None):
+
+        schedule = self.timeline_builder.build_schedule(scenes)
+
+        FrameCompositor(self.profile).render(schedule, output_path, audio_path)
+
+        return output_path
+
+    def _render_chapters(self, scenes, output_path, audio_path=None):
+
+        renderer = ChapterRenderer(
+            self.profile,
+            workers=self.workers,
+            effect_scheduler=self.effect_scheduler
+        )
+
+        return renderer.render(scenes, output_path, audio_path)
+
+    def _render_incremental(self, scenes, output_path, audio_path=None):
+
+        renderer = IncrementalRenderer(
+            self.profile,
+            cache=self.segment_cache,
+            workers=self.workers,
+            effect_scheduler=self.effect_scheduler
+        )
+
+        return renderer.render(scenes, output_path, audio_path)
+
+    def _render_moviepy(self, scenes, output_path, audio_path=None):
+
+        final_video = self.timeline_builder.build(scenes)
+
+        if audio_path:
+            from moviepy.editor import AudioFileClip
+            final_video = final_video.set_audio(AudioFileClip(str(audio_path)))
+
         final_video.write_videofile(
             str(output_path),
-            fps=30,
-            codec="libx264",
-            audio_codec="aac",
-            threads=8,
-            preset="medium",
-            bitrate="8000k"
+            **self.profile.write_videofile_kwargs()
         )
 
         final_video.close()
@@ -0,0 +1,94 @@
+"""
+render_profile.py
+Shared canvas & encoder settings for every render path.
+"""
+
+from dataclasses import dataclass
+import math
+
+# Typography and layout are authored against a 1080p canvas
+REFERENCE_HEIGHT = 1080
+
+
+@dataclass(frozen=True)
+class RenderProfile:
+    name: str
+    width: int
+    height: int
+    fps: int
+    codec: str = "libx264"
+    audio_codec: str = "aac"
+    audio_sample_rate: int = 48000
+    preset: str = "medium"
+    bitrate: str = "8000k"
+    threads: int = 8
+    gop_seconds: float = 2.0
+
+    @property
+    def size(self):
+        return (self.width, self.height)
+
+    def frame_count(self, duration: float) -> int:
+        # Same grid as moviepy's iter_frames: np.arange(0, duration, 1 / fps)
+        return max(0, math.ceil(duration * self.fps - 1e-6))
+
+    @property
+    def text_scale(self) -> float:
+        return self.height / REFERENCE_HEIGHT
+
+    @property
+    def gop(self) -> int:
+        return max(1, int(round(self.gop_seconds * self.fps)))
+
+    def write_videofile_kwargs(self) -> dict:
+        return {
+            "fps": self.fps,
+            "codec": self.codec,
+            "audio_codec": self.audio_codec,
+            "threads": self.threads,
+            "preset": self.preset,
+            "bitrate": self.bitrate,
+            "ffmpeg_params": self.gop_args(),
+        }
+
+    def gop_args(self) -> list:
+        # Fixed, closed GOPs so independently encoded segments join cleanly
+        return [
+            "-g", str(self.gop),
+            "-keyint_min", str(self.gop),
+            "-sc_threshold", "0",
+            "-flags", "+cgop",
+        ]
+
+    def ffmpeg_output_args(self) -> list:
+        return [
+            "-c:v", self.codec,
+            "-preset", self.preset,
+            "-b:v", self.bitrate,
+            "-pix_fmt", "yuv420p",
+            "-threads", str(self.threads),
+        ] + self.gop_args()
+
+
+FINAL_PROFILE = RenderProfile(name="final", width=1920, height=1080, fps=30)
+
+# Review proxy: same scene timings, a fraction of the pixels and frames
+DRAFT_PROFILE = RenderProfile(
+    name="draft",
+    width=854,
+    height=480,
+    fps=12,
+    preset="ultrafast",
+    bitrate="1000k",
+)
+
+PROFILES = {
+    FINAL_PROFILE.name: FINAL_PROFILE,
+    DRAFT_PROFILE.name: DRAFT_PROFILE,
+}
+
+
+def get_profile(name: str) -> RenderProfile:
+    if name not in PROFILES:
+        raise ValueError(f"Unknown render profile: {name}")
+    return PROFILES[name]
@@ -8,12 +8,23 @@ from moviepy.editor import vfx
 
 class RetentionController:
 
-    def enhance(self, clip, scene):
+    def filters(self, scene):
+        """
+        Effect list shared by the moviepy and native render paths.
+        """
+        filters = []
 
         if scene.retention.pattern_interrupt:
-            clip = clip.fx(vfx.colorx, 1.2)
+            filters.append(("colorx", 1.2))
 
         if scene.retention.contrast_shift:
-            clip = clip.fx(vfx.lum_contrast, 10, 30, 128)
+            filters.append(("lum_contrast", 10, 30, 128))
+
+        return filters
+
+    def enhance(self, clip, scene):
+
+        for name, *params in self.filters(scene):
+            clip = clip.fx(getattr(vfx, name), *params)
 
         return clip
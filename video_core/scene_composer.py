@@ -8,29 +8,69 @@ from moviepy.editor import (
     AudioFileClip,
 )
 from image_engine.visual_decision_engine import VisualDecisionEngine
+from image_engine.image_ingest import ImageIngestor
 from motion_engine.motion_template_registry import MotionTemplateRegistry
 from typography.kinetic_text import KineticText
 from typography.chapter_intro_text import ChapterIntroText
 from typography.countdown_visualizer import CountdownVisualizer
+from video_core.render_profile import FINAL_PROFILE
 
 
 class SceneComposer:
 
-    def __init__(self):
+    def __init__(self, profile=FINAL_PROFILE):
+        self.profile = profile
         self.visual_engine = VisualDecisionEngine()
+        self.ingestor = ImageIngestor()
         self.motion_registry = MotionTemplateRegistry()
-        self.kinetic_text = KineticText()
-        self.chapter_text = ChapterIntroText()
-        self.countdown_visualizer = CountdownVisualizer()
+        self.kinetic_text = KineticText(scale=profile.text_scale)
+        self.chapter_text = ChapterIntroText(scale=profile.text_scale)
+        self.countdown_visualizer = CountdownVisualizer(scale=profile.text_scale)
+        # id(scene) -> (scene, ingested path); the scene is kept so its id stays unique
+        self._sources = {}
+
+    def _ingest_item(self, scene):
+        motion_template = self.motion_registry.get(scene.visual.camera_motion)
+        max_scale = getattr(motion_template, "MAX_SCALE", 1.0)
+        return self.visual_engine.resolve(scene), self.profile.size, max_scale
+
+    def prepare(self, scenes):
+        """
+        Resolves and ingests every scene image across the worker pool up
+        front, so composition only memory-maps pre-scaled pixels. Each
+        scene is resolved once per composer, however often it is prepared.
+        """
+        pending = list({id(scene): scene for scene in scenes if id(scene) not in self._sources}.values())
+
+        if pending:
+            paths = self.ingestor.ingest_many([self._ingest_item(scene) for scene in pending])
+            for scene, path in zip(pending, paths):
+                self._sources[id(scene)] = (scene, path)
+
+        return [self._sources[id(scene)][1] for scene in scenes]
+
+    def source_image(self, scene):
+        cached = self._sources.get(id(scene))
+        if cached is not None:
+            return cached[1]
+
+        path = self.ingestor.ingest(*self._ingest_item(scene))
+        self._sources[id(scene)] = (scene, path)
+        return path
 
     def compose(self, scene, narration_audio_path=None):
 
-        # 1️⃣ Resolve image
-        image_path = self.visual_engine.resolve(scene)
+        # 1️⃣ Resolve image (pre-scaled ingest)
+        image_path = self.source_image(scene)
 
         # 2️⃣ Apply motion
         motion_template = self.motion_registry.get(scene.visual.camera_motion)
-        base_clip = motion_template.apply(str(image_path), scene.duration)
+        base_clip = motion_template.apply(
+            str(image_path),
+            scene.duration,
+            size=self.profile.size,
+            fps=self.profile.fps
+        )
 
         # 3️⃣ Typography
         text_clip = self.kinetic_text.build(
@@ -38,6 +78,7 @@ class SceneComposer:
             duration=scene.duration,
             highlight_words=scene.typography.highlight_words
         )
+        text_clip.profile_name = "kinetic_text"
 
         layers = [base_clip, text_clip]
 
@@ -45,11 +86,13 @@ class SceneComposer:
         if scene.scene_type == "hook" and scene.chapter:
             chapter_clip = self.chapter_text.build(scene.chapter, 3)
             chapter_clip = chapter_clip.set_start(0)
+            chapter_clip.profile_name = "chapter_intro"
             layers.append(chapter_clip)
 
         # 5️⃣ Countdown logic
         if "countdown" in scene.narration.lower():
             countdown_clip = self.countdown_visualizer.build(5)
+            countdown_clip.profile_name = "countdown"
             layers.append(countdown_clip)
 
         final_clip = CompositeVideoClip(layers)
@@ -0,0 +1,202 @@
+"""
+segment_cache.py
+Content-addressed cache of encoded per-scene segments.
+
+Segments are keyed by everything that changes their pixels: the scene
+contract, referenced asset bytes, render profile, transition/effect
+context and the render code version. A SQLite index tracks size and last
+use so the cache stays inside its byte budget.
+"""
+
+from functools import lru_cache
+from pathlib import Path
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+
+logger = logging.getLogger("SegmentCache")
+
+RENDER_PACKAGES = ["video_core", "motion_engine", "typography", "retention"]
+
+
+@lru_cache(maxsize=1)
+def render_code_version() -> str:
+    """
+    Hash of the render stack's source, so code changes invalidate segments.
+    """
+    root = Path(__file__).resolve().parents[1]
+    digest = hashlib.sha256()
+
+    for package in RENDER_PACKAGES:
+        for path in sorted((root / package).glob("*.py")):
+            digest.update(path.name.encode("utf-8"))
+            digest.update(path.read_bytes())
+
+    return digest.hexdigest()[:16]
+
+
+_FILE_HASHES = {}
+
+
+def file_hash(path) -> str:
+    """
+    sha256 of a file's bytes, memoized on (path, mtime, size).
+    """
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+    if memo_key not in _FILE_HASHES:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        _FILE_HASHES[memo_key] = digest.hexdigest()
+
+    return _FILE_HASHES[memo_key]
+
+
+def scene_fingerprint(scene) -> dict:
+    """
+    Scene.to_dict() without the per-run random scene_id.
+    """
+    data = scene.to_dict()
+    data.pop("scene_id", None)
+    return data
+
+
+def segment_key(scene, profile, asset_paths=(), context=None) -> str:
+    payload = {
+        "scene": scene_fingerprint(scene),
+        "assets": [file_hash(path) for path in asset_paths],
+        "profile": profile.__dict__ if hasattr(profile, "__dict__") else repr(profile),
+        "context": context or {},
+        "code": render_code_version(),
+    }
+    serialized = json.dumps(payload, sort_keys=True, default=repr)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+class SegmentCache:
+
+    def __init__(self, root="renders/segment_cache", budget_bytes=20 * 1024 ** 3):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.budget_bytes = budget_bytes
+        self.db_path = self.root / "index.db"
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path)
+
+    def _init_db(self):
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS segments (
+                key TEXT PRIMARY KEY,
+                filename TEXT,
+                bytes INTEGER,
+                created REAL,
+                last_used REAL
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+    def path_for(self, key: str) -> Path:
+        return self.root / f"{key}.mp4"
+
+    def get(self, key: str):
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT filename FROM segments WHERE key = ?", (key,)
+        ).fetchone()
+
+        path = self.root / row[0] if row else None
+
+        if path is not None and path.exists():
+            conn.execute(
+                "UPDATE segments SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+            conn.commit()
+            conn.close()
+            self.hits += 1
+            return path
+
+        if row:
+            conn.execute("DELETE FROM segments WHERE key = ?", (key,))
+            conn.commit()
+
+        conn.close()
+        self.misses += 1
+        return None
+
+    def put(self, key: str, rendered_path, pinned=()) -> Path:
+        """
+        Moves a freshly rendered segment into the cache atomically.
+        `pinned` keys (segments the current render still needs) are never
+        evicted by this insert.
+        """
+        target = self.path_for(key)
+        os.replace(rendered_path, target)
+
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO segments VALUES (?, ?, ?, ?, ?)",
+            (key, target.name, target.stat().st_size, now, now),
+        )
+        conn.commit()
+        conn.close()
+
+        self.evict(keep=set(pinned) | {key})
+        return target
+
+    def total_bytes(self) -> int:
+        conn = self._connect()
+        total = conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM segments").fetchone()[0]
+        conn.close()
+        return total
+
+    def evict(self, keep=()):
+        """
+        Drops least recently used segments until under the byte budget.
+        """
+        conn = self._connect()
+        total = conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM segments").fetchone()[0]
+
+        if total > self.budget_bytes:
+            rows = conn.execute(
+                "SELECT key, filename, bytes FROM segments ORDER BY last_used ASC"
+            ).fetchall()
+
+            for key, filename, size in rows:
+                if total <= self.budget_bytes:
+                    break
+                if key in keep:
+                    continue
+
+                (self.root / filename).unlink(missing_ok=True)
+                conn.execute("DELETE FROM segments WHERE key = ?", (key,))
+                total -= size
+                self.evictions += 1
+
+            conn.commit()
+
+        conn.close()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "bytes": self.total_bytes(),
+            "budget_bytes": self.budget_bytes,
+        }
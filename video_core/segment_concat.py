@@ -0,0 +1,50 @@
+"""
+segment_concat.py
+Joins independently encoded segments with the ffmpeg concat demuxer
+(stream copy, no re-encode).
+"""
+
+import subprocess
+from pathlib import Path
+
+from video_core.frame_compositor import ffmpeg_binary
+
+
+def concat_segments(segment_paths, output_path, audio_path=None, audio_codec="aac"):
+
+    output_path = Path(output_path)
+    list_path = output_path.with_suffix(".concat.txt")
+
+    with open(list_path, "w", encoding="utf-8") as f:
+        for path in segment_paths:
+            escaped = str(Path(path).resolve()).replace("'", r"'\''")
+            f.write(f"file '{escaped}'\n")
+
+    command = [
+        ffmpeg_binary(), "-y",
+        "-loglevel", "error",
+        "-f", "concat",
+        "-safe", "0",
+        "-i", str(list_path),
+    ]
+
+    if audio_path:
+        command += [
+            "-i", str(audio_path),
+            "-map", "0:v:0",
+            "-map", "1:a:0",
+            "-c:v", "copy",
+            "-c:a", audio_codec,
+            "-shortest",
+        ]
+    else:
+        command += ["-c", "copy"]
+
+    command += ["-movflags", "+faststart", str(output_path)]
+
+    try:
+        subprocess.run(command, check=True)
+    finally:
+        list_path.unlink(missing_ok=True)
+
+    return output_path
@@ -6,24 +6,105 @@ Builds full 8–12 minute timeline safely in memory.
 from video_core.scene_composer import SceneComposer
 from video_core.transition_engine import TransitionEngine
 from video_core.retention_controller import RetentionController
+from video_core.layer_schedule import LayerSchedule
+from video_core.render_profile import FINAL_PROFILE
+from video_core.lazy_clip import LazyClip
+from video_core.frame_profiler import FRAME_PROFILER
+from motion_engine.affine_warp import WARP_ENGINE
 
 
 class TimelineBuilder:
 
-    def __init__(self):
-        self.composer = SceneComposer()
+    def __init__(self, profile=FINAL_PROFILE, effect_scheduler=None):
+        self.profile = profile
+        self.effect_scheduler = effect_scheduler
+        self.composer = SceneComposer(profile)
         self.transition_engine = TransitionEngine()
         self.retention_controller = RetentionController()
 
-    def build(self, scenes):
+    def _release_hooks(self, scenes):
+        """
+        One callback per scene that frees its decoded source image once the
+        last scene using that image has been released.
+        """
+        images = [str(path) for path in self.composer.prepare(scenes)]
+        last_use = {image: idx for idx, image in enumerate(images)}
 
-        clips = []
+        hooks = []
+        for idx, image in enumerate(images):
+            if last_use[image] == idx:
+                hooks.append(lambda image=image: WARP_ENGINE.release(image))
+            else:
+                hooks.append(None)
 
-        for scene in scenes:
-            clip = self.composer.compose(scene)
-            clip = self.retention_controller.enhance(clip, scene)
-            clips.append(clip)
+        return hooks
 
-        final_video = self.transition_engine.apply_transitions(clips)
+    @staticmethod
+    def _label(idx, scene):
+        return f"{idx:03d} {scene.scene_type}/{scene.visual.camera_motion}"
+
+    def _scene_clip(self, scene, label):
+        clip = self.composer.compose(scene)
+        clip = self.retention_controller.enhance(clip, scene)
+        return FRAME_PROFILER.instrument(clip, label)
+
+    def build(self, scenes, transitions=None):
+        """
+        Scene clips are lazy: each is composed when the timeline first
+        needs one of its frames and closed once the playhead leaves it.
+        """
+        clips = [
+            LazyClip(
+                lambda scene=scene, idx=idx: self._scene_clip(scene, self._label(idx, scene)),
+                scene.duration,
+                self.profile.size,
+                on_release=hook,
+            )
+            for idx, (scene, hook) in enumerate(zip(scenes, self._release_hooks(scenes)))
+        ]
+
+        final_video = self.transition_engine.apply_transitions(clips, transitions)
+
+        if self.effect_scheduler:
+            schedule = self.effect_scheduler.build(final_video.duration)
+            final_video = schedule.apply(final_video)
 
         return final_video
+
+    def build_schedule(self, scenes, start=0.0, transitions=None, total_duration=None):
+        """
+        Native-path equivalent of build(): same scene order, durations and
+        transition overlaps, compiled into a flat LayerSchedule.
+
+        start/transitions/total_duration let a slice of a longer plan (one
+        chapter) keep its place, transitions and timeline-wide retention
+        effects on the full timeline.
+        """
+        schedule = LayerSchedule(self.profile.size, self.profile.fps)
+
+        durations = [scene.duration for scene in scenes]
+        transitions = transitions or self.transition_engine.plan(durations)
+        starts, end = self.transition_engine.layout(durations, transitions, start)
+
+        holds = self.transition_engine.holds(transitions)
+        hooks = self._release_hooks(scenes)
+
+        for idx, (scene, transition, scene_start, hold, hook) in enumerate(
+            zip(scenes, transitions, starts, holds, hooks)
+        ):
+            schedule.add_lazy_clip(
+                lambda scene=scene: self.composer.compose(scene),
+                scene_start,
+                scene.duration,
+                filters=self.retention_controller.filters(scene),
+                fade_in=transition.overlap,
+                zoom_flash=transition.style == "zoom_flash",
+                on_release=hook,
+                label=self._label(idx, scene),
+                hold=hold,
+            )
+
+        if self.effect_scheduler:
+            schedule.effects = self.effect_scheduler.build(total_duration or end)
+
+        return schedule
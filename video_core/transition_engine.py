@@ -1,30 +1,193 @@
 """
 transition_engine.py
 High-retention fast-cut transition system.
+
+Clips are laid out once on a flat timeline with real overlap windows:
+a frame outside a transition is a single get_frame of one clip, and only
+frames inside an overlap blend the two neighbours. Crossfades hold the
+outgoing clip rather than pulling the next one back, so scene starts and
+the total duration match the narration. Frame lookup depth no
+longer grows with scene count.
 """
 
-from moviepy.editor import concatenate_videoclips, CompositeVideoClip
+from bisect import bisect_right
+from dataclasses import dataclass
+import random
+
+import numpy as np
+
+from motion_engine.affine_warp import center_zoom
+
+
+@dataclass(frozen=True)
+class Transition:
+    style: str = "hard_cut"
+    overlap: float = 0.0
+
+
+def zoom_flash_scale(t):
+    return 1 + 0.02 * np.sin(t * 10)
 
 
 class TransitionEngine:
 
-    def __init__(self, transition_duration=0.3):
+    STYLES = ("crossfade", "hard_cut", "zoom_flash")
+
+    def __init__(self, transition_duration=0.3, styles=("crossfade",), rng=None):
         self.transition_duration = transition_duration
+        self.styles = tuple(styles)
+        self.rng = rng or random
+
+    def plan(self, durations):
+        """
+        One Transition per clip, describing how it enters; the first clip
+        always starts on a hard cut. Crossfade overlaps never exceed either
+        neighbour.
+        """
+        transitions = []
+
+        for idx, duration in enumerate(durations):
+            if idx == 0:
+                transitions.append(Transition())
+                continue
+
+            style = self.rng.choice(self.styles)
+            overlap = 0.0
+
+            if style == "crossfade":
+                overlap = min(self.transition_duration, duration, durations[idx - 1])
+
+            transitions.append(Transition(style, overlap))
+
+        return transitions
+
+    def layout(self, durations, transitions, start=0.0):
+        """
+        Start time of every clip. Clips keep their back-to-back starts so
+        scenes stay on their narration; a crossfade instead holds the
+        outgoing clip over the head of the incoming one (see holds()).
+        """
+        starts = []
+        cursor = start
+
+        for duration in durations:
+            starts.append(cursor)
+            cursor += duration
+
+        return starts, cursor
+
+    def holds(self, transitions):
+        """
+        Seconds each clip stays on screen past its own end: the overlap of
+        the crossfade into the next clip.
+        """
+        return [transition.overlap for transition in transitions[1:]] + [0.0]
+
+    def apply_transitions(self, clips, transitions=None):
+
+        durations = [clip.duration for clip in clips]
+        transitions = transitions or self.plan(durations)
+        starts, total = self.layout(durations, transitions)
+
+        return FlatTimeline(clips, starts, transitions, total, self.holds(transitions)).to_clip()
+
+
+class FlatTimeline:
+    """
+    moviepy view over a laid-out clip list. Clips are centred on a canvas
+    of the largest clip size, like concatenate_videoclips(method="compose").
+    """
+
+    def __init__(self, clips, starts, transitions, duration, holds=None):
+        self.clips = clips
+        self.starts = starts
+        self.transitions = transitions
+        self.duration = duration
+        # Outgoing clips hold their last frame under the next crossfade
+        self.ends = [
+            start + clip.duration + hold
+            for clip, start, hold in zip(clips, starts, holds or [0.0] * len(clips))
+        ]
+        self.size = (
+            max(clip.size[0] for clip in clips),
+            max(clip.size[1] for clip in clips),
+        )
+        self._max_span = max(end - start for start, end in zip(starts, self.ends))
+        self._live = []
+
+    def active(self, t):
+        idx = bisect_right(self.starts, t)
+        active = []
+
+        while idx > 0:
+            idx -= 1
+            start = self.starts[idx]
+            if start < t - self._max_span:
+                break
+            if t < self.ends[idx]:
+                active.append(idx)
+
+        if not active and self.clips:
+            # t == duration: hold the last frame
+            active.append(len(self.clips) - 1)
+
+        active.reverse()
+        return active
+
+    def _clip_frame(self, idx, t):
+        local_t = min(t - self.starts[idx], self.clips[idx].duration)
+        frame = self.clips[idx].get_frame(local_t)[..., :3]
+
+        if self.transitions[idx].style == "zoom_flash":
+            frame = center_zoom(frame, zoom_flash_scale(local_t))
+
+        return frame
+
+    def _release_inactive(self, active):
+        # Lazy scene clips are only held while under the playhead
+        for idx in self._live:
+            if idx not in active:
+                self.clips[idx].release()
+        self._live = [idx for idx in active if hasattr(self.clips[idx], "release")]
+
+    def make_frame(self, t):
+        active = self.active(t)
+        self._release_inactive(active)
+        width, height = self.size
+
+        if len(active) == 1:
+            frame = self._clip_frame(active[0], t)
+            if frame.shape[1] == width and frame.shape[0] == height:
+                return frame
+
+        canvas = np.zeros((height, width, 3), dtype=np.float32)
 
-    def apply_transitions(self, clips):
+        for order, idx in enumerate(active):
+            frame = self._clip_frame(idx, t)
+            h, w = frame.shape[:2]
+            x, y = (width - w) // 2, (height - h) // 2
+            region = canvas[y:y + h, x:x + w]
 
-        processed = []
+            overlap = self.transitions[idx].overlap
+            weight = 1.0
+            if order and overlap:
+                weight = min(1.0, (t - self.starts[idx]) / overlap)
 
-        for i in range(len(clips) - 1):
+            region += (frame - region) * weight
 
-            current = clips[i]
-            next_clip = clips[i + 1]
+        return canvas.astype(np.uint8)
 
-            current = current.crossfadeout(self.transition_duration)
-            next_clip = next_clip.crossfadein(self.transition_duration)
+    def to_clip(self):
+        from moviepy.editor import VideoClip, CompositeAudioClip
 
-            processed.append(current)
+        clip = VideoClip(self.make_frame, duration=self.duration)
 
-        processed.append(clips[-1])
+        audio = [
+            c.audio.set_start(start)
+            for c, start in zip(self.clips, self.starts)
+            if c.audio is not None
+        ]
+        if audio:
+            clip = clip.set_audio(CompositeAudioClip(audio).set_duration(self.duration))
 
-        return concatenate_videoclips(processed, method="compose")
+        return clip
@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import List
 import logging
 import json
+import sys
 
 from scene_engine.scene_generator import SceneGenerator
 from scene_engine.scene_validator import SceneValidator
@@ -21,8 +22,9 @@ logger = logging.getLogger("VideoPipeline")
 
 
 class VideoPipeline:
-    def __init__(self, topic_payload: dict):
+    def __init__(self, topic_payload: dict, render_profile: str = "final"):
         self.topic_payload = topic_payload
+        self.render_profile = render_profile
         self.output_dir = Path("output")
         self.output_dir.mkdir(exist_ok=True)
 
@@ -52,6 +54,29 @@ class VideoPipeline:
         logger.info("Pipeline complete.")
         return scenes
 
+    def render(self, scenes: List[Scene], profile: str = None) -> Path:
+        """
+        Renders a scene plan. Draft and final renders share the image and
+        segment caches; segment keys carry the profile, so they never collide.
+        """
+        # Render stack pulls in moviepy/ffmpeg; plan-only runs don't need it
+        from video_core.render_orchestrator import RenderOrchestrator
+        from video_core.segment_cache import SegmentCache
+
+        profile = profile or self.render_profile
+
+        orchestrator = RenderOrchestrator(
+            output_dir=self.output_dir,
+            profile=profile,
+            segment_cache=SegmentCache(),
+        )
+
+        logger.info(f"Rendering {profile} cut...")
+        return orchestrator.render(scenes, filename=f"{profile}_output.mp4")
+
+    def render_draft(self, scenes: List[Scene]) -> Path:
+        return self.render(scenes, profile="draft")
+
     def _persist_scene_plan(self, scenes: List[Scene]) -> None:
         serialized = [scene.to_dict() for scene in scenes]
         with open(self.output_dir / "scene_plan.json", "w", encoding="utf-8") as f:
@@ -63,4 +88,7 @@ if __name__ == "__main__":
         topic_data = json.load(f)
 
     pipeline = VideoPipeline(topic_data["topics"][0])
-    pipeline.run()
+    scenes = pipeline.run()
+
+    if "--draft" in sys.argv:
+        pipeline.render_draft(scenes)